@@ -5,101 +5,38 @@ if getattr(sys, 'frozen', False):
     os.environ['PATH'] = sys._MEIPASS + os.pathsep + os.environ.get('PATH', '')
 # --- End of Fix ---
 
+import time
+_START_TIME = time.perf_counter()
+
 import sys
 import os
-import glfw
-import OpenGL.GL as gl
+import threading
+# glfw, OpenGL.GL, the imgui GLFW backend and NumPy are imported in main() or by preload_modules().
 import imgui
-from imgui.integrations.glfw import GlfwRenderer
-import psutil
-import pynvml
+import argparse
 import math
-import time
 import re
-
-# --- NVML (GPU) Wrapper ---
-nvml_initialized = False
-
-def init_nvml():
-    """NVML을 초기화하고 첫 번째 GPU 핸들을 반환합니다."""
-    global nvml_initialized
-    try:
-        pynvml.nvmlInit()
-        handle = pynvml.nvmlDeviceGetHandleByIndex(0)
-        nvml_initialized = True
-        print("NVML 초기화 성공.")
-        return handle
-    except pynvml.NVMLError as error:
-        print(f"NVML 초기화 오류: {error}", file=sys.stderr)
-        print("NVIDIA 드라이버가 설치되어 있는지 확인하세요. GPU 모니터링이 비활성화됩니다.", file=sys.stderr)
-        return None
-
-def get_gpu_usage(handle):
-    """주어진 핸들로 GPU 코어 사용률을 가져옵니다."""
-    if handle is None:
-        return 0
-    try:
-        return pynvml.nvmlDeviceGetUtilizationRates(handle).gpu
-    except pynvml.NVMLError:
-        return 0
-
-def get_gpu_memory_usage(handle):
-    """GPU 메모리(VRAM) 사용 정보를 반환합니다. (퍼센트, 사용량 MB, 총량 MB)"""
-    if handle is None:
-        return 0, 0, 0
-    try:
-        info = pynvml.nvmlDeviceGetMemoryInfo(handle)
-        percent = (info.used / info.total) * 100
-        used_mb = info.used / (1024**2)
-        total_mb = info.total / (1024**2)
-        return percent, used_mb, total_mb
-    except pynvml.NVMLError:
-        return 0, 0, 0
-
-# --- System Info Functions ---
-def get_ram_usage():
-    """메인 메모리(RAM) 사용 정보를 반환합니다. (퍼센트, 사용량 GB, 총량 GB)"""
-    mem_info = psutil.virtual_memory()
-    percent = mem_info.percent
-    used_gb = mem_info.used / (1024**3)
-    total_gb = mem_info.total / (1024**3)
-    return percent, used_gb, total_gb
-
-def get_disk_info(drive_letter):
-    """지정된 드라이브의 디스크 정보를 반환합니다. (퍼센트, 사용량 GB, 총량 GB)"""
-    try:
-        usage = psutil.disk_usage(f'{drive_letter}:\\')
-        return {
-            'percent': usage.percent,
-            'used_gb': usage.used / (1024**3),
-            'total_gb': usage.total / (1024**3)
-        }
-    except FileNotFoundError:
-        return None
-
-
-def get_network_speed_mbps():
-
-    """가장 활성화된 네트워크 인터페이스의 링크 속도를 Mbps 단위로 가져옵니다."""
-    try:
-        stats = psutil.net_if_stats()
-        io_counters = psutil.net_io_counters(pernic=True)
-
-        best_interface_speed = 0
-        max_bytes = 0
-
-        for nic, addrs in psutil.net_if_addrs().items():
-            if nic in stats and stats[nic].isup:
-                if nic in io_counters and (io_counters[nic].bytes_sent + io_counters[nic].bytes_recv) > max_bytes:
-                    if stats[nic].speed > 0:
-                        max_bytes = io_counters[nic].bytes_sent + io_counters[nic].bytes_recv
-                        best_interface_speed = stats[nic].speed
-        
-        return best_interface_speed if best_interface_speed > 0 else 100
-    except Exception:
-        return 100
+from collections import namedtuple
+
+from collectors import default_collectors, cpu_core_count, get_cpu_groups
+from sampler import Sampler
+from history import MetricHistory
+from rollup import RollupStore
+from recording import Recorder, RecordingFile, Replayer, record_fields
+from render_scheduler import RenderScheduler
+from gpu import NvmlPoller
+from geometry import arc_angles, disc_radius, gauge_geometry, stroke_arc, TOP_ANGLE, FULL_TURN, HALF_TURN
+from network import NetScale, active_nic_text
+from remote import Aggregator, AgentSender, DEFAULT_PORT, parse_address
+from exporter import DEFAULT_PORT as DEFAULT_METRICS_PORT, start_metrics_server
+from storage import disk_label
+from layout import LAYOUT_OPTIONS, LayoutEngine, Widget, binding, text_template
+from instrumentation import FrameProfileHook, FrameStats, StatsDumper, SUMMARY_REFRESH, instrument_collectors, instrument_functions
 
 # --- Drawing Functions ---
+GRAPH_PRIMARY_COLOR = (0.3, 0.8, 1.0, 1.0)
+GRAPH_SECONDARY_COLOR = (1.0, 0.6, 0.2, 1.0)
+
 def get_gradient_color(value):
     """0-100 값에 따라 Green-Yellow-Red 그라데이션 색상을 계산하여 (R,G,B,A) 튜플로 반환합니다."""
     value = min(max(value, 0), 100)
@@ -111,6 +48,26 @@ def get_gradient_color(value):
         g = 1.0 - ((value - 50) * 2) / 100.0
     return (r, g, 0, 1.0)
 
+GRADIENT_LUT_STEPS = 1000  # 0.1% 단위
+
+def build_gradient_lut(steps=GRADIENT_LUT_STEPS):
+    """get_gradient_color를 steps+1개 지점에서 미리 계산한 packed u32(IM_COL32) 목록을 반환합니다."""
+    lut = []
+    for i in range(steps + 1):
+        r, g, b, a = get_gradient_color(i * 100.0 / steps)
+        lut.append((int(a * 255 + 0.5) << 24) | (int(b * 255 + 0.5) << 16) |
+                   (int(g * 255 + 0.5) << 8) | int(r * 255 + 0.5))
+    return lut
+
+GRADIENT_LUT = build_gradient_lut()
+GRADIENT_LUT_ARRAY = None
+np = None  # set by load_numpy(); until then the core grid uses its pure-Python path
+
+def gradient_color_u32(value):
+    """get_gradient_color와 같은 색을 LUT에서 packed u32로 반환합니다."""
+    index = int(value * (GRADIENT_LUT_STEPS / 100))
+    return GRADIENT_LUT[min(max(index, 0), GRADIENT_LUT_STEPS)]
+
 def draw_combined_gauge(draw_list, center, radius, outer_percent, inner_percent, label, sub_text=None):
     """외부 링과 내부 원으로 구성된 결합된 게이지를 그립니다."""
     background_thickness = 8
@@ -118,37 +75,32 @@ def draw_combined_gauge(draw_list, center, radius, outer_percent, inner_percent,
     
     outer_color = get_gradient_color(outer_percent)
     main_outer_color = imgui.get_color_u32_rgba(*outer_color)
-    draw_list.add_circle(center.x, center.y, radius, imgui.get_color_u32_rgba(0.2, 0.2, 0.2, 1.0), num_segments=128, thickness=background_thickness)
-    if outer_percent > 0:
-        angle_start = -math.pi / 2
-        angle_end = angle_start + (min(outer_percent, 100) / 100.0) * (2 * math.pi)
-        num_segments = int(128 * min(outer_percent, 100) / 100)
-        if num_segments < 2: num_segments = 2
-        draw_list.path_clear()
-        draw_list.path_arc_to(center.x, center.y, radius, angle_start, angle_end, num_segments=num_segments)
-        draw_list.path_stroke(main_outer_color, thickness=foreground_thickness)
+    draw_list.add_circle(center.x, center.y, radius, imgui.get_color_u32_rgba(0.2, 0.2, 0.2, 1.0), num_segments=0, thickness=background_thickness)
+    outer_arc = arc_angles(TOP_ANGLE, FULL_TURN, outer_percent)
+    if outer_arc:
+        stroke_arc(draw_list, center.x, center.y, radius, outer_arc, main_outer_color, foreground_thickness)
 
     if inner_percent > 0:
         inner_color = get_gradient_color(inner_percent)
         main_inner_color = imgui.get_color_u32_rgba(inner_color[0], inner_color[1], inner_color[2], 0.6)
-        inner_radius = radius * (inner_percent / 100.0)
-        draw_list.add_circle_filled(center.x, center.y, inner_radius, main_inner_color, num_segments=128)
+        inner_radius = disc_radius(radius, inner_percent)
+        draw_list.add_circle_filled(center.x, center.y, inner_radius, main_inner_color, num_segments=0)
 
     text = f"{int(outer_percent)}%"
-    text_size = imgui.calc_text_size(text)
+    text_size = gauge_geometry.text_size(text)
     text_pos = imgui.Vec2(center.x - text_size.x / 2, center.y - text_size.y / 2)
     draw_list.add_text(text_pos.x, text_pos.y, imgui.get_color_u32_rgba(1, 1, 1, 1), text)
 
-    label_size = imgui.calc_text_size(label)
+    label_size = gauge_geometry.text_size(label)
     label_pos = imgui.Vec2(center.x - label_size.x / 2, center.y + radius + 15)
     draw_list.add_text(label_pos.x, label_pos.y, imgui.get_color_u32_rgba(0.8, 0.8, 0.8, 1), label)
 
     if sub_text:
-        sub_text_size = imgui.calc_text_size(sub_text)
+        sub_text_size = gauge_geometry.text_size(sub_text)
         sub_text_pos = imgui.Vec2(center.x - sub_text_size.x / 2, label_pos.y + label_size.y + 5)
         draw_list.add_text(sub_text_pos.x, sub_text_pos.y, imgui.get_color_u32_rgba(0.7, 0.7, 0.7, 1), sub_text)
 
-def draw_network_gauge(draw_list, center, radius, upload_percent, download_percent, label, upload_speed_mbps, download_speed_mbps):
+def draw_network_gauge(draw_list, center, radius, upload_percent, download_percent, label, upload_speed_mbps, download_speed_mbps, sub_text=None):
     """Upload/Download를 함께 표시하는 네트워크 게이지를 그립니다."""
     background_thickness = 8
     foreground_thickness = 12
@@ -159,36 +111,32 @@ def draw_network_gauge(draw_list, center, radius, upload_percent, download_perce
 
     draw_list.add_circle(
         center.x, center.y, radius, imgui.get_color_u32_rgba(0.2, 0.2, 0.2, 1.0),
-        num_segments=128, thickness=background_thickness
+        num_segments=0, thickness=background_thickness
     )
 
-    if upload_percent > 0:
-        angle_end_up = -math.pi / 2
-        angle_start_up = angle_end_up - (min(upload_percent, 100) / 100.0) * math.pi
-        num_segments = int(64 * min(upload_percent, 100) / 100)
-        if num_segments < 2: num_segments = 2
-        draw_list.path_clear()
-        draw_list.path_arc_to(center.x, center.y, radius, angle_start_up, angle_end_up, num_segments=num_segments)
-        draw_list.path_stroke(main_color, thickness=foreground_thickness)
-
-    if download_percent > 0:
-        angle_start_down = -math.pi / 2
-        angle_end_down = angle_start_down + (min(download_percent, 100) / 100.0) * math.pi
-        num_segments = int(64 * min(download_percent, 100) / 100)
-        if num_segments < 2: num_segments = 2
-        draw_list.path_clear()
-        draw_list.path_arc_to(center.x, center.y, radius, angle_start_down, angle_end_down, num_segments=num_segments)
-        draw_list.path_stroke(main_color, thickness=foreground_thickness)
-
-    label_size = imgui.calc_text_size(label)
+    up_arc = arc_angles(TOP_ANGLE, -HALF_TURN, upload_percent)
+    if up_arc:
+        stroke_arc(draw_list, center.x, center.y, radius, up_arc, main_color, foreground_thickness)
+
+    down_arc = arc_angles(TOP_ANGLE, HALF_TURN, download_percent)
+    if down_arc:
+        stroke_arc(draw_list, center.x, center.y, radius, down_arc, main_color, foreground_thickness)
+
+    label_size = gauge_geometry.text_size(label)
     label_pos = imgui.Vec2(center.x - label_size.x / 2, center.y + radius + 15)
     draw_list.add_text(label_pos.x, label_pos.y, imgui.get_color_u32_rgba(0.8, 0.8, 0.8, 1), label)
 
+    # Sub-text for active interfaces
+    if sub_text:
+        sub_text_size = gauge_geometry.text_size(sub_text)
+        sub_text_pos = imgui.Vec2(center.x - sub_text_size.x / 2, label_pos.y + label_size.y + 5)
+        draw_list.add_text(sub_text_pos.x, sub_text_pos.y, imgui.get_color_u32_rgba(0.7, 0.7, 0.7, 1), sub_text)
+
     up_text = f"U: {upload_speed_mbps:.1f}"
     down_text = f"D: {download_speed_mbps:.1f}"
 
-    up_text_size = imgui.calc_text_size(up_text)
-    down_text_size = imgui.calc_text_size(down_text)
+    up_text_size = gauge_geometry.text_size(up_text)
+    down_text_size = gauge_geometry.text_size(down_text)
 
     text_padding = 5
     total_height = up_text_size.y + down_text_size.y + text_padding
@@ -202,45 +150,153 @@ def draw_network_gauge(draw_list, center, radius, upload_percent, download_perce
     draw_list.add_text(up_pos_x, up_pos_y, imgui.get_color_u32_rgba(1, 1, 1, 1), up_text)
     draw_list.add_text(down_pos_x, down_pos_y, imgui.get_color_u32_rgba(1, 1, 1, 1), down_text)
 
+CORE_GRID_PADDING = 2.0
+CORE_GRID_MIN_CELL = 4.0      # 셀 내부가 이보다 작으면 그룹별 히트 스트립으로 접습니다.
+CORE_GRID_ROUNDED_CELL = 16.0  # 셀이 이만큼 크면 둥근 모서리로 하나씩 그립니다.
+CORE_GRID_NUMPY_MIN = 64       # 코어가 적으면 NumPy 변환 비용이 더 큽니다.
+_core_grid_layouts = {}
+
+CoreGridLayout = namedtuple('CoreGridLayout', ['x0', 'y0', 'x1', 'y1', 'members', 'cell_index', 'cell_counts', 'rounded'])
+
+def _core_grid_layout(num_cores, x, y, width, height):
+    """셀 사각형 좌표와 코어→셀 매핑을 계산합니다. 위치와 크기가 같으면 캐시를 재사용합니다.
+
+    members가 None이면 코어 하나가 셀 하나입니다.
+    """
+    key = (num_cores, x, y, width, height)
+    layout = _core_grid_layouts.get(key)
+    if layout is not None:
+        return layout
+    if len(_core_grid_layouts) > 16:
+        _core_grid_layouts.clear()
+
+    padding = CORE_GRID_PADDING
+    cols = max(math.isqrt(num_cores), 1)
+    rows = (num_cores + cols - 1) // cols
+    cell_side = min(width / cols, height / rows)
+
+    if cell_side - 2 * padding >= CORE_GRID_MIN_CELL:
+        offset_x = x + (width - cell_side * cols) / 2
+        offset_y = y + (height - cell_side * rows) / 2
+        x0 = [offset_x + (i % cols) * cell_side + padding for i in range(num_cores)]
+        y0 = [offset_y + (i // cols) * cell_side + padding for i in range(num_cores)]
+        x1 = [v + cell_side - 2 * padding for v in x0]
+        y1 = [v + cell_side - 2 * padding for v in y0]
+        layout = CoreGridLayout(x0, y0, x1, y1, None, None, None, cell_side >= CORE_GRID_ROUNDED_CELL)
+    else:
+        # Heat strip: one row per NUMA node/socket, cores bucketed into columns.
+        groups = get_cpu_groups(num_cores)
+        if groups is None:
+            num_groups = max(1, min(8, int(height // (CORE_GRID_MIN_CELL * 2))))
+            chunk = (num_cores + num_groups - 1) // num_groups
+            groups = [tuple(range(i, min(i + chunk, num_cores))) for i in range(0, num_cores, chunk)]
+        row_height = height / len(groups)
+        x0, y0, x1, y1, members = [], [], [], [], []
+        for row, group in enumerate(groups):
+            num_cols = max(min(len(group), int(width)), 1)
+            col_width = width / num_cols
+            top = y + row * row_height + (1 if row_height > 4 else 0)
+            bottom = y + (row + 1) * row_height - (1 if row_height > 4 else 0)
+            for col in range(num_cols):
+                start = col * len(group) // num_cols
+                end = (col + 1) * len(group) // num_cols
+                x0.append(x + col * col_width)
+                x1.append(x + (col + 1) * col_width)
+                y0.append(top)
+                y1.append(bottom)
+                members.append(group[start:end])
+        cell_index = cell_counts = None
+        if np is not None:
+            cell_index = np.empty(num_cores, dtype=np.intp)
+            for cell, cores in enumerate(members):
+                cell_index[list(cores)] = cell
+            cell_counts = np.array([len(cores) for cores in members], dtype=np.float64)
+        layout = CoreGridLayout(x0, y0, x1, y1, members, cell_index, cell_counts, False)
+
+    _core_grid_layouts[key] = layout
+    return layout
+
+def load_numpy():
+    """NumPy를 가져와 코어 그리드의 벡터화 경로를 켭니다. NumPy가 없으면 None을 반환합니다."""
+    global np, GRADIENT_LUT_ARRAY
+    if np is not None:
+        return np
+    try:
+        import numpy
+    except ImportError:
+        return None
+    GRADIENT_LUT_ARRAY = numpy.array(GRADIENT_LUT, dtype=numpy.uint32)
+    _core_grid_layouts.clear()  # heat-strip layouts built without NumPy lack cell_index
+    np = numpy
+    return np
+
+def _core_grid_colors(core_usages, layout):
+    """셀별 사용률을 LUT로 색상(u32) 목록으로 변환합니다. 여러 코어가 한 셀이면 평균을 냅니다."""
+    if (np is not None and len(core_usages) >= CORE_GRID_NUMPY_MIN
+            and (layout.members is None or layout.cell_index is not None)):
+        values = np.fromiter(core_usages, dtype=np.float64, count=len(core_usages))
+        if layout.members is not None:
+            values = np.bincount(layout.cell_index, weights=values, minlength=len(layout.members)) / layout.cell_counts
+        indices = np.clip(values * (GRADIENT_LUT_STEPS / 100), 0, GRADIENT_LUT_STEPS).astype(np.intp)
+        return GRADIENT_LUT_ARRAY[indices].tolist()
+    if layout.members is not None:
+        core_usages = [sum(core_usages[i] for i in cores) / len(cores) for cores in layout.members]
+    return [gradient_color_u32(usage) for usage in core_usages]
+
 def draw_core_grid(draw_list, top_left, size, core_usages):
-    """CPU 코어 사용률을 나타내는 색상 사각형 그리드를 그립니다."""
+    """CPU 코어 사용률을 나타내는 색상 사각형 그리드를 그립니다.
+
+    셀 좌표는 캐시되고 색상은 LUT에서 한 번에 조회합니다. 셀이 작으면 프리미티브를
+    한 번에 예약해 제출하고, 너무 작으면 NUMA 노드/소켓별 히트 스트립으로 접습니다.
+    """
     num_cores = len(core_usages)
     if num_cores == 0:
         return
 
-    cols = math.isqrt(num_cores)
-    if cols == 0:
-        cols = 1
-    rows = (num_cores + cols - 1) // cols
+    layout = _core_grid_layout(num_cores, top_left.x, top_left.y, size.x, size.y)
+    colors = _core_grid_colors(core_usages, layout)
+    cells = zip(layout.x0, layout.y0, layout.x1, layout.y1, colors)
 
-    cell_size_x = size.x / cols
-    cell_size_y = size.y / rows
-    cell_side = min(cell_size_x, cell_size_y)
+    if layout.rounded:
+        for cell in cells:
+            draw_list.add_rect_filled(*cell, rounding=3.0)
+        return
 
-    grid_render_width = cell_side * cols
-    grid_render_height = cell_side * rows
-    offset_x = (size.x - grid_render_width) / 2
-    offset_y = (size.y - grid_render_height) / 2
-    
-    padding = 2.0
+    count = len(colors)
+    draw_list.prim_reserve(6 * count, 4 * count)
+    prim_rect = draw_list.prim_rect
+    for cell in cells:
+        prim_rect(*cell)
 
-    for i, usage in enumerate(core_usages):
-        row = i // cols
-        col = i % cols
+def draw_gpu_strip(draw_list, top_left, size, devices):
+    """GPU별 사용률(굵은 막대)과 VRAM(얇은 막대)을 나란히 표시하는 압축 스트립을 그립니다.
 
-        cell_x = top_left.x + offset_x + col * cell_side
-        cell_y = top_left.y + offset_y + row * cell_side
+    오류 상태인 장치는 회색 막대에 'x'로 표시해 0% 사용률과 구분합니다.
+    """
+    count = len(devices)
+    if count == 0:
+        return
 
-        color = get_gradient_color(usage)
-        
-        draw_list.add_rect_filled(
-            cell_x + padding,
-            cell_y + padding,
-            cell_x + cell_side - padding,
-            cell_y + cell_side - padding,
-            imgui.get_color_u32_rgba(*color),
-            rounding=3.0
-        )
+    slot = size.x / count
+    bar_width = max(slot * 0.55, 1.0)
+    vram_width = max(slot * 0.2, 1.0)
+    bottom = top_left.y + size.y
+    background = imgui.get_color_u32_rgba(0.2, 0.2, 0.2, 1.0)
+    vram_color = imgui.get_color_u32_rgba(*GRAPH_SECONDARY_COLOR)
+
+    for i, device in enumerate(devices):
+        x = top_left.x + i * slot
+        draw_list.add_rect_filled(x, top_left.y, x + bar_width, bottom, background)
+        if device.error is not None:
+            mark_size = gauge_geometry.text_size("x")
+            draw_list.add_text(x + (bar_width - mark_size.x) / 2, bottom - mark_size.y,
+                               imgui.get_color_u32_rgba(0.6, 0.6, 0.6, 1), "x")
+            continue
+        fill_top = bottom - size.y * min(max(device.percent, 0), 100) / 100.0
+        draw_list.add_rect_filled(x, fill_top, x + bar_width, bottom, gradient_color_u32(device.percent))
+        vram_x = x + bar_width + 1
+        vram_top = bottom - size.y * min(max(device.vram_percent, 0), 100) / 100.0
+        draw_list.add_rect_filled(vram_x, vram_top, vram_x + vram_width, bottom, vram_color)
 
 def draw_disk_gauge(draw_list, center, radius, usage_percent, read_percent, write_percent, label, read_speed_mbps, write_speed_mbps, sub_text=None):
     """디스크 사용량, 읽기/쓰기 속도를 표시하는 게이지를 그립니다."""
@@ -253,41 +309,31 @@ def draw_disk_gauge(draw_list, center, radius, usage_percent, read_percent, writ
     main_color = imgui.get_color_u32_rgba(r, g, b, a)
 
     # Gauge background
-    draw_list.add_circle(center.x, center.y, radius, imgui.get_color_u32_rgba(0.2, 0.2, 0.2, 1.0), num_segments=128, thickness=background_thickness)
+    draw_list.add_circle(center.x, center.y, radius, imgui.get_color_u32_rgba(0.2, 0.2, 0.2, 1.0), num_segments=0, thickness=background_thickness)
 
     # Write speed arc (left)
-    if write_percent > 0:
-        angle_end_write = -math.pi / 2
-        angle_start_write = angle_end_write - (min(write_percent, 100) / 100.0) * math.pi
-        num_segments = int(64 * min(write_percent, 100) / 100)
-        if num_segments < 2: num_segments = 2
-        draw_list.path_clear()
-        draw_list.path_arc_to(center.x, center.y, radius, angle_start_write, angle_end_write, num_segments=num_segments)
-        draw_list.path_stroke(main_color, thickness=foreground_thickness)
+    write_arc = arc_angles(TOP_ANGLE, -HALF_TURN, write_percent)
+    if write_arc:
+        stroke_arc(draw_list, center.x, center.y, radius, write_arc, main_color, foreground_thickness)
 
     # Read speed arc (right)
-    if read_percent > 0:
-        angle_start_read = -math.pi / 2
-        angle_end_read = angle_start_read + (min(read_percent, 100) / 100.0) * math.pi
-        num_segments = int(64 * min(read_percent, 100) / 100)
-        if num_segments < 2: num_segments = 2
-        draw_list.path_clear()
-        draw_list.path_arc_to(center.x, center.y, radius, angle_start_read, angle_end_read, num_segments=num_segments)
-        draw_list.path_stroke(main_color, thickness=foreground_thickness)
+    read_arc = arc_angles(TOP_ANGLE, HALF_TURN, read_percent)
+    if read_arc:
+        stroke_arc(draw_list, center.x, center.y, radius, read_arc, main_color, foreground_thickness)
 
     # Inner filled circle for usage
     if usage_percent > 0:
         inner_color = get_gradient_color(usage_percent)
         main_inner_color = imgui.get_color_u32_rgba(inner_color[0], inner_color[1], inner_color[2], 0.6)
-        inner_radius = radius * (usage_percent / 100.0)
-        draw_list.add_circle_filled(center.x, center.y, inner_radius, main_inner_color, num_segments=128)
+        inner_radius = disc_radius(radius, usage_percent)
+        draw_list.add_circle_filled(center.x, center.y, inner_radius, main_inner_color, num_segments=0)
 
     # R/W speed text in the center
     read_text = f"R: {read_speed_mbps:.1f}"
     write_text = f"W: {write_speed_mbps:.1f}"
 
-    read_text_size = imgui.calc_text_size(read_text)
-    write_text_size = imgui.calc_text_size(write_text)
+    read_text_size = gauge_geometry.text_size(read_text)
+    write_text_size = gauge_geometry.text_size(write_text)
 
     text_padding = 5
     total_height = read_text_size.y + write_text_size.y + text_padding
@@ -302,43 +348,689 @@ def draw_disk_gauge(draw_list, center, radius, usage_percent, read_percent, writ
     draw_list.add_text(write_pos_x, write_pos_y, imgui.get_color_u32_rgba(1, 1, 1, 1), write_text)
 
     # Label below gauge
-    label_size = imgui.calc_text_size(label)
+    label_size = gauge_geometry.text_size(label)
     label_pos = imgui.Vec2(center.x - label_size.x / 2, center.y + radius + 15)
     draw_list.add_text(label_pos.x, label_pos.y, imgui.get_color_u32_rgba(0.8, 0.8, 0.8, 1), label)
 
     # Sub-text for total disk space
     if sub_text:
-        sub_text_size = imgui.calc_text_size(sub_text)
+        sub_text_size = gauge_geometry.text_size(sub_text)
         sub_text_pos = imgui.Vec2(center.x - sub_text_size.x / 2, label_pos.y + label_size.y + 5)
         draw_list.add_text(sub_text_pos.x, sub_text_pos.y, imgui.get_color_u32_rgba(0.7, 0.7, 0.7, 1), sub_text)
 
-def main():
-    if not glfw.init():
-        print("GLFW를 초기화할 수 없습니다.", file=sys.stderr)
+DISK_GAUGE_LIMIT = 3  # 디스크가 이보다 많으면 압축 스트립으로 표시합니다.
+DISK_GAUGE_GAP = 30
+
+DiskPanelItem = namedtuple('DiskPanelItem', ['label', 'usage_percent', 'read_mbps', 'write_mbps', 'sub_text'])
+
+def disk_panel_items(disk, disk_io):
+    """볼륨 용량과 장치별 속도를 디스크 패널 항목 목록으로 합칩니다.
+
+    장치별 값이 없으면(예: 기록 파일 재생) 합계로 항목 하나를 만듭니다.
+    """
+    read_total, write_total, devices = disk_io if disk_io is not None else (0, 0, ())
+    if disk is None or not disk.volumes:
+        if disk is None and not devices:
+            return []
+        usage = disk.percent if disk is not None else 0
+        sub_text = f"{disk.used_gb:.1f}/{disk.total_gb:.1f} GB" if disk is not None else None
+        return [DiskPanelItem("Disk", usage, read_total, write_total, sub_text)]
+
+    rates = {device.name: device for device in devices}
+    items = []
+    for volume in disk.volumes:
+        rate = rates.pop(volume.io_name, None)
+        items.append(DiskPanelItem(
+            disk_label(volume.mountpoint), volume.percent,
+            rate.read_mbps if rate else 0, rate.write_mbps if rate else 0,
+            f"{volume.used_gb:.1f}/{volume.total_gb:.1f} GB"))
+    # Devices that could not be matched to a volume (e.g. PhysicalDriveN on Windows)
+    items.extend(DiskPanelItem(disk_label(device.name), 0, device.read_mbps, device.write_mbps, None)
+                 for device in rates.values())
+    return items
+
+def draw_disk_strip(draw_list, top_left, size, items, max_rw_mbps):
+    """디스크가 많을 때 디스크별 사용량(굵은 막대)과 읽기/쓰기(얇은 막대)를 나란히 그립니다."""
+    count = len(items)
+    if count == 0:
         return
 
-    window = glfw.create_window(2400, 480, "Hardware Monitor (ImGui)", None, None)
-    if not window:
-        glfw.terminate()
-        print("GLFW 창을 생성할 수 없습니다.", file=sys.stderr)
+    slot = size.x / count
+    bar_width = max(slot * 0.45, 1.0)
+    rate_width = max(slot * 0.15, 1.0)
+    bottom = top_left.y + size.y
+    background = imgui.get_color_u32_rgba(0.2, 0.2, 0.2, 1.0)
+    read_color = imgui.get_color_u32_rgba(*GRAPH_PRIMARY_COLOR)
+    write_color = imgui.get_color_u32_rgba(*GRAPH_SECONDARY_COLOR)
+
+    for i, item in enumerate(items):
+        x = top_left.x + i * slot
+        draw_list.add_rect_filled(x, top_left.y, x + bar_width, bottom, background)
+        usage_top = bottom - size.y * min(max(item.usage_percent, 0), 100) / 100.0
+        draw_list.add_rect_filled(x, usage_top, x + bar_width, bottom, gradient_color_u32(item.usage_percent))
+        for offset, mbps, color in ((1, item.read_mbps, read_color), (2, item.write_mbps, write_color)):
+            rate_x = x + bar_width + offset + (offset - 1) * rate_width
+            rate_top = bottom - size.y * min(mbps / max_rw_mbps, 1.0)
+            draw_list.add_rect_filled(rate_x, rate_top, rate_x + rate_width, bottom, color)
+
+    label = f"Disks ({count})"
+    label_size = gauge_geometry.text_size(label)
+    draw_list.add_text(top_left.x + (size.x - label_size.x) / 2, bottom + 15,
+                       imgui.get_color_u32_rgba(0.8, 0.8, 0.8, 1), label)
+
+PROCESS_PANEL_SECTIONS = (
+    ("CPU", 'by_cpu', lambda entry: f"{entry.cpu_percent:.0f}%"),
+    ("RAM", 'by_rss', lambda entry: f"{entry.rss_mb / 1024:.1f} GB" if entry.rss_mb >= 1024 else f"{entry.rss_mb:.0f} MB"),
+    ("I/O", 'by_io', lambda entry: f"{entry.io_mbps:.1f} MB/s"),
+)
+
+def draw_process_panel(draw_list, top_left, size, top):
+    """CPU, RAM, I/O 기준 상위 프로세스를 세 구역으로 나눠 그립니다. 높이에 맞는 만큼만 행을 표시합니다."""
+    line_height = gauge_geometry.text_size("Ag").y + 2
+    rows = int((size.y // line_height - len(PROCESS_PANEL_SECTIONS)) // len(PROCESS_PANEL_SECTIONS))
+    if rows < 1:
+        return
+    char_width = gauge_geometry.text_size("n").x
+    header_color = imgui.get_color_u32_rgba(*GRAPH_PRIMARY_COLOR)
+    text_color = imgui.get_color_u32_rgba(0.8, 0.8, 0.8, 1)
+    dim_color = imgui.get_color_u32_rgba(0.5, 0.5, 0.5, 1)
+
+    y = top_left.y
+    for title, attr, value_text in PROCESS_PANEL_SECTIONS:
+        draw_list.add_text(top_left.x, y, header_color, title)
+        y += line_height
+        entries = getattr(top, attr)[:rows]
+        if not entries:
+            draw_list.add_text(top_left.x, y, dim_color, "-")
+        for i, entry in enumerate(entries):
+            value = value_text(entry)
+            value_width = gauge_geometry.text_size(value).x
+            name_chars = max(int((size.x - value_width - char_width) / char_width), 1)
+            draw_list.add_text(top_left.x, y + i * line_height, text_color, entry.name[:name_chars])
+            draw_list.add_text(top_left.x + size.x - value_width, y + i * line_height, text_color, value)
+        y += rows * line_height
+
+def draw_history_graph(draw_list, top_left, size, series, max_value=None, min_range=1.0):
+    """히스토리 시계열을 그래프로 그립니다. 시리즈마다 하나의 폴리라인만 사용합니다.
+
+    series는 (RingBuffer, (R,G,B,A)) 튜플의 목록입니다. max_value가 None이면
+    표시되는 구간의 최대값(최소 min_range)에 맞춰 세로 축을 자동 조정합니다.
+    """
+    if size.x < 4 or size.y < 4:
         return
 
-    glfw.make_context_current(window)
-
-    if sys.platform == 'win32':
-        try:
-            import ctypes
-            hwnd = glfw.get_win32_window(window)
-            DWMWA_CAPTION_COLOR, DWMWA_TEXT_COLOR = 35, 36
-            black, white = 0x00000000, 0x00FFFFFF
-            ctypes.windll.dwmapi.DwmSetWindowAttribute(hwnd, DWMWA_CAPTION_COLOR, ctypes.byref(ctypes.c_int(black)), ctypes.sizeof(ctypes.c_int))
-            ctypes.windll.dwmapi.DwmSetWindowAttribute(hwnd, DWMWA_TEXT_COLOR, ctypes.byref(ctypes.c_int(white)), ctypes.sizeof(ctypes.c_int))
-        except Exception as e:
-            print(f"Windows 타이틀 바 색상 변경 실패: {e}", file=sys.stderr)
+    draw_list.add_rect_filled(top_left.x, top_left.y, top_left.x + size.x, top_left.y + size.y,
+                              imgui.get_color_u32_rgba(0.1, 0.1, 0.1, 1.0), rounding=3.0)
+
+    # 2px per sample, newest sample on the right edge
+    count = max(int(size.x // 2), 2)
+    step = size.x / (count - 1)
+    windows = [(ring.values(count), color) for ring, color in series]
+
+    if max_value is None:
+        max_value = max([min_range] + [max(values) for values, _ in windows if len(values)])
+    scale = (size.y - 2) / max_value if max_value > 0 else 0
+    bottom = top_left.y + size.y - 1
+    right = top_left.x + size.x
+
+    for values, color in windows:
+        n = len(values)
+        if n < 2:
+            continue
+        start_x = right - (n - 1) * step
+        points = [(start_x + i * step, bottom - min(v, max_value) * scale) for i, v in enumerate(values)]
+        draw_list.add_polyline(points, imgui.get_color_u32_rgba(*color), thickness=2.0)
+
+GRAPH_COLORS = {'primary': GRAPH_PRIMARY_COLOR, 'secondary': GRAPH_SECONDARY_COLOR}
+
+# Per-frame values the dashboard widgets read; positions come from the cached layout.
+# rollups is None when no RollupStore is attached (benchmarks); range graphs then fall back to history.
+# alerts is the AlertEngine for --alerts, or None.
+DashboardData = namedtuple('DashboardData', ['snapshot', 'history', 'max_upload_mbps', 'max_download_mbps', 'max_disk_rw_mbps',
+                                             'rollups', 'alerts'])
+
+ALERT_BORDER_COLOR = (1.0, 0.25, 0.1, 1.0)
+ALERT_FLASH_HZ = 2.0
+ALERT_BORDER_PAD = 8
+
+def alert_border(group, rects):
+    """LayoutEngine group_overlay: group에 울리는 경보가 있으면 게이지 줄 둘레에 깜빡이는 테두리를 그립니다."""
+    if not rects:
+        return None
+    left = min(rect.x for rect in rects) - ALERT_BORDER_PAD
+    top = min(rect.y for rect in rects) - ALERT_BORDER_PAD
+    right = max(rect.x + rect.width for rect in rects) + ALERT_BORDER_PAD
+    gauge_bottom = max(rect.y + rect.height for rect in rects)
+
+    def draw(draw_list, data):
+        alerts = data.alerts
+        if alerts is None or group not in alerts.firing_groups:
+            return
+        if int(time.monotonic() * ALERT_FLASH_HZ * 2) % 2:
+            return  # dark half of the blink
+        # Gauge labels sit below the circle: label at radius + 15 px, sub text 5 px under it.
+        bottom = min(gauge_bottom + 20 + 2 * imgui.get_text_line_height() + ALERT_BORDER_PAD / 2,
+                     imgui.get_io().display_size.y - 2)
+        draw_list.add_rect(left, top, right, bottom, imgui.get_color_u32_rgba(*ALERT_BORDER_COLOR),
+                           rounding=8.0, thickness=3.0)
+    return draw
+
+def _rect_center(rect):
+    return imgui.Vec2(rect.x + rect.width / 2, rect.y + rect.height / 2)
+
+class CombinedGaugeWidget(Widget):
+    """outer 값은 바깥 링, inner 값은 안쪽 원으로 표시하는 게이지. (CPU/RAM, GPU/VRAM)"""
+    OPTIONS = {'label': "", 'outer': None, 'inner': None, 'sub_text': "", 'missing_text': "N/A", 'width': 2.0, 'height': 2.0}
+
+    def __init__(self, options):
+        super().__init__(options)
+        self.outer = binding(options['outer'])
+        self.inner = binding(options['inner'])
+        self.sub_text = text_template(options['sub_text'], options['missing_text'])
+
+    def build(self, rect, radius, shape):
+        center, gauge_radius = _rect_center(rect), min(rect.width, rect.height) / 2
+        outer, inner, sub_text, label = self.outer, self.inner, self.sub_text, self.options['label']
+
+        def draw(draw_list, data):
+            snapshot = data.snapshot
+            draw_combined_gauge(draw_list, center, gauge_radius, outer(snapshot), inner(snapshot), label, sub_text(snapshot))
+        return draw
+
+class NetworkGaugeWidget(Widget):
+    """업로드(왼쪽 반원)와 다운로드(오른쪽 반원)를 함께 표시하는 게이지. 눈금은 NetScale을 따릅니다."""
+    OPTIONS = {'label': "Network", 'source': 'net', 'width': 2.0, 'height': 2.0}
+
+    def __init__(self, options):
+        super().__init__(options)
+        self.source = binding(options['source'], None)
+
+    def build(self, rect, radius, shape):
+        center, gauge_radius = _rect_center(rect), min(rect.width, rect.height) / 2
+        source, label = self.source, self.options['label']
+
+        def draw(draw_list, data):
+            net = source(data.snapshot)
+            up, down = (net.upload_mbps, net.download_mbps) if net is not None else (0, 0)
+            up_percent = up / data.max_upload_mbps * 100 if data.max_upload_mbps > 0 else 0
+            down_percent = down / data.max_download_mbps * 100 if data.max_download_mbps > 0 else 0
+            draw_network_gauge(draw_list, center, gauge_radius, up_percent, down_percent, label, up, down,
+                               active_nic_text(net.nics) if net is not None else None)
+        return draw
+
+class CoreGridWidget(Widget):
+    """코어별 사용률 그리드. 코어가 많으면 NUMA 노드/소켓별 히트 스트립으로 접힙니다."""
+    OPTIONS = {'cores': 'cpu.cores', 'width': 1.0, 'height': 1.0}
+
+    def __init__(self, options):
+        super().__init__(options)
+        self.cores = binding(options['cores'], ())
+
+    def build(self, rect, radius, shape):
+        top_left, size, cores = imgui.Vec2(rect.x, rect.y), imgui.Vec2(rect.width, rect.height), self.cores
+
+        def draw(draw_list, data):
+            draw_core_grid(draw_list, top_left, size, cores(data.snapshot))
+        return draw
+
+class GpuStripWidget(Widget):
+    """GPU별 사용률/VRAM 스트립. 장치가 min_devices개 이상일 때만 자리를 차지합니다."""
+    OPTIONS = {'devices': 'gpu.devices', 'min_devices': 2, 'width': 1.0, 'height': 1.5}
+    dynamic = True
+
+    def __init__(self, options):
+        super().__init__(options)
+        self.devices = binding(options['devices'], ())
+
+    def shape(self, data):
+        return len(self.devices(data.snapshot)) >= self.options['min_devices']
+
+    def size(self, radius, shape):
+        return super().size(radius, shape) if shape else None
+
+    def build(self, rect, radius, shape):
+        top_left, size, devices = imgui.Vec2(rect.x, rect.y), imgui.Vec2(rect.width, rect.height), self.devices
+
+        def draw(draw_list, data):
+            draw_gpu_strip(draw_list, top_left, size, devices(data.snapshot))
+        return draw
+
+class ProcessPanelWidget(Widget):
+    """상위 프로세스 표. 스캐너 값이 있을 때만 자리를 차지합니다."""
+    OPTIONS = {'source': 'processes', 'width': 1.5, 'height': 2.0}
+    dynamic = True
+
+    def __init__(self, options):
+        super().__init__(options)
+        self.source = binding(options['source'], None)
+
+    def shape(self, data):
+        return self.source(data.snapshot) is not None
+
+    def size(self, radius, shape):
+        return super().size(radius, shape) if shape else None
+
+    def build(self, rect, radius, shape):
+        top_left, size, source = imgui.Vec2(rect.x, rect.y), imgui.Vec2(rect.width, rect.height), self.source
+
+        def draw(draw_list, data):
+            top = source(data.snapshot)
+            if top is not None:
+                draw_process_panel(draw_list, top_left, size, top)
+        return draw
+
+class DiskGaugesWidget(Widget):
+    """디스크마다 게이지 하나. gauge_limit개를 넘으면 strip_width x strip_height 크기의 스트립으로 바뀝니다."""
+    OPTIONS = {'disk': 'disk', 'disk_io': 'disk_io', 'gauge_limit': DISK_GAUGE_LIMIT, 'gauge_gap': DISK_GAUGE_GAP,
+               'strip_width': 3.0, 'strip_height': 1.5}
+    dynamic = True
+
+    def __init__(self, options):
+        super().__init__(options)
+        self.disk = binding(options['disk'], None)
+        self.disk_io = binding(options['disk_io'], None)
+        self._items = (None, None, [])
+
+    def items(self, snapshot):
+        """disk_panel_items 결과. 두 Collector 값이 그대로면 지난 결과를 재사용합니다."""
+        disk, disk_io = self.disk(snapshot), self.disk_io(snapshot)
+        cached_disk, cached_io, items = self._items
+        if disk is not cached_disk or disk_io is not cached_io:
+            items = disk_panel_items(disk, disk_io)
+            self._items = (disk, disk_io, items)
+        return items
+
+    def shape(self, data):
+        count = len(self.items(data.snapshot))
+        return count if count <= self.options['gauge_limit'] else 0  # 0: strip
+
+    def size(self, radius, shape):
+        if shape:
+            return shape * 2 * radius + (shape - 1) * self.options['gauge_gap'], 2 * radius
+        return self.options['strip_width'] * radius, self.options['strip_height'] * radius
+
+    def build(self, rect, radius, shape):
+        items = self.items
+        if not shape:
+            top_left, size = imgui.Vec2(rect.x, rect.y), imgui.Vec2(rect.width, rect.height)
+
+            def draw(draw_list, data):
+                draw_disk_strip(draw_list, top_left, size, items(data.snapshot), data.max_disk_rw_mbps)
+            return draw
+
+        step = 2 * radius + self.options['gauge_gap']
+        centers = [imgui.Vec2(rect.x + radius + i * step, rect.y + radius) for i in range(shape)]
+
+        def draw(draw_list, data):
+            max_rw = data.max_disk_rw_mbps
+            for center, item in zip(centers, items(data.snapshot)):
+                draw_disk_gauge(draw_list, center, radius, item.usage_percent,
+                                (item.read_mbps / max_rw) * 100, (item.write_mbps / max_rw) * 100,
+                                item.label, item.read_mbps, item.write_mbps, item.sub_text)
+        return draw
+
+class GraphWidget(Widget):
+    """그룹 위쪽에 그룹 폭만큼 펼쳐지는 히스토리 그래프. series는 [메트릭 이름, 색] 목록입니다.
+
+    색은 'primary', 'secondary' 또는 [R, G, B, A]입니다. max_value가 없으면 세로 축을 자동으로 맞춥니다.
+    range(초)가 있으면 최근 샘플 대신 롤업에서 그 구간을 픽셀 열마다 min/max로 줄여 그립니다.
+    """
+    OPTIONS = {'series': [], 'max_value': None, 'min_range': 1.0, 'range': None}
+
+    def __init__(self, options):
+        super().__init__(options)
+        series = []
+        for entry in options['series']:
+            if not isinstance(entry, (list, tuple)) or len(entry) != 2 or not isinstance(entry[0], str):
+                raise ValueError(f"series 항목은 [메트릭 이름, 색]이어야 합니다: {entry!r}")
+            metric, color = entry
+            if isinstance(color, str):
+                if color not in GRAPH_COLORS:
+                    raise ValueError(f"알 수 없는 색: {color!r} (가능: {', '.join(GRAPH_COLORS)})")
+                color = GRAPH_COLORS[color]
+            elif not (isinstance(color, (list, tuple)) and len(color) == 4):
+                raise ValueError(f"색은 이름 또는 [R, G, B, A]여야 합니다: {color!r}")
+            series.append((metric, tuple(color)))
+        max_value = options['max_value']
+        if max_value is not None and not isinstance(max_value, (int, float)):
+            raise ValueError(f"max_value는 숫자여야 합니다: {max_value!r}")
+        span = options['range']
+        if span is not None and (not isinstance(span, (int, float)) or isinstance(span, bool) or span <= 0):
+            raise ValueError(f"range는 양수(초)여야 합니다: {span!r}")
+        self.series = tuple(series)
+
+    def build(self, rect, radius, shape):
+        top_left, size = imgui.Vec2(rect.x, rect.y), imgui.Vec2(rect.width, rect.height)
+        series, max_value, min_range, span = self.series, self.options['max_value'], self.options['min_range'], self.options['range']
+
+        def draw(draw_list, data):
+            if span and data.rollups is not None:
+                view = data.rollups.view
+                draw_history_graph(draw_list, top_left, size, [(view(metric, span), color) for metric, color in series],
+                                   max_value=max_value, min_range=min_range)
+                return
+            buffer = data.history.buffer
+            draw_history_graph(draw_list, top_left, size, [(buffer(metric), color) for metric, color in series],
+                               max_value=max_value, min_range=min_range)
+        return draw
+
+WIDGET_TYPES = {
+    'combined_gauge': CombinedGaugeWidget,
+    'network_gauge': NetworkGaugeWidget,
+    'core_grid': CoreGridWidget,
+    'gpu_strip': GpuStripWidget,
+    'process_panel': ProcessPanelWidget,
+    'disk_gauges': DiskGaugesWidget,
+    'graph': GraphWidget,
+}
+
+# --layout 파일이 없을 때의 배치. 같은 구조의 TOML/JSON 파일로 바꿀 수 있습니다. (README 참고)
+DEFAULT_LAYOUT = {
+    'layout': dict(LAYOUT_OPTIONS),
+    'groups': [
+        {'name': 'cpu',
+         'widgets': [
+             {'type': 'combined_gauge', 'label': "CPU / RAM", 'outer': 'cpu.total', 'inner': 'ram.percent',
+              'sub_text': "{ram.used_gb:.1f}/{ram.total_gb:.1f} GB"},
+             {'type': 'core_grid'},
+             {'type': 'process_panel'},
+         ],
+         'graph': {'series': [['ram', 'secondary'], ['cpu', 'primary']], 'max_value': 100}},
+        {'name': 'gpu',
+         'widgets': [
+             {'type': 'combined_gauge', 'label': "GPU / VRAM", 'outer': 'gpu.percent', 'inner': 'gpu.vram_percent',
+              'sub_text': "{gpu.vram_used_mb:.0f}/{gpu.vram_total_mb:.0f} MB"},
+             {'type': 'gpu_strip'},
+         ],
+         'graph': {'series': [['vram', 'secondary'], ['gpu', 'primary']], 'max_value': 100}},
+        {'name': 'network',
+         'widgets': [{'type': 'network_gauge'}],
+         'graph': {'series': [['net_up', 'secondary'], ['net_down', 'primary']]}},
+        {'name': 'disks',
+         'widgets': [{'type': 'disk_gauges'}],
+         'graph': {'series': [['disk_write', 'secondary'], ['disk_read', 'primary']]}},
+    ],
+}
+_default_layout = None
+
+def default_layout():
+    """DEFAULT_LAYOUT으로 만든 LayoutEngine을 반환합니다. 처음 부를 때 한 번만 만듭니다."""
+    global _default_layout
+    if _default_layout is None:
+        _default_layout = LayoutEngine(WIDGET_TYPES, DEFAULT_LAYOUT, group_overlay=alert_border)
+    return _default_layout
+
+def draw_dashboard(draw_list, width, height, snapshot, history, max_upload_mbps, max_download_mbps, max_disk_rw_mbps, layout=None,
+                   rollups=None, alerts=None):
+    """스냅샷과 히스토리로 대시보드를 그립니다. 위치는 layout(기본 레이아웃)이 캐시한 것을 씁니다."""
+    gauge_geometry.update_window_size(width, height)
+    (layout or default_layout()).draw(draw_list, width, height,
+                                      DashboardData(snapshot, history, max_upload_mbps, max_download_mbps, max_disk_rw_mbps,
+                                                    rollups, alerts))
+
+HOST_ROW_MIN_HEIGHT = 96  # 호스트가 많으면 이 높이를 지키도록 여러 열로 나눕니다.
+HOST_LABEL_FRACTION = 0.16
+
+def draw_host_rows(draw_list, width, height, hosts, max_disk_rw_mbps, now=None):
+    """집계 모드에서 호스트마다 한 줄씩 CPU/RAM, GPU, 네트워크, 디스크 게이지를 그립니다."""
+    if not hosts:
+        text = "Waiting for agents..."
+        text_size = gauge_geometry.text_size(text)
+        draw_list.add_text((width - text_size.x) / 2, (height - text_size.y) / 2,
+                           imgui.get_color_u32_rgba(0.7, 0.7, 0.7, 1), text)
+        return
 
-    imgui.create_context()
-    impl = GlfwRenderer(window)
-    
+    gauge_geometry.update_window_size(width, height)
+    rows_per_column = max(int(height // HOST_ROW_MIN_HEIGHT), 1)
+    columns = math.ceil(len(hosts) / rows_per_column)
+    rows = math.ceil(len(hosts) / columns)
+    cell_width = width / columns
+    cell_height = height / rows
+    label_width = cell_width * HOST_LABEL_FRACTION
+    gauge_slot = (cell_width - label_width) / 4
+    radius = max(min(cell_height * 0.38, gauge_slot * 0.4), 4.0)
+    separator = imgui.get_color_u32_rgba(0.15, 0.15, 0.15, 1.0)
+
+    for index, host in enumerate(hosts):
+        left = (index // rows) * cell_width
+        top = (index % rows) * cell_height
+        center_y = top + cell_height / 2
+        snapshot = host.snapshot
+        offline = host.is_offline(now)
+
+        name_color = imgui.get_color_u32_rgba(0.5, 0.5, 0.5, 1) if offline else imgui.get_color_u32_rgba(0.9, 0.9, 0.9, 1)
+        name_size = gauge_geometry.text_size(host.name)
+        draw_list.add_text(left + 10, center_y - name_size.y / 2, name_color, host.name)
+        if offline:
+            draw_list.add_text(left + 10, center_y + name_size.y / 2, imgui.get_color_u32_rgba(0.8, 0.3, 0.3, 1), "offline")
+        if index % rows:
+            draw_list.add_line(left, top, left + cell_width, top, separator)
+
+        x = left + label_width + gauge_slot / 2
+        cpu = snapshot.get('cpu')
+        ram = snapshot.get('ram')
+        draw_combined_gauge(draw_list, imgui.Vec2(x, center_y), radius,
+                            cpu.total if cpu else 0, ram.percent if ram else 0, "")
+        gpu = snapshot.get('gpu')
+        draw_combined_gauge(draw_list, imgui.Vec2(x + gauge_slot, center_y), radius,
+                            gpu.percent if gpu else 0, gpu.vram_percent if gpu else 0, "")
+        net = snapshot.get('net')
+        if net is not None:
+            draw_network_gauge(draw_list, imgui.Vec2(x + 2 * gauge_slot, center_y), radius,
+                               net.upload_mbps / host.net_scale.upload_mbps * 100,
+                               net.download_mbps / host.net_scale.download_mbps * 100,
+                               "", net.upload_mbps, net.download_mbps)
+        disk = snapshot.get('disk')
+        disk_io = snapshot.get('disk_io')
+        if disk_io is not None:
+            draw_disk_gauge(draw_list, imgui.Vec2(x + 3 * gauge_slot, center_y), radius,
+                            disk.percent if disk else 0,
+                            disk_io.read_mbps / max_disk_rw_mbps * 100, disk_io.write_mbps / max_disk_rw_mbps * 100,
+                            "", disk_io.read_mbps, disk_io.write_mbps)
+
+DRAW_FUNCTIONS = ('draw_dashboard', 'draw_host_rows', 'draw_combined_gauge', 'draw_core_grid', 'draw_process_panel',
+                  'draw_gpu_strip', 'draw_network_gauge', 'draw_disk_gauge', 'draw_disk_strip', 'draw_history_graph')
+
+def draw_stats_overlay(draw_list, x, y, summary):
+    """계측 요약(구간별 p50/p99/최대, ms)을 반투명 표로 그립니다."""
+    if not summary:
+        return
+    lines = [f"{'section':<28}{'p50':>8}{'p99':>8}{'max':>8}"]
+    lines.extend(f"{name[:27]:<28}{values['p50_ms']:>8.2f}{values['p99_ms']:>8.2f}{values['max_ms']:>8.2f}"
+                 for name, values in summary.items())
+    line_height = gauge_geometry.text_size("Ag").y + 1
+    width = max(gauge_geometry.text_size(line).x for line in lines) + 16
+    draw_list.add_rect_filled(x, y, x + width, y + len(lines) * line_height + 12,
+                              imgui.get_color_u32_rgba(0, 0, 0, 0.8), 4)
+    text_color = imgui.get_color_u32_rgba(0.85, 0.85, 0.85, 1)
+    for i, line in enumerate(lines):
+        draw_list.add_text(x + 8, y + 6 + i * line_height, text_color, line)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Wide Hardware Monitor")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--record', metavar='FILE', help="수집한 스냅샷을 바이너리 로그 파일로 기록합니다.")
+    mode.add_argument('--replay', metavar='FILE', help="psutil/NVML 대신 기록 파일을 재생합니다.")
+    mode.add_argument('--agent', metavar='HOST:PORT', help="창 없이 수집만 하고 스냅샷을 집계기로 보냅니다.")
+    mode.add_argument('--aggregate', metavar='[HOST:]PORT', nargs='?', const=str(DEFAULT_PORT),
+                      help=f"여러 에이전트의 스냅샷을 받아 호스트별로 표시합니다. (기본 포트 {DEFAULT_PORT})")
+    parser.add_argument('--speed', type=float, default=1.0, help="재생 배율 (기본값 1.0)")
+    parser.add_argument('--seek', type=float, default=0.0, help="재생 시작 위치 (기록 시작 기준 초)")
+    parser.add_argument('--loop', action='store_true', help="기록 끝에 도달하면 처음부터 다시 재생합니다.")
+    parser.add_argument('--send-interval', type=float, default=0.5, help="에이전트 전송 주기 (초)")
+    parser.add_argument('--host-name', help="에이전트가 보고할 호스트 이름 (기본값: 시스템 호스트 이름)")
+    parser.add_argument('--metrics', metavar='[HOST:]PORT', nargs='?', const=str(DEFAULT_METRICS_PORT),
+                        help=f"최신 스냅샷을 OpenMetrics 형식으로 /metrics에 내보냅니다. (기본 127.0.0.1:{DEFAULT_METRICS_PORT})")
+    parser.add_argument('--stats', metavar='FILE', nargs='?', const='',
+                        help="구간별 소요 시간을 계측해 주기적으로 출력하고, FILE을 주면 JSON으로 저장합니다. (F12: 화면 표시)")
+    parser.add_argument('--stats-interval', type=float, default=10.0, help="계측 요약 출력 주기 (초)")
+    parser.add_argument('--profile', choices=('cprofile', 'sample'),
+                        help="시작 후 --profile-frames 프레임 동안 프로파일링합니다. (F11: 실행 중 다시 시작)")
+    parser.add_argument('--profile-frames', type=int, default=300, help="프로파일링할 프레임 수")
+    parser.add_argument('--profile-out', metavar='FILE', help="프로파일 결과 파일 (기본값: hwmon-<시각>.prof/.folded)")
+    parser.add_argument('--first-frame-exit', action='store_true',
+                        help="첫 프레임을 표시한 뒤 걸린 시간을 출력하고 종료합니다. (시작 시간 측정용)")
+    parser.add_argument('--layout', metavar='FILE',
+                        help="대시보드 배치를 TOML/JSON 파일에서 읽습니다. 실행 중 파일을 고치면 바로 반영됩니다.")
+    parser.add_argument('--alerts', metavar='FILE',
+                        help="경보 규칙(TOML/JSON)을 읽어 샘플마다 평가합니다. 울리면 해당 게이지 테두리가 깜빡이고 훅을 실행합니다.")
+    offscreen = parser.add_argument_group("offscreen", "창 없이 EGL 오프스크린 프레임버퍼에 그려 프레임을 내보냅니다.")
+    offscreen.add_argument('--offscreen', metavar='WxH', help="창 대신 이 크기의 오프스크린 프레임버퍼에 그립니다. (예: 1920x480)")
+    offscreen.add_argument('--offscreen-out', metavar='PATH', help="프레임을 쓸 파일, FIFO 또는 '-'(표준 출력)")
+    offscreen.add_argument('--offscreen-framing', choices=('rects', 'full'), default='rects',
+                           help="rects: 프레임 헤더와 바뀐 사각형만, full: 헤더 없는 전체 프레임 (기본값 rects)")
+    offscreen.add_argument('--offscreen-format', choices=('rgb565', 'rgb888'), default='rgb565', help="출력 픽셀 형식 (기본값 rgb565)")
+    offscreen.add_argument('--offscreen-shm', metavar='NAME', help="최신 프레임을 유지할 공유 메모리 블록 이름")
+    offscreen.add_argument('--offscreen-png', metavar='PATH', help="PNG 스냅샷 경로. '%%'가 있으면 strftime 패턴입니다.")
+    offscreen.add_argument('--png-interval', type=float, default=10.0, help="PNG 스냅샷 주기 (초)")
+    offscreen.add_argument('--offscreen-frames', type=int, metavar='N', help="프레임을 N개 읽은 뒤 종료합니다. (CI, 스냅샷용)")
+    parser.add_argument('--max-fps', type=float, default=30.0, help="값이 빠르게 바뀔 때의 최대 프레임 속도")
+    parser.add_argument('--idle-fps', type=float, default=1.0, help="화면 변화가 없을 때의 프레임 속도")
+    return parser.parse_args(argv)
+
+def handle_replay_keys(replayer):
+    """재생 모드 키: ←/→ 10초 이동, ↑/↓ 배율 2배/절반, Space 일시정지."""
+    import glfw
+    if imgui.is_key_pressed(glfw.KEY_RIGHT):
+        replayer.seek(replayer.position + 10)
+    if imgui.is_key_pressed(glfw.KEY_LEFT):
+        replayer.seek(replayer.position - 10)
+    if imgui.is_key_pressed(glfw.KEY_UP):
+        replayer.set_speed(min(replayer.speed * 2, 1024))
+    if imgui.is_key_pressed(glfw.KEY_DOWN):
+        replayer.set_speed(max(replayer.speed / 2, 0.125))
+    if imgui.is_key_pressed(glfw.KEY_SPACE):
+        replayer.toggle_pause()
+
+def preload_modules():
+    """창을 만드는 동안 백그라운드 스레드에서 무거운 모듈을 미리 가져옵니다.
+
+    메인 스레드가 같은 모듈을 가져오려 하면 임포트 락에서 이 스레드가 끝나기를 기다립니다.
+    """
+    def run():
+        import OpenGL.GL  # noqa: F401  needed right after the window exists
+        from imgui.integrations.glfw import GlfwRenderer  # noqa: F401
+        load_numpy()
+    thread = threading.Thread(target=run, name="preload", daemon=True)
+    thread.start()
+    return thread
+
+def run_agent(args, alerts=None):
+    """창 없이 Sampler만 실행하고 스냅샷을 집계기로 보냅니다. alerts가 있으면 이 호스트에서 규칙을 평가합니다. Ctrl+C로 종료합니다."""
+    address = parse_address(args.agent, default_host='127.0.0.1')
+    gpu_poller = NvmlPoller()
+    gpu_poller.init()
+    collectors = default_collectors(gpu_poller, processes=False)
+    dumper = None
+    if args.stats is not None:
+        stats = FrameStats()
+        instrument_collectors(collectors, stats)
+        dumper = StatsDumper(stats, args.stats_interval, args.stats or None)
+    sampler = Sampler(collectors)
+    sender = AgentSender(address, record_fields(cpu_core_count(), len(gpu_poller.devices)),
+                         host=args.host_name, interval=args.send_interval)
+    sampler.add_listener(sender.on_sample)
+    if alerts:
+        sampler.add_listener(alerts.on_sample)
+    metrics = start_metrics_server(sampler, parse_address(args.metrics, '127.0.0.1')) if args.metrics else None
+    sampler.start()
+    print(f"에이전트: {sender.encoder.host} -> {address[0]}:{address[1]} ({args.send_interval}s 주기)")
+    try:
+        while True:
+            time.sleep(1.0)
+            if dumper:
+                dumper.maybe_dump()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sampler.stop()
+        sender.close()
+        if alerts:
+            alerts.close()
+        if metrics:
+            metrics.stop()
+        gpu_poller.shutdown()
+
+MAX_DISK_RW_MBPS = 1000  # 1GB/s
+BACKGROUND_WINDOW_FLAGS = (imgui.WINDOW_NO_TITLE_BAR | imgui.WINDOW_NO_RESIZE | imgui.WINDOW_NO_MOVE | imgui.WINDOW_NO_SCROLLBAR
+                           | imgui.WINDOW_NO_COLLAPSE | imgui.WINDOW_NO_BACKGROUND)
+
+# sampler: 스냅샷 공급원 (Sampler, Replayer 또는 Aggregator). 나머지는 모드에 따라 None입니다.
+DataSources = namedtuple('DataSources', ['sampler', 'history', 'rollups', 'net_scale', 'recorder', 'replayer', 'aggregator',
+                                         'gpu_poller', 'collectors', 'alerts'])
+
+def open_sources(args, alerts=None):
+    """--aggregate, --replay, 또는 실시간 수집(--record 포함)에 맞는 데이터 공급원을 만듭니다. 시작은 하지 않습니다.
+
+    alerts(AlertEngine)는 집계 모드가 아니면 샘플마다 규칙을 평가하도록 등록합니다.
+    """
+    # Network gauges auto-range from recent peaks, capped at the active links' speed.
+    net_scale = NetScale()
+    history = MetricHistory()
+    rollups = RollupStore()
+    recorder = None
+    replayer = None
+    aggregator = None
+    gpu_poller = None
+    collectors = ()
+    if args.aggregate:
+        sampler = aggregator = Aggregator(parse_address(args.aggregate))
+        print(f"집계: {aggregator.address[0]}:{aggregator.address[1]} 에서 에이전트를 기다립니다.")
+    elif args.replay:
+        sampler = replayer = Replayer(args.replay, speed=args.speed, loop=args.loop)
+        replayer.seek(args.seek)
+        print(f"재생: {args.replay} ({len(replayer.recording)} 레코드, x{args.speed})")
+    else:
+        gpu_poller = NvmlPoller()
+        if args.record:
+            gpu_poller.init()  # the record layout needs the GPU count up front
+        else:
+            gpu_poller.init_async()  # the GPU gauge shows N/A until NVML is ready
+        collectors = default_collectors(gpu_poller)
+        sampler = Sampler(collectors)
+        if args.record:
+            trigger = next(collector for collector in collectors if collector.name == 'cpu')
+            recorder = Recorder(args.record, record_fields(cpu_core_count(), len(gpu_poller.devices)), trigger.interval)
+            sampler.add_listener(recorder.on_sample)
+            print(f"기록: {args.record}")
+    if not aggregator:
+        sampler.add_listener(history.on_sample)
+        sampler.add_listener(rollups.on_sample)
+        sampler.add_listener(net_scale.on_sample)
+        if alerts:
+            sampler.add_listener(alerts.on_sample)
+    elif alerts:
+        print("집계 모드에서는 경보 규칙을 평가하지 않습니다. 에이전트에서 --alerts를 쓰세요.", file=sys.stderr)
+        alerts = None
+    return DataSources(sampler, history, rollups, net_scale, recorder, replayer, aggregator, gpu_poller, collectors, alerts)
+
+def close_sources(sources):
+    sources.sampler.stop()
+    if sources.recorder:
+        sources.recorder.close()
+    if sources.gpu_poller:
+        sources.gpu_poller.shutdown()
+    if sources.alerts:
+        sources.alerts.close()
+
+def draw_scene(draw_list, width, height, sources, layout):
+    """대시보드(집계 모드면 호스트별 줄)와 재생 상태 줄을 그립니다."""
+    if sources.aggregator:
+        draw_host_rows(draw_list, width, height, sources.aggregator.hosts, MAX_DISK_RW_MBPS)
+    else:
+        draw_dashboard(draw_list, width, height, sources.sampler.snapshot, sources.history,
+                       sources.net_scale.upload_mbps, sources.net_scale.download_mbps, MAX_DISK_RW_MBPS, layout,
+                       sources.rollups, sources.alerts)
+
+    replayer = sources.replayer
+    if replayer:
+        total = replayer.end_time - replayer.start_time
+        state = "PAUSED" if replayer.paused else f"x{replayer.speed:g}"
+        draw_list.add_text(10, height - 40, imgui.get_color_u32_rgba(0.7, 0.7, 0.7, 1),
+                           f"REPLAY {replayer.position:.1f}/{total:.1f}s {state}")
+
+def load_font(impl):
+    """Windows면 시스템 TTF 폰트를 32px로 올리고, 찾지 못하면 ImGui 기본 폰트를 씁니다."""
     io = imgui.get_io()
     io.fonts.clear()
     font_size = 32.0
@@ -356,7 +1048,8 @@ def main():
     
     if font_path:
         try:
-            io.fonts.add_font_from_file_ttf(font_path, font_size)
+            # At this size oversampling buys nothing visible but triples rasterization and the atlas upload.
+            io.fonts.add_font_from_file_ttf(font_path, font_size, imgui.FontConfig(oversample_h=1, oversample_v=1))
             impl.refresh_font_texture()
             print(f"폰트 로드 성공: {font_path} ({font_size}px)")
         except (IOError, RuntimeError) as e:
@@ -365,28 +1058,238 @@ def main():
     
     if not font_path:
         print("적절한 TTF 폰트를 찾지 못했습니다. ImGui 기본 폰트를 사용합니다.", file=sys.stderr)
+        io.fonts.add_font_default()  # the atlas was cleared above
+        impl.refresh_font_texture()
 
-    gpu_handle = init_nvml()
+READBACK_POLL = 0.002  # 비동기 읽기가 남아 있을 때 이벤트 대기를 끊는 간격 (초)
 
-    target_fps = 10.0
-    frame_duration = 1.0 / target_fps
-    
-    nic_speed = get_network_speed_mbps()
-    max_upload_mbps = nic_speed
-    max_download_mbps = nic_speed
-    print(f"Network speed detected: {nic_speed} Mbps")
+def run_offscreen(args, layout, alerts=None):
+    """창 없이 EGL 오프스크린 프레임버퍼에 그리고, 프레임을 파일/파이프/공유 메모리/PNG로 내보냅니다."""
+    import offscreen
+    try:
+        width, height = offscreen.parse_size(args.offscreen)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return
+    offscreen.use_egl_platform()
+    try:
+        context = offscreen.EglContext()
+    except Exception as e:  # missing libEGL, no usable config, ...
+        print(f"오프스크린 GL 컨텍스트를 만들 수 없습니다: {e}", file=sys.stderr)
+        return
+    import OpenGL.GL as gl
+    from imgui.integrations.opengl import ProgrammablePipelineRenderer
+    load_numpy()
+
+    reader = offscreen.FrameReader(width, height)
+    imgui.create_context()
+    impl = ProgrammablePipelineRenderer()
+    load_font(impl)
+    imgui.get_io().display_size = (width, height)
+    sinks = []
+    try:
+        if args.offscreen_out:
+            sinks.append(offscreen.StreamSink(args.offscreen_out, args.offscreen_framing))
+        if args.offscreen_shm:
+            sinks.append(offscreen.SharedMemorySink(args.offscreen_shm, width, height, args.offscreen_format))
+    except OSError as e:  # FileExistsError for a taken shared memory name, too
+        print(f"프레임 출력을 열 수 없습니다: {e}", file=sys.stderr)
+        for sink in sinks:
+            sink.close()
+        impl.shutdown()
+        context.close()
+        return
+    exporter = offscreen.FrameExporter(args.offscreen_format, sinks)
+    png = offscreen.PngSnapshots(args.offscreen_png, args.png_interval) if args.offscreen_png else None
+    print(f"오프스크린: {width}x{height} {args.offscreen_format}, {context.renderer}")
+
+    sources = open_sources(args, alerts)
+    sampler = sources.sampler
+    stats = FrameStats()
+    dumper = StatsDumper(stats, args.stats_interval, args.stats or None, stream=sys.stdout) if args.stats is not None else None
+    if dumper:
+        instrument_functions(globals(), DRAW_FUNCTIONS, stats)
+        instrument_collectors(sources.collectors, stats)
+        stats.instrumented = True
+    scheduler = RenderScheduler(max_fps=args.max_fps, idle_fps=args.idle_fps)
+    wake = threading.Event()
+    sampler.add_listener(lambda *_: wake.set())
+    metrics = start_metrics_server(sampler, parse_address(args.metrics, '127.0.0.1')) if args.metrics else None
+    sampler.start()
+
+    last = None
+    try:
+        while args.offscreen_frames is None or exporter.frames < args.offscreen_frames:
+            timeout = scheduler.wait_timeout()
+            if reader.pending:
+                timeout = min(timeout, READBACK_POLL)
+            if wake.wait(timeout):
+                wake.clear()
+            for last in reader.poll():
+                exporter.push(last)
+                if png:
+                    png.maybe_write(last)
+            if dumper:
+                dumper.maybe_dump()
+            if layout and layout.maybe_reload():
+                scheduler.mark_dirty()
+            if not scheduler.should_render(sampler.snapshot):
+                continue
+
+            stats.start_frame()
+            imgui.new_frame()
+            imgui.set_next_window_size(width, height)
+            imgui.set_next_window_position(0, 0)
+            imgui.begin("Background", flags=BACKGROUND_WINDOW_FLAGS)
+            draw_scene(imgui.get_window_draw_list(), width, height, sources, layout)
+            imgui.end()
+            stats.lap('build')
+
+            reader.bind()
+            gl.glClearColor(0.0, 0.0, 0.0, 1.0)
+            gl.glClear(gl.GL_COLOR_BUFFER_BIT)
+            imgui.render()
+            stats.lap('imgui.render')
+            impl.render(imgui.get_draw_data())
+            stats.lap('impl.render')
+            reader.start()
+            stats.lap('readback')
+            stats.end_frame()
+            scheduler.rendered()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        close_sources(sources)
+        if args.offscreen_frames is None:
+            for last in reader.poll(block=True):
+                exporter.push(last)
+        if png and last is not None:
+            png.write(last)
+        exporter.close()
+        if dumper:
+            dumper.dump()
+        if metrics:
+            metrics.stop()
+        reader.close()
+        impl.shutdown()
+        context.close()
+    if exporter.full_bytes:
+        print(f"오프스크린: {exporter.frames} 프레임 중 {exporter.pushed_frames}개 전송, "
+              f"전체 프레임 대비 {exporter.pushed_bytes / exporter.full_bytes:.1%} 바이트")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.offscreen and args.offscreen_out == '-':
+        sys.stdout = sys.stderr  # stdout carries the frames; keep every status line out of the stream
+    alerts = None
+    if args.alerts:
+        from alerts import AlertEngine
+        try:
+            alerts = AlertEngine.from_file(args.alerts, host=args.host_name)
+        except (OSError, ValueError) as e:
+            print(f"경보 규칙을 읽을 수 없습니다 ({args.alerts}): {e}", file=sys.stderr)
+            return
+        print(f"경보: 규칙 {len(alerts.rules)}개 ({args.alerts})")
+    if args.record and os.path.exists(args.record):
+        print(f"기록 파일이 이미 있습니다 ({args.record}). 덮어쓰지 않으니 다른 이름을 지정하세요.", file=sys.stderr)
+        return
+    if args.replay:
+        try:
+            RecordingFile(args.replay).close()  # fail before any window opens; open_sources reopens it
+        except (OSError, ValueError) as e:
+            print(f"기록 파일을 읽을 수 없습니다 ({args.replay}): {e}", file=sys.stderr)
+            return
+    if args.agent:
+        run_agent(args, alerts)
+        return
 
-    last_net_io = psutil.net_io_counters()
-    last_net_time = time.time()
+    layout = None
+    if args.layout:
+        try:
+            layout = LayoutEngine.from_file(WIDGET_TYPES, args.layout, group_overlay=alert_border)
+        except (OSError, ValueError) as e:
+            print(f"레이아웃을 읽을 수 없습니다 ({args.layout}): {e}", file=sys.stderr)
+            return
+    if args.offscreen:
+        run_offscreen(args, layout, alerts)
+        return
 
-    last_disk_io = psutil.disk_io_counters()
-    last_disk_time = time.time()
-    max_disk_rw_mbps = 1000  # 1GB/s
+    preload_modules()
+    import glfw
+    if not glfw.init():
+        print("GLFW를 초기화할 수 없습니다.", file=sys.stderr)
+        return
 
-    while not glfw.window_should_close(window):
-        frame_start_time = time.time()
+    window = glfw.create_window(2400, 480, "Hardware Monitor (ImGui)", None, None)
+    if not window:
+        glfw.terminate()
+        print("GLFW 창을 생성할 수 없습니다.", file=sys.stderr)
+        return
+
+    glfw.make_context_current(window)
+    import OpenGL.GL as gl
+    from imgui.integrations.glfw import GlfwRenderer
 
-        glfw.poll_events()
+    if sys.platform == 'win32':
+        try:
+            import ctypes
+            hwnd = glfw.get_win32_window(window)
+            DWMWA_CAPTION_COLOR, DWMWA_TEXT_COLOR = 35, 36
+            black, white = 0x00000000, 0x00FFFFFF
+            ctypes.windll.dwmapi.DwmSetWindowAttribute(hwnd, DWMWA_CAPTION_COLOR, ctypes.byref(ctypes.c_int(black)), ctypes.sizeof(ctypes.c_int))
+            ctypes.windll.dwmapi.DwmSetWindowAttribute(hwnd, DWMWA_TEXT_COLOR, ctypes.byref(ctypes.c_int(white)), ctypes.sizeof(ctypes.c_int))
+        except Exception as e:
+            print(f"Windows 타이틀 바 색상 변경 실패: {e}", file=sys.stderr)
+
+    imgui.create_context()
+    impl = GlfwRenderer(window)
+    load_font(impl)
+
+    sources = open_sources(args, alerts)
+    sampler, replayer, collectors = sources.sampler, sources.replayer, sources.collectors
+
+    # Frame-level laps are always on; per-function wrappers only once --stats or F12 asks for them.
+    stats = FrameStats()
+    show_stats = False
+    dumper = StatsDumper(stats, args.stats_interval, args.stats or None) if args.stats is not None else None
+
+    def enable_instrumentation():
+        if not stats.instrumented:
+            instrument_functions(globals(), DRAW_FUNCTIONS, stats)
+            instrument_collectors(collectors, stats)
+            stats.instrumented = True
+
+    if dumper:
+        enable_instrumentation()
+    profile_hook = FrameProfileHook(args.profile, args.profile_frames, args.profile_out) if args.profile else None
+
+    # Redraw only on visible change, resize/expose or input; otherwise block in GLFW.
+    scheduler = RenderScheduler(max_fps=args.max_fps, idle_fps=args.idle_fps)
+
+    def on_key(window, key, scancode, action, mods):
+        impl.keyboard_callback(window, key, scancode, action, mods)
+        scheduler.mark_dirty()
+
+    glfw.set_key_callback(window, on_key)
+    glfw.set_framebuffer_size_callback(window, lambda *_: scheduler.mark_dirty())
+    glfw.set_window_refresh_callback(window, lambda *_: scheduler.mark_dirty())
+    sampler.add_listener(scheduler.wake_listener(glfw.post_empty_event))
+    metrics = start_metrics_server(sampler, parse_address(args.metrics, '127.0.0.1')) if args.metrics else None
+    sampler.start()
+
+    while not glfw.window_should_close(window):
+        glfw.wait_events_timeout(scheduler.wait_timeout())
+        if dumper:
+            dumper.maybe_dump()
+        if layout and layout.maybe_reload():
+            scheduler.mark_dirty()
+        if not scheduler.should_render(sampler.snapshot):
+            continue
+
+        if profile_hook:
+            profile_hook.begin_frame()
+        stats.start_frame()
         impl.process_inputs()
         imgui.new_frame()
         
@@ -394,124 +1297,51 @@ def main():
         imgui.set_next_window_size(width, height)
         imgui.set_next_window_position(0, 0)
         
-        imgui.begin("Background", flags=imgui.WINDOW_NO_TITLE_BAR | imgui.WINDOW_NO_RESIZE | imgui.WINDOW_NO_MOVE | imgui.WINDOW_NO_SCROLLBAR | imgui.WINDOW_NO_COLLAPSE | imgui.WINDOW_NO_BACKGROUND)
-
-        # --- 데이터 수집 ---
-        cpu_total_usage = psutil.cpu_percent(interval=None)
-        cpu_core_usages = psutil.cpu_percent(interval=None, percpu=True)
-        ram_percent, ram_used, ram_total = get_ram_usage()
-        gpu_percent = get_gpu_usage(gpu_handle)
-        vram_percent, vram_used, vram_total = get_gpu_memory_usage(gpu_handle)
-
-        current_net_time = time.time()
-        current_net_io = psutil.net_io_counters()
-        time_delta = current_net_time - last_net_time
-
-        if time_delta > 0:
-            bytes_sent = current_net_io.bytes_sent - last_net_io.bytes_sent
-            bytes_recv = current_net_io.bytes_recv - last_net_io.bytes_recv
-            upload_speed_mbps = (bytes_sent * 8 / time_delta) / (1024**2)
-            download_speed_mbps = (bytes_recv * 8 / time_delta) / (1024**2)
-        else:
-            upload_speed_mbps = 0
-            download_speed_mbps = 0
-
-        last_net_io = current_net_io
-        last_net_time = current_net_time
-
-        upload_percent = (upload_speed_mbps / max_upload_mbps) * 100 if max_upload_mbps > 0 else 0
-        download_percent = (download_speed_mbps / max_download_mbps) * 100 if max_download_mbps > 0 else 0
-
-        current_disk_time = time.time()
-        current_disk_io = psutil.disk_io_counters()
-        disk_time_delta = current_disk_time - last_disk_time
-
-        if disk_time_delta > 0:
-            bytes_read = current_disk_io.read_bytes - last_disk_io.read_bytes
-            bytes_written = current_disk_io.write_bytes - last_disk_io.write_bytes
-            read_speed_mbps = (bytes_read / disk_time_delta) / (1024**2)
-            write_speed_mbps = (bytes_written / disk_time_delta) / (1024**2)
-        else:
-            read_speed_mbps = 0
-            write_speed_mbps = 0
-        
-        last_disk_io = current_disk_io
-        last_disk_time = current_disk_time
-
-        read_percent = (read_speed_mbps / max_disk_rw_mbps) * 100
-        write_percent = (write_speed_mbps / max_disk_rw_mbps) * 100
+        imgui.begin("Background", flags=BACKGROUND_WINDOW_FLAGS)
 
-        disk_info_c = get_disk_info('C')
+        if replayer:
+            handle_replay_keys(replayer)
+        if imgui.is_key_pressed(glfw.KEY_F12):
+            show_stats = not show_stats
+            enable_instrumentation()
+        if imgui.is_key_pressed(glfw.KEY_F11) and (profile_hook is None or profile_hook.done):
+            profile_hook = FrameProfileHook(args.profile or 'cprofile', args.profile_frames, args.profile_out)
 
         # --- 그리기 ---
         draw_list = imgui.get_window_draw_list()
-        
-        gauge_radius = min(width, height) * 0.25
-        center_y = height / 2
-        
-        # Item widths
-        cpu_grid_width = (gauge_radius * 2 * 0.5) + 20
-        cpu_total_width = (gauge_radius * 2) + cpu_grid_width
-        regular_gauge_width = gauge_radius * 2
-        
-        # Spacing calculation for 4 items
-        total_content_width = cpu_total_width + (regular_gauge_width * 3)
-        spacing = (width - total_content_width) / 5 # 4 items, 5 gaps
-
-        # Positions
-        pos1_x = spacing + cpu_total_width / 2
-        pos2_x = pos1_x + cpu_total_width / 2 + spacing + regular_gauge_width / 2
-        pos3_x = pos2_x + regular_gauge_width / 2 + spacing + regular_gauge_width / 2
-        pos4_x = pos3_x + regular_gauge_width / 2 + spacing + regular_gauge_width / 2
-
-        # 1. CPU / RAM
-        cpu_ram_center_x = pos1_x - cpu_grid_width / 2
-        cpu_ram_center = imgui.Vec2(cpu_ram_center_x, center_y)
-        draw_combined_gauge(draw_list, cpu_ram_center, gauge_radius, cpu_total_usage, ram_percent, "CPU / RAM", f"{ram_used:.1f}/{ram_total:.1f} GB")
-        grid_area_size = gauge_radius * 2 * 0.5
-        grid_size = imgui.Vec2(grid_area_size, grid_area_size)
-        grid_top_left = imgui.Vec2(cpu_ram_center.x + gauge_radius + 20, center_y - grid_size.y / 2)
-        draw_core_grid(draw_list, grid_top_left, grid_size, cpu_core_usages)
-
-        # 2. GPU / VRAM
-        draw_combined_gauge(draw_list, imgui.Vec2(pos2_x, center_y), gauge_radius, gpu_percent, vram_percent, "GPU / VRAM", f"{vram_used:.0f}/{vram_total:.0f} MB")
-
-        # 3. Network
-        draw_network_gauge(draw_list, imgui.Vec2(pos3_x, center_y), gauge_radius, upload_percent, download_percent, "Network", upload_speed_mbps, download_speed_mbps)
-
-        # 4. Disk C:
-        if disk_info_c:
-            draw_disk_gauge(
-                draw_list,
-                imgui.Vec2(pos4_x, center_y),
-                gauge_radius,
-                disk_info_c['percent'],
-                read_percent,
-                write_percent,
-                "Disk (C:)",
-                read_speed_mbps,
-                write_speed_mbps,
-                f"{disk_info_c['used_gb']:.1f}/{disk_info_c['total_gb']:.1f} GB"
-            )
+        draw_scene(draw_list, width, height, sources, layout)
+
+        if show_stats:
+            draw_stats_overlay(draw_list, 10, 10, stats.summary(SUMMARY_REFRESH))
 
         imgui.end()
+        stats.lap('build')
 
         gl.glClearColor(0.0, 0.0, 0.0, 1.0)
         gl.glClear(gl.GL_COLOR_BUFFER_BIT)
         
         imgui.render()
+        stats.lap('imgui.render')
         impl.render(imgui.get_draw_data())
+        stats.lap('impl.render')
         
         glfw.swap_buffers(window)
-
-        # Frame rate limiting
-        elapsed_time = time.time() - frame_start_time
-        sleep_time = frame_duration - elapsed_time
-        if sleep_time > 0:
-            time.sleep(sleep_time)
-
-    if nvml_initialized:
-        pynvml.nvmlShutdown()
+        stats.lap('swap_buffers')
+        stats.end_frame()
+        scheduler.rendered()
+        if profile_hook:
+            profile_hook.end_frame()
+        if args.first_frame_exit:
+            print(f"first frame {time.perf_counter() - _START_TIME:.3f}s", flush=True)
+            break
+
+    close_sources(sources)
+    if profile_hook:
+        profile_hook.finish()
+    if dumper:
+        dumper.dump()
+    if metrics:
+        metrics.stop()
     impl.shutdown()
     glfw.terminate()
 
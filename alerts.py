@@ -0,0 +1,397 @@
+"""구간 기반 임계값 규칙과 경보 엔진.
+
+규칙은 "CPU > 90%가 30초 동안", "VRAM > 95%", "디스크 쓰기 1분 평균 > 500 MB/s" 같은
+조건입니다. 샘플이 들어올 때마다 그 메트릭을 보는 규칙만 갱신하며, 구간 평균은 누적 합,
+구간 최대/최소는 단조 덱으로 유지하므로 규칙 하나의 갱신 비용은 (상각) O(1)입니다.
+히스토리를 다시 훑지 않습니다.
+
+상태가 바뀐 규칙은 AlertHook으로 넘어가, 디바운스와 빈도 제한을 거친 뒤 명령을 실행하거나
+웹훅으로 POST합니다. 훅은 자기 스레드에서 돌므로 샘플러를 막지 않습니다.
+
+규칙 파일(TOML/JSON) 예:
+
+    [[rules]]
+    name = "CPU hot"
+    metric = "cpu"
+    above = 90
+    for = 30
+
+    [[rules]]
+    metric = "disk_write"
+    aggregate = "avg"
+    window = 60
+    above = 500
+
+    [hook]
+    command = "notify-send 'HW {state}' '{rule}: {value:.1f}'"
+"""
+import json
+import queue
+import shlex
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import deque, namedtuple
+from numbers import Real
+
+from collectors import AGGREGATE_METRICS, is_metric_name, sample_metrics
+from layout import read_layout_file
+
+AGGREGATES = ('value', 'avg', 'min', 'max')
+# Metric name prefix -> dashboard group whose gauges flash (the default layout's group names).
+METRIC_GROUPS = (('cpu', 'cpu'), ('ram', 'cpu'), ('gpu', 'gpu'), ('vram', 'gpu'), ('net_', 'network'), ('disk_', 'disks'))
+
+RULE_OPTIONS = {'name': None, 'metric': None, 'above': None, 'below': None, 'aggregate': 'value', 'window': 0.0,
+                'for': 0.0, 'clear': None, 'group': None}
+HOOK_OPTIONS = {'command': None, 'url': None, 'debounce': 5.0, 'min_interval': 60.0, 'max_per_minute': 10, 'timeout': 10.0}
+HOOK_FIELDS = ('rule', 'metric', 'group', 'state', 'value', 'threshold', 'host', 'time')
+
+# firing: True when the rule starts firing, False when it resolves. value: the aggregate that crossed.
+AlertEvent = namedtuple('AlertEvent', ['rule', 'metric', 'group', 'firing', 'value', 'threshold', 'timestamp'])
+
+
+def metric_group(metric):
+    """메트릭 이름에 해당하는 대시보드 그룹 이름. 모르는 메트릭이면 None."""
+    for prefix, group in METRIC_GROUPS:
+        if metric.startswith(prefix):
+            return group
+    return None
+
+
+class Rule:
+    """규칙 하나와 그 구간 상태.
+
+    aggregate가 'value'가 아니면 최근 window초의 평균/최소/최대를 보고, 샘플이 window초만큼
+    쌓이기 전에는 울리지 않습니다. hold초 동안 조건이 계속 참이어야 울리고, clear가 있으면
+    값이 clear를 다시 넘어올 때 해제됩니다. (이력 현상, 깜빡임 방지)
+    """
+    __slots__ = ('name', 'metric', 'threshold', 'above', 'aggregate', 'window', 'hold', 'clear', 'group',
+                 'firing', 'value', '_samples', '_sum', '_started', '_since', '_last')
+
+    def __init__(self, name, metric, threshold, above=True, aggregate='value', window=0.0, hold=0.0, clear=None, group=None):
+        if aggregate not in AGGREGATES:
+            raise ValueError(f"알 수 없는 집계: {aggregate!r} (가능: {', '.join(AGGREGATES)})")
+        if aggregate != 'value' and window <= 0:
+            raise ValueError(f"{aggregate} 집계에는 0보다 큰 window(초)가 필요합니다")
+        self.name = name
+        self.metric = metric
+        self.threshold = threshold
+        self.above = above
+        self.aggregate = aggregate
+        self.window = window
+        self.hold = hold
+        self.clear = threshold if clear is None else clear
+        self.group = group
+        self.reset()
+
+    def reset(self):
+        self.firing = False
+        self.value = None
+        self._samples = deque()  # (timestamp, value): every sample for 'avg', a monotonic run for 'min'/'max'
+        self._sum = 0.0
+        self._started = None     # first sample time; windows must fill before the rule can fire
+        self._since = None       # when the condition last became true
+        self._last = None
+
+    def update(self, timestamp, value):
+        """샘플 하나를 반영합니다. 경보 상태가 바뀌었으면 True를 반환합니다."""
+        if self._last is not None and timestamp < self._last:
+            firing = self.firing
+            self.reset()  # the clock went backwards (replay seek): windows are meaningless now
+            self.firing = firing
+        self._last = timestamp
+        if self._started is None:
+            self._started = timestamp
+
+        aggregate = self.aggregate
+        if aggregate == 'value':
+            current = value
+        else:
+            samples = self._samples
+            cutoff = timestamp - self.window
+            if aggregate == 'avg':
+                samples.append((timestamp, value))
+                self._sum += value
+                while samples[0][0] <= cutoff:
+                    self._sum -= samples.popleft()[1]
+                if len(samples) == 1:
+                    self._sum = value  # drop accumulated rounding error whenever the window empties
+                current = self._sum / len(samples)
+            else:
+                # Keep values in decreasing (max) / increasing (min) order; the front is the extreme.
+                if aggregate == 'max':
+                    while samples and samples[-1][1] <= value:
+                        samples.pop()
+                else:
+                    while samples and samples[-1][1] >= value:
+                        samples.pop()
+                samples.append((timestamp, value))
+                while samples[0][0] <= cutoff:
+                    samples.popleft()
+                current = samples[0][1]
+            if timestamp - self._started < self.window:
+                self.value = current
+                return False  # window not filled yet
+        self.value = current
+
+        limit = self.clear if self.firing else self.threshold
+        if current > limit if self.above else current < limit:
+            if self._since is None:
+                self._since = timestamp
+            firing = timestamp - self._since >= self.hold
+        else:
+            self._since = None
+            firing = False
+        if firing == self.firing:
+            return False
+        self.firing = firing
+        return True
+
+
+def _check_options(where, given, defaults):
+    if not isinstance(given, dict):
+        raise ValueError(f"{where}: 테이블(객체)이어야 합니다")
+    unknown = set(given) - set(defaults)
+    if unknown:
+        raise ValueError(f"{where}: 알 수 없는 옵션 {', '.join(sorted(unknown))} (가능: {', '.join(defaults)})")
+    options = dict(defaults)
+    options.update(given)
+    return options
+
+
+def _number(where, key, value, positive=False):
+    if not isinstance(value, Real) or isinstance(value, bool) or (positive and value < 0):
+        raise ValueError(f"{where}: {key}는 {'0 이상의 ' if positive else ''}숫자여야 합니다: {value!r}")
+    return value
+
+
+def compile_rules(config):
+    """설정 dict를 검사해 (Rule 목록, 훅 옵션 dict 또는 None)을 반환합니다. 잘못된 설정은 ValueError."""
+    config = _check_options("alerts", config, {'rules': [], 'hook': None})
+    if not isinstance(config['rules'], list):
+        raise ValueError("rules는 목록이어야 합니다")
+    rules = []
+    names = set()
+    for index, spec in enumerate(config['rules']):
+        where = f"rules[{index}]"
+        options = _check_options(where, spec, RULE_OPTIONS)
+        metric = options['metric']
+        if not isinstance(metric, str) or not metric:
+            raise ValueError(f"{where}: metric(메트릭 이름, 예: cpu, vram, disk_write)이 필요합니다")
+        if not is_metric_name(metric):
+            raise ValueError(f"{where}: 알 수 없는 메트릭 {metric!r} (가능: {', '.join(sorted(AGGREGATE_METRICS))}, "
+                             f"cpu_core_N, gpuN, gpuN_vram, net_up_NIC, net_down_NIC, disk_read_DEV, disk_write_DEV, "
+                             f"disk_usage_MOUNT)")
+        if (options['above'] is None) == (options['below'] is None):
+            raise ValueError(f"{where}: above와 below 중 하나만 지정해야 합니다")
+        above = options['above'] is not None
+        threshold = _number(where, 'above' if above else 'below', options['above'] if above else options['below'])
+        clear = options['clear']
+        if clear is not None:
+            _number(where, 'clear', clear)
+            if (clear > threshold) if above else (clear < threshold):
+                raise ValueError(f"{where}: clear는 임계값의 {'아래' if above else '위'}여야 합니다")
+        window = _number(where, 'window', options['window'], positive=True)
+        hold = _number(where, 'for', options['for'], positive=True)
+        name = options['name'] or f"{metric} {'>' if above else '<'} {threshold:g}"
+        if name in names:
+            raise ValueError(f"{where}: 규칙 이름이 중복됩니다: {name!r}")
+        names.add(name)
+        group = options['group'] if options['group'] is not None else metric_group(metric)
+        try:
+            rules.append(Rule(str(name), metric, threshold, above, options['aggregate'], window, hold, clear, group))
+        except ValueError as e:
+            raise ValueError(f"{where}: {e}") from None
+
+    hook = config['hook']
+    if hook is not None:
+        hook = _check_options("hook", hook, HOOK_OPTIONS)
+        if not hook['command'] and not hook['url']:
+            raise ValueError("hook: command나 url이 필요합니다")
+        for key in ('debounce', 'min_interval', 'max_per_minute', 'timeout'):
+            _number("hook", key, hook[key], positive=True)
+        if hook['command']:
+            sample = dict.fromkeys(HOOK_FIELDS, "")
+            sample.update(value=0.0, threshold=0.0)
+            try:
+                for arg in shlex.split(hook['command']):
+                    arg.format(**sample)
+            except (KeyError, ValueError, IndexError) as e:
+                raise ValueError(f"hook: command를 해석할 수 없습니다 (가능한 필드: {', '.join(HOOK_FIELDS)}): {e}") from None
+    return rules, hook
+
+
+class AlertHook:
+    """경보 상태 변화를 명령 실행이나 웹훅 POST로 알립니다. 전달은 자기 스레드에서 합니다.
+
+    같은 규칙이 debounce초 안에 울렸다 해제되면 (깜빡임) 둘 다 알리지 않습니다. 울림 알림은
+    규칙마다 min_interval초에 한 번, 전체로는 분당 max_per_minute개까지만 보내고 나머지는
+    suppressed로 셉니다. 해제 알림은 울림을 알린 규칙에 대해서만 보냅니다.
+    """
+
+    def __init__(self, command=None, url=None, debounce=5.0, min_interval=60.0, max_per_minute=10, timeout=10.0,
+                 host=None):
+        self.args = shlex.split(command) if command else None
+        self.url = url
+        self.debounce = debounce
+        self.min_interval = min_interval
+        self.max_per_minute = max_per_minute
+        self.timeout = timeout
+        self.host = host or socket.gethostname()
+        self.sent = 0
+        self.suppressed = 0
+        self.flapped = 0
+        self._queue = queue.SimpleQueue()
+        self._pending = {}       # rule name -> (event, due)
+        self._last_sent = {}     # rule name -> monotonic time of the last firing notification
+        self._recent = deque()   # monotonic times of firing notifications in the last minute
+        self._announced = set()  # rules whose firing was delivered; their resolve is delivered too
+        self._thread = None
+
+    def submit(self, event):
+        if self._thread is None:  # started on first use, so hooks that never fire cost no thread
+            self._thread = threading.Thread(target=self._run, name="alert-hook", daemon=True)
+            self._thread.start()
+        self._queue.put(event)
+
+    def close(self, timeout=2.0):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while True:
+            timeout = None
+            if self._pending:
+                timeout = max(min(due for _, due in self._pending.values()) - time.monotonic(), 0.0)
+            try:
+                event = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                event = False
+            if event is None:
+                return
+            self.process(event, time.monotonic())
+
+    def process(self, event, now):
+        """event(없으면 False)를 디바운스 대기열에 넣고, 기한이 지난 것을 전달합니다."""
+        if event:
+            previous = self._pending.pop(event.rule, None)
+            if previous is not None and previous[0].firing != event.firing:
+                self.flapped += 1  # changed back within the debounce time: nothing to report
+            else:
+                self._pending[event.rule] = (event, now + self.debounce)
+        for name, (pending, due) in list(self._pending.items()):
+            if due <= now:
+                del self._pending[name]
+                if self._allow(pending, now):
+                    self.deliver(pending)
+
+    def _allow(self, event, now):
+        if not event.firing:
+            if event.rule not in self._announced:
+                return False
+            self._announced.discard(event.rule)
+            return True
+        last = self._last_sent.get(event.rule)
+        recent = self._recent
+        while recent and recent[0] <= now - 60.0:
+            recent.popleft()
+        if (last is not None and now - last < self.min_interval) or len(recent) >= self.max_per_minute:
+            self.suppressed += 1
+            return False
+        self._last_sent[event.rule] = now
+        recent.append(now)
+        self._announced.add(event.rule)
+        return True
+
+    def fields(self, event):
+        return {
+            'rule': event.rule, 'metric': event.metric, 'group': event.group or "",
+            'state': "firing" if event.firing else "resolved",
+            'value': event.value, 'threshold': event.threshold, 'host': self.host,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S%z', time.localtime(event.timestamp)),
+        }
+
+    def deliver(self, event):
+        fields = self.fields(event)
+        self.sent += 1
+        if self.args:
+            try:
+                subprocess.run([arg.format(**fields) for arg in self.args], stdin=subprocess.DEVNULL,
+                               timeout=self.timeout, check=False)
+            except (OSError, subprocess.SubprocessError) as e:
+                print(f"경보 명령을 실행할 수 없습니다: {e}", file=sys.stderr)
+        if self.url:
+            import urllib.request
+            request = urllib.request.Request(self.url, data=json.dumps(fields).encode(),
+                                             headers={'Content-Type': 'application/json'}, method='POST')
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    response.read()
+            except (OSError, ValueError) as e:  # URLError and HTTPError are OSErrors
+                print(f"경보 웹훅 전송 실패 ({self.url}): {e}", file=sys.stderr)
+
+
+class AlertEngine:
+    """규칙 모음. Sampler 리스너로 등록해 사용합니다.
+
+    리스너는 샘플의 메트릭마다 그 메트릭을 보는 규칙만 갱신합니다. firing은 울리는 중인 규칙
+    이름 -> AlertEvent, firing_groups는 그 그룹 이름의 frozenset이며, 바뀔 때마다 새 객체로
+    바꿔 끼우므로 그리기 쪽은 락 없이 읽습니다.
+    """
+
+    def __init__(self, rules, hook=None, stream=None):
+        self.rules = list(rules)
+        self.hook = hook
+        self.stream = stream  # None: sys.stdout at print time (offscreen output may redirect it)
+        self.firing = {}
+        self.firing_groups = frozenset()
+        self._by_metric = {}
+        for rule in self.rules:
+            self._by_metric.setdefault(rule.metric, []).append(rule)
+
+    @classmethod
+    def from_file(cls, path, host=None):
+        rules, hook = compile_rules(read_layout_file(path))
+        return cls(rules, AlertHook(**hook, host=host) if hook else None)
+
+    def close(self):
+        if self.hook:
+            self.hook.close()
+
+    def on_sample(self, name, sample, snapshot):
+        """Sampler.add_listener에 등록할 콜백입니다."""
+        if sample is None or sample.error is not None or sample.value is None:
+            return
+        by_metric = self._by_metric
+        timestamp = sample.timestamp
+        changed = None
+        for metric, value in sample_metrics(name, sample.value):
+            rules = by_metric.get(metric)
+            if rules is None:
+                continue
+            for rule in rules:
+                if rule.update(timestamp, value):
+                    if changed is None:
+                        changed = []
+                    changed.append(rule)
+        if changed:
+            self._transition(changed, timestamp)
+
+    def _transition(self, rules, timestamp):
+        firing = dict(self.firing)
+        for rule in rules:
+            event = AlertEvent(rule.name, rule.metric, rule.group, rule.firing, rule.value, rule.threshold, timestamp)
+            if rule.firing:
+                firing[rule.name] = event
+                print(f"경보: {rule.name} ({rule.metric} {rule.value:.1f})", file=self.stream or sys.stdout)
+            else:
+                firing.pop(rule.name, None)
+                print(f"경보 해제: {rule.name} ({rule.metric} {rule.value:.1f})", file=self.stream or sys.stdout)
+            if self.hook:
+                self.hook.submit(event)
+        self.firing = firing
+        self.firing_groups = frozenset(event.group for event in firing.values() if event.group)
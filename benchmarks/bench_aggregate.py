@@ -0,0 +1,163 @@
+"""루프백 UDP로 여러 가상 에이전트를 집계기에 붙여 확장성을 측정합니다.
+
+가상 에이전트마다 SnapshotEncoder로 합성 스냅샷을 인코딩해 127.0.0.1의 Aggregator로
+보내고, 수신률, 패킷 크기(키/델타), 집계기 처리 시간, 복원 오차를 보고합니다.
+--render를 주면 draw_host_rows의 헤드리스 프레임 비용도 측정합니다.
+
+    python benchmarks/bench_aggregate.py --agents 8,64,256 --rate 10 --duration 3
+"""
+import argparse
+import os
+import random
+import socket
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recording import record_fields
+from remote import Aggregator, SnapshotEncoder, QUANT_SCALE
+
+SENDER_SOCKETS = 8
+
+
+def field_step(field):
+    """필드별 무작위 보행의 (최대값, 한 번에 움직이는 표준편차)."""
+    if field.endswith(('_gb', '_mb')):
+        return 24576.0, 2.0
+    if field.startswith(('net_', 'disk_read', 'disk_write')):
+        return 1000.0, 20.0
+    if field.endswith(('_temp', '_power', '_clock')):
+        return 300.0, 1.0
+    return 100.0, 2.0
+
+
+def synthetic_row(fields, rng, previous=None):
+    """이전 행에서 조금씩 움직인 값으로 다음 행을 만듭니다. (실제 메트릭처럼 천천히 변함)"""
+    steps = [field_step(field) for field in fields]
+    if previous is None:
+        return [rng.uniform(0, high) for high, _ in steps]
+    return [min(max(value + rng.gauss(0, sigma), 0.0), high) for value, (high, sigma) in zip(previous, steps)]
+
+
+def run(num_agents, rate, duration, num_cores, num_gpus):
+    aggregator = Aggregator(('127.0.0.1', 0))
+    aggregator.start()
+    fields = record_fields(num_cores, num_gpus)
+    encoders = [SnapshotEncoder(f"host-{i:03d}", fields) for i in range(num_agents)]
+    sockets = [socket.socket(socket.AF_INET, socket.SOCK_DGRAM) for _ in range(SENDER_SOCKETS)]
+    rng = random.Random(1)
+
+    sent = 0
+    sizes = {'hello': [], 'key': [], 'delta': []}
+    last_rows = {}
+    interval = 1.0 / rate
+    started = time.monotonic()
+    tick = 0
+    while time.monotonic() - started < duration:
+        tick_start = time.monotonic()
+        for i, encoder in enumerate(encoders):
+            row = last_rows[encoder.host] = synthetic_row(fields, rng, last_rows.get(encoder.host))
+            for packet in encoder.encode(time.time(), row):
+                kind = {1: 'hello', 2: 'key', 3: 'delta'}[packet[3]]
+                sizes[kind].append(len(packet))
+                sockets[i % SENDER_SOCKETS].sendto(packet, aggregator.address)
+                sent += 1
+            # Spread each tick's packets so the receive buffer is not flooded at once.
+            if i % 32 == 31:
+                time.sleep(0)
+        tick += 1
+        time.sleep(max(interval - (time.monotonic() - tick_start), 0))
+    time.sleep(0.3)
+    aggregator.stop()
+    for sock in sockets:
+        sock.close()
+
+    applied = sum(host.packets for host in aggregator.hosts)
+    data_sent = len(sizes['key']) + len(sizes['delta'])
+    # Compare the last decoded row with the last sent row (only exact when nothing was lost at the end).
+    worst_error = 0.0
+    for host in aggregator.hosts:
+        cpu = host.snapshot.get('cpu')
+        if cpu is not None:
+            expected = last_rows[host.name][fields.index('cpu')]
+            worst_error = max(worst_error, abs(cpu.total - expected))
+    return {
+        'agents': num_agents,
+        'hosts_seen': len(aggregator.hosts),
+        'datagrams_sent': sent,
+        'received': aggregator.packets,
+        'applied': applied,
+        'data_sent': data_sent,
+        'loss_percent': 100.0 * (data_sent - applied) / data_sent if data_sent else 0.0,
+        'hello_bytes': statistics.mean(sizes['hello']) if sizes['hello'] else 0,
+        'key_bytes': statistics.mean(sizes['key']) if sizes['key'] else 0,
+        'delta_bytes': statistics.mean(sizes['delta']) if sizes['delta'] else 0,
+        'raw_bytes': 8 + 4 * len(fields),
+        'busy_us_per_packet': aggregator.busy_ns / 1000 / max(aggregator.packets, 1),
+        'busy_percent': 100.0 * aggregator.busy_ns / 1e9 / duration,
+        'decode_errors': aggregator.errors,
+        'worst_error': worst_error,
+        'hosts': aggregator.hosts,
+    }
+
+
+def render_cost(hosts, frames, width, height):
+    """draw_host_rows의 프레임당 CPU 시간(us)과 정점 수를 반환합니다."""
+    import imgui
+    import HWMoniter as hw
+
+    if imgui.get_current_context() is None:
+        imgui.create_context()
+        io = imgui.get_io()
+        io.display_size = (width, height)
+        io.fonts.get_tex_data_as_rgba32()
+    timings = []
+    vertices = 0
+    for _ in range(frames):
+        imgui.new_frame()
+        imgui.set_next_window_size(width, height)
+        imgui.set_next_window_position(0, 0)
+        imgui.begin("bench", flags=imgui.WINDOW_NO_TITLE_BAR | imgui.WINDOW_NO_BACKGROUND)
+        draw_list = imgui.get_window_draw_list()
+        started = time.perf_counter_ns()
+        # Pretend every host is online so all gauges are drawn.
+        hw.draw_host_rows(draw_list, width, height, hosts, 1000, now=0.0)
+        timings.append((time.perf_counter_ns() - started) / 1000)
+        imgui.end()
+        imgui.render()
+        vertices = imgui.get_draw_data().total_vtx_count
+    return statistics.median(timings), vertices
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--agents', default='8,64,256', help="쉼표로 구분한 가상 에이전트 수 목록")
+    parser.add_argument('--rate', type=float, default=10.0, help="에이전트당 초당 스냅샷 수")
+    parser.add_argument('--duration', type=float, default=3.0, help="시나리오당 측정 시간 (초)")
+    parser.add_argument('--cores', type=int, default=16)
+    parser.add_argument('--gpus', type=int, default=1)
+    parser.add_argument('--render', action='store_true', help="draw_host_rows 렌더 비용도 측정합니다.")
+    parser.add_argument('--frames', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    print(f"{args.cores} cores, {args.gpus} GPUs per agent, {args.rate:g} Hz, {args.duration:g}s, "
+          f"quantization 1/{QUANT_SCALE}")
+    print(f"{'agents':>7}{'seen':>6}{'loss %':>8}{'key B':>8}{'delta B':>9}{'raw B':>7}"
+          f"{'us/pkt':>8}{'busy %':>8}{'max err':>9}" + (f"{'draw us':>9}{'vtx':>7}" if args.render else ""))
+    for count in map(int, args.agents.split(',')):
+        result = run(count, args.rate, args.duration, args.cores, args.gpus)
+        line = (f"{result['agents']:>7}{result['hosts_seen']:>6}{result['loss_percent']:>8.2f}"
+                f"{result['key_bytes']:>8.0f}{result['delta_bytes']:>9.0f}{result['raw_bytes']:>7}"
+                f"{result['busy_us_per_packet']:>8.1f}{result['busy_percent']:>8.1f}{result['worst_error']:>9.3f}")
+        if args.render:
+            draw_us, vertices = render_cost(result['hosts'], args.frames, 2400, 480)
+            line += f"{draw_us:>9.0f}{vertices:>7}"
+        print(line)
+        if result['decode_errors']:
+            print(f"  decode errors: {result['decode_errors']}")
+
+
+if __name__ == "__main__":
+    main()
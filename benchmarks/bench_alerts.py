@@ -0,0 +1,197 @@
+"""경보 규칙 평가 비용과 경보 테두리의 프레임 비용을 측정합니다.
+
+합성 스냅샷(기본 16코어)을 10 Hz로 넣으면서 규칙 수(100/500/1000개)별로 AlertEngine의
+샘플당 평가 비용을 재고, 같은 규칙을 매 샘플마다 구간 히스토리를 다시 훑는 단순 구현과
+비교합니다. 두 구현의 상태 전환 횟수가 같은지도 확인합니다. 끝으로 GL 없이 ImGui 프레임을
+만들어 경보가 없을 때와 모든 그룹이 울릴 때의 대시보드 그리기 비용을 비교합니다.
+
+    python benchmarks/bench_alerts.py
+    python benchmarks/bench_alerts.py --rules 100,500,1000 --cores 16 --window 60 --seconds 600
+"""
+import argparse
+import io
+import os
+import random
+import statistics
+import sys
+import time
+from collections import deque
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import imgui
+
+import HWMoniter as hw
+from alerts import AGGREGATES, METRIC_GROUPS, AlertEngine, Rule
+from benchmarks.bench_render import MAX_DISK_MBPS, MAX_NET_MBPS, WINDOW_FLAGS, feed_history, synthetic_snapshots
+from collectors import sample_metrics
+from history import MetricHistory
+
+RATE = 10.0  # samples per second per collector
+START = 1_700_000_000.0
+
+
+def sample_stream(cores, seconds, seed):
+    """(collector 이름, 타임스탬프를 고정한 Sample, 스냅샷) 목록을 RATE Hz로 seconds초만큼 만듭니다."""
+    snapshots = synthetic_snapshots(cores, 1, seed)
+    stream = []
+    for i in range(int(seconds * RATE)):
+        snapshot = next(snapshots)
+        timestamp = START + i / RATE
+        for name, sample in snapshot.samples.items():
+            if name != 'processes':
+                stream.append((name, sample._replace(timestamp=timestamp), snapshot))
+    return stream
+
+
+def make_rules(count, metrics, window, seed):
+    """메트릭과 집계를 돌려 가며 임계값이 제각각인 규칙 count개를 만듭니다."""
+    rng = random.Random(seed)
+    rules = []
+    for i in range(count):
+        aggregate = AGGREGATES[i % len(AGGREGATES)]
+        rules.append(Rule(f'rule{i}', metrics[i % len(metrics)], rng.uniform(30, 90), above=rng.random() < 0.8,
+                          aggregate=aggregate, window=window if aggregate != 'value' else 0.0,
+                          hold=rng.choice((0.0, 5.0, 30.0))))
+    return rules
+
+
+class RescanRule:
+    """비교용: 매 샘플마다 구간 안의 히스토리를 전부 다시 훑어 집계하는 규칙."""
+
+    def __init__(self, rule):
+        self.rule = rule
+        self.history = deque()
+        self.firing = False
+        self._since = None
+        self._started = None
+
+    def update(self, timestamp, value):
+        rule = self.rule
+        if self._started is None:
+            self._started = timestamp
+        if rule.aggregate == 'value':
+            current = value
+        else:
+            history = self.history
+            history.append((timestamp, value))
+            while history[0][0] <= timestamp - rule.window:
+                history.popleft()
+            values = [v for _, v in history]
+            current = {'avg': lambda: sum(values) / len(values), 'min': lambda: min(values),
+                       'max': lambda: max(values)}[rule.aggregate]()
+            if timestamp - self._started < rule.window:
+                return False
+        limit = rule.clear if self.firing else rule.threshold
+        if current > limit if rule.above else current < limit:
+            if self._since is None:
+                self._since = timestamp
+            firing = timestamp - self._since >= rule.hold
+        else:
+            self._since = None
+            firing = False
+        if firing == self.firing:
+            return False
+        self.firing = firing
+        return True
+
+
+def run_engine(rules, stream):
+    """AlertEngine으로 stream을 평가하고 (샘플당 ns 목록, 상태 전환 수)를 반환합니다."""
+    engine = AlertEngine(rules, stream=io.StringIO())
+    transitions = 0
+    timings = []
+    for name, sample, snapshot in stream:
+        before = engine.firing
+        started = time.perf_counter_ns()
+        engine.on_sample(name, sample, snapshot)
+        timings.append(time.perf_counter_ns() - started)
+        if engine.firing is not before:
+            transitions += sum(rule.firing != (rule.name in before) for rule in rules)
+    return timings, transitions
+
+
+def run_rescan(rules, stream):
+    by_metric = {}
+    for rule in rules:
+        by_metric.setdefault(rule.metric, []).append(RescanRule(rule))
+    transitions = 0
+    timings = []
+    for name, sample, _ in stream:
+        started = time.perf_counter_ns()
+        for metric, value in sample_metrics(name, sample.value):
+            for rule in by_metric.get(metric, ()):
+                transitions += rule.update(sample.timestamp, value)
+        timings.append(time.perf_counter_ns() - started)
+    return timings, transitions
+
+
+def overlay_cost(cores, frames, width, height, firing_groups):
+    """헤드리스 ImGui 프레임에서 draw_dashboard 비용(us, 중앙값)을 잽니다."""
+    alerts = SimpleNamespace(firing_groups=firing_groups)
+    snapshots = synthetic_snapshots(cores, 1)
+    history = MetricHistory()
+    timings = []
+    for _ in range(frames):
+        snapshot = next(snapshots)
+        feed_history(history, snapshot)
+        imgui.get_io().display_size = (width, height)
+        imgui.new_frame()
+        imgui.set_next_window_size(width, height)
+        imgui.set_next_window_position(0, 0)
+        imgui.begin("Background", flags=WINDOW_FLAGS)
+        draw_list = imgui.get_window_draw_list()
+        started = time.perf_counter_ns()
+        hw.draw_dashboard(draw_list, width, height, snapshot, history, MAX_NET_MBPS, MAX_NET_MBPS, MAX_DISK_MBPS,
+                          alerts=alerts)
+        timings.append((time.perf_counter_ns() - started) / 1000)
+        imgui.end()
+        imgui.render()
+    return statistics.median(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rules', default='100,500,1000', help="쉼표로 구분한 규칙 수 목록")
+    parser.add_argument('--cores', type=int, default=16)
+    parser.add_argument('--window', type=float, default=60.0, help="avg/min/max 규칙의 구간(초)")
+    parser.add_argument('--seconds', type=float, default=120.0, help="넣을 샘플의 길이(초, 10 Hz)")
+    parser.add_argument('--frames', type=int, default=200, help="테두리 비용 측정에 쓸 프레임 수")
+    parser.add_argument('--skip-rescan', action='store_true', help="단순 재계산 비교를 생략합니다")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    stream = sample_stream(args.cores, args.seconds, args.seed)
+    metrics = sorted({metric for name, sample, _ in stream[:16] for metric, _ in sample_metrics(name, sample.value)})
+    collectors = len({name for name, _, _ in stream})
+    snapshots = len(stream) // collectors
+    print(f"{len(stream):,} samples ({snapshots:,} snapshots at {RATE:g} Hz, {len(metrics)} metrics), "
+          f"window {args.window:g} s = {int(args.window * RATE)} samples")
+    print(f"\n{'rules':>6}{'impl':>9}{'us/snapshot':>13}{'ns/rule-update':>16}{'p99 us/sample':>15}{'transitions':>13}")
+    for count in map(int, args.rules.split(',')):
+        impls = [('deque', run_engine)] + ([] if args.skip_rescan else [('rescan', run_rescan)])
+        results = {}
+        for label, run in impls:
+            timings, transitions = run(make_rules(count, metrics, args.window, args.seed), stream)
+            results[label] = transitions
+            per_snapshot = sum(timings) / snapshots / 1000
+            p99 = sorted(timings)[int(len(timings) * 0.99)] / 1000
+            updates = count * snapshots  # every rule sees exactly one value per snapshot
+            print(f"{count:>6}{label:>9}{per_snapshot:>13.1f}{sum(timings) / updates:>16.0f}{p99:>15.1f}{transitions:>13}")
+        if len(set(results.values())) > 1:
+            print(f"  transition counts differ: {results}", file=sys.stderr)
+
+    imgui.create_context()
+    imgui.get_io().fonts.get_tex_data_as_rgba32()
+    hw.load_numpy()
+    groups = frozenset(group for _, group in METRIC_GROUPS)
+    overlay_cost(args.cores, 10, 1920, 480, frozenset())  # warm-up
+    quiet = overlay_cost(args.cores, args.frames, 1920, 480, frozenset())
+    firing = overlay_cost(args.cores, args.frames, 1920, 480, groups)
+    print(f"\ndraw_dashboard 1920x480: {quiet:.0f} us with no alerts, {firing:.0f} us with every group firing "
+          f"(borders blink at {hw.ALERT_FLASH_HZ:g} Hz, so about half the frames draw them)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""동시 스크레이프 부하에서 /metrics 응답 지연을 측정합니다.
+
+127.0.0.1에 MetricsServer를 띄우고, 합성 스냅샷을 --publish-rate Hz로 갱신하는 동안
+여러 클라이언트 스레드가 keep-alive 연결로 계속 스크레이프합니다. 동시 연결 수마다
+처리량, 지연 p50/p99, 렌더링 횟수(세대당 한 번이어야 함)를 보고합니다.
+
+    python benchmarks/bench_metrics.py --clients 1,8,64 --cores 64 --duration 3
+"""
+import argparse
+import http.client
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from types import MappingProxyType
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from collectors import CpuSample, DiskIoSample, DiskSample, GpuSample, NetSample, RamSample
+from exporter import MetricsServer, render_openmetrics
+from gpu import GpuDeviceSample
+from network import NicRate
+from sampler import Sample, Snapshot
+from storage import DiskRate, VolumeUsage
+
+
+def synthetic_snapshot(generation, rng, num_cores, num_gpus, num_nics, num_disks):
+    """모든 Collector 값이 채워진 합성 스냅샷을 만듭니다."""
+    now = time.time()
+    devices = tuple(GpuDeviceSample(i, f"GPU {i}", rng.uniform(0, 100), rng.uniform(0, 100), 4096.0, 24576.0,
+                                    65.0, 180.5, 1755.0, None) for i in range(num_gpus))
+    nics = tuple(NicRate(f"eth{i}", rng.uniform(0, 900), rng.uniform(0, 900), 1000, True) for i in range(num_nics))
+    disks = tuple(DiskRate(f"nvme{i}n1", rng.uniform(0, 500), rng.uniform(0, 500)) for i in range(num_disks))
+    volumes = tuple(VolumeUsage(f"/mnt/data{i}", f"nvme{i}n1p1", 42.0, 420.0, 1000.0) for i in range(num_disks))
+    values = {
+        'cpu': CpuSample(rng.uniform(0, 100), tuple(rng.uniform(0, 100) for _ in range(num_cores))),
+        'ram': RamSample(55.0, 17.6, 32.0),
+        'gpu': GpuSample(50.0, 16.7, 4096.0 * num_gpus, 24576.0 * num_gpus, devices),
+        'net': NetSample(sum(n.upload_mbps for n in nics), sum(n.download_mbps for n in nics), nics),
+        'disk_io': DiskIoSample(sum(d.read_mbps for d in disks), sum(d.write_mbps for d in disks), disks),
+        'disk': DiskSample(42.0, 420.0 * num_disks, 1000.0 * num_disks, volumes),
+    }
+    return Snapshot(generation, MappingProxyType({name: Sample(value, now, None) for name, value in values.items()}))
+
+
+class SyntheticSampler:
+    """publish_rate Hz로 새 스냅샷을 게시하는 가짜 Sampler. snapshot 속성만 제공합니다."""
+
+    def __init__(self, publish_rate, **shape):
+        self.publish_rate = publish_rate
+        self.shape = shape
+        self.rng = random.Random(1)
+        self.snapshot = synthetic_snapshot(1, self.rng, **shape)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(1.0 / self.publish_rate):
+            self.snapshot = synthetic_snapshot(self.snapshot.generation + 1, self.rng, **self.shape)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+def scrape_loop(address, deadline, latencies, gzip):
+    headers = {'Accept-Encoding': 'gzip'} if gzip else {}
+    connection = http.client.HTTPConnection(*address)
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        connection.request('GET', '/metrics', headers=headers)
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - started)
+    connection.close()
+
+
+def run(clients, duration, publish_rate, gzip, shape):
+    sampler = SyntheticSampler(publish_rate, **shape)
+    server = MetricsServer(sampler, ('127.0.0.1', 0))
+    server.start()
+    sampler.start()
+    per_client = [[] for _ in range(clients)]
+    deadline = time.perf_counter() + duration
+    threads = [threading.Thread(target=scrape_loop, args=(server.address, deadline, latencies, gzip))
+               for latencies in per_client]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    sampler.stop()
+    server.stop()
+
+    latencies = sorted(value for values in per_client for value in values)
+    return {
+        'clients': clients,
+        'requests': len(latencies),
+        'rps': len(latencies) / duration,
+        'p50_ms': 1000 * latencies[len(latencies) // 2],
+        'p99_ms': 1000 * latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)],
+        'renders': server.cache.renders,
+        'generations': sampler.snapshot.generation,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', default='1,8,64', help="쉼표로 구분한 동시 스크레이퍼 수 목록")
+    parser.add_argument('--duration', type=float, default=3.0, help="시나리오당 측정 시간 (초)")
+    parser.add_argument('--publish-rate', type=float, default=10.0, help="초당 스냅샷 갱신 횟수")
+    parser.add_argument('--cores', type=int, default=64)
+    parser.add_argument('--gpus', type=int, default=2)
+    parser.add_argument('--nics', type=int, default=4)
+    parser.add_argument('--disks', type=int, default=4)
+    parser.add_argument('--gzip', action='store_true', help="Accept-Encoding: gzip으로 스크레이프합니다.")
+    args = parser.parse_args(argv)
+    shape = dict(num_cores=args.cores, num_gpus=args.gpus, num_nics=args.nics, num_disks=args.disks)
+
+    snapshot = synthetic_snapshot(1, random.Random(1), **shape)
+    body = render_openmetrics(snapshot)
+    series = sum(1 for line in body.splitlines() if not line.startswith(b'#'))
+    timings = []
+    for _ in range(200):
+        started = time.perf_counter_ns()
+        render_openmetrics(snapshot)
+        timings.append((time.perf_counter_ns() - started) / 1000)
+    print(f"{args.cores} cores, {args.gpus} GPUs, {args.nics} NICs, {args.disks} disks: "
+          f"{len(body)} bytes, {series} series, "
+          f"render {statistics.median(timings):.0f} us per generation")
+    print(f"{'clients':>8}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'renders':>9}{'gens':>7}")
+    for clients in map(int, args.clients.split(',')):
+        result = run(clients, args.duration, args.publish_rate, args.gzip, shape)
+        print(f"{result['clients']:>8}{result['rps']:>9.0f}{result['p50_ms']:>9.2f}{result['p99_ms']:>9.2f}"
+              f"{result['renders']:>9}{result['generations']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""가짜 NVML로 다중 GPU 폴링 비용과 실패 장치 백오프를 측정합니다.
+
+    python benchmarks/bench_nvml.py --gpus 8 --latency 0.0005
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_nvml import FakeNvml
+from collectors import make_gpu_collector
+from gpu import NvmlPoller
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--gpus', type=int, default=8)
+    parser.add_argument('--polls', type=int, default=200)
+    parser.add_argument('--interval', type=float, default=0.5, help="시뮬레이션할 폴링 주기 (초)")
+    parser.add_argument('--latency', type=float, default=0.0, help="NVML 호출당 지연 (초)")
+    args = parser.parse_args(argv)
+
+    failing = {args.gpus - 1} if args.gpus > 1 else set()
+    nvml = FakeNvml(device_count=args.gpus, failing=failing, no_power={0}, latency=args.latency)
+    poller = NvmlPoller(nvml=nvml)
+    poller.init()
+    collect = make_gpu_collector(poller)
+
+    durations = []
+    for i in range(args.polls):
+        # Simulated clock so backoff can be observed without waiting.
+        now = i * args.interval
+        started = time.perf_counter()
+        poller.poll(now=now)
+        durations.append(time.perf_counter() - started)
+    sample = collect()
+
+    durations.sort()
+    print(f"{args.gpus} GPUs, {args.polls} polls every {args.interval}s (simulated)")
+    print(f"poll pass: median {durations[len(durations) // 2] * 1e6:.1f} us, "
+          f"max {durations[-1] * 1e6:.1f} us")
+    print(f"aggregate: {sample.percent:.1f}% GPU, {sample.vram_percent:.1f}% VRAM "
+          f"over {sum(d.error is None for d in sample.devices)} healthy devices")
+    for device in sample.devices:
+        state = device.error or f"{device.percent}% {device.temperature_c}C power={device.power_w}"
+        print(f"  [{device.index}] {device.name}: {state}")
+    if failing:
+        index = next(iter(failing))
+        print(f"failing GPU {index}: queried {nvml.calls.get(('utilization', index), 0)} times "
+              f"in {args.polls} polls (backoff)")
+    print(f"power queries on GPU 0 (not supported): {nvml.calls.get(('power', 0), 0)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""psutil 경로와 /proc 직접 읽기 백엔드의 수집 비용을 비교하는 마이크로벤치마크.
+
+기본으로 benchmarks/fixtures의 고정 /proc 파일(16코어)을 읽으므로 머신과 관계없이
+같은 입력으로 비교할 수 있습니다. psutil은 PROCFS_PATH로 같은 파일을 읽게 합니다.
+
+    python benchmarks/bench_proc.py
+    python benchmarks/bench_proc.py --proc /proc --sys /sys --iterations 20000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psutil
+
+from collectors import ProcCpuCollector, get_ram_usage, make_proc_ram_collector
+from procfs import ProcFs
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def time_call(func, iterations):
+    """func를 iterations번 호출해 호출당 평균 마이크로초를 반환합니다."""
+    func()
+    started = time.perf_counter_ns()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter_ns() - started) / iterations / 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--proc', default=os.path.join(FIXTURES, 'proc'), help="/proc 루트 (기본: 고정 파일)")
+    parser.add_argument('--sys', default=os.path.join(FIXTURES, 'sys'), help="/sys 루트 (기본: 고정 파일)")
+    parser.add_argument('--iterations', type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    psutil.PROCFS_PATH = args.proc
+    procfs = ProcFs(args.proc, args.sys)
+    cpu = ProcCpuCollector(procfs)
+    ram = make_proc_ram_collector(procfs)
+
+    cases = [
+        ('cpu', lambda: psutil.cpu_percent(interval=None, percpu=True), cpu),
+        ('ram', get_ram_usage, ram),
+        ('net', psutil.net_io_counters, procfs.net_bytes),
+        ('disk_io', psutil.disk_io_counters, procfs.disk_bytes),
+    ]
+    print(f"proc={args.proc} iterations={args.iterations}")
+    print(f"{'metric':<10}{'psutil us':>12}{'procfs us':>12}{'speedup':>10}")
+    total_psutil = total_procfs = 0.0
+    for name, psutil_func, procfs_func in cases:
+        psutil_us = time_call(psutil_func, args.iterations)
+        procfs_us = time_call(procfs_func, args.iterations)
+        total_psutil += psutil_us
+        total_procfs += procfs_us
+        print(f"{name:<10}{psutil_us:>12.2f}{procfs_us:>12.2f}{psutil_us / procfs_us:>9.1f}x")
+    print(f"{'total':<10}{total_psutil:>12.2f}{total_procfs:>12.2f}{total_psutil / total_procfs:>9.1f}x")
+
+    # Both backends read the same files, so the values must agree.
+    print()
+    print(f"ram percent: psutil {get_ram_usage()[0]:.1f} / procfs {ram().percent:.1f}")
+    io = psutil.net_io_counters()
+    print(f"net bytes:   psutil {(io.bytes_sent, io.bytes_recv)} / procfs {procfs.net_bytes()}")
+    print(f"cpu cores:   psutil {len(psutil.cpu_percent(interval=None, percpu=True))} / procfs {len(cpu().cores)}")
+    procfs.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""합성 프로세스 목록으로 상위 프로세스 스캐너 비용을 측정합니다.
+
+psutil.process_iter처럼 Process 객체를 스캔 사이에 재사용하는 가짜 process_iter를
+ProcessScanner에 넘기고, 프로세스 수마다 스캔 시간, 부분 선택(heapq.nlargest)과
+전체 정렬의 비용, max_duty에 따른 실제 스캔 간격을 보고합니다. --live를 주면 이
+시스템의 실제 psutil 스캔도 측정합니다.
+
+    python benchmarks/bench_processes.py --counts 500,5000,20000 --churn 0.01
+"""
+import argparse
+import heapq
+import os
+import random
+import statistics
+import sys
+import time
+from collections import namedtuple
+from operator import itemgetter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from processes import MAX_DUTY, TOP_LIMIT, ProcessScanner
+
+CpuTimes = namedtuple('CpuTimes', ['user', 'system'])
+MemoryInfo = namedtuple('MemoryInfo', ['rss', 'vms'])
+IoCounters = namedtuple('IoCounters', ['read_bytes', 'write_bytes'])
+
+
+class FakeProcess:
+    __slots__ = ('pid', 'info', '_name', '_cpu', '_rss', '_io', '_busy')
+
+    def __init__(self, pid, rng):
+        self.pid = pid
+        self.info = None
+        self._name = f"worker-{pid}"
+        self._cpu = rng.uniform(0, 100)
+        self._rss = rng.randrange(1 << 20, 1 << 32)
+        self._io = rng.randrange(0, 1 << 30)
+        self._busy = rng.random() < 0.05  # most processes are idle between scans
+
+    def name(self):
+        return self._name
+
+
+class FakeProcessTable:
+    """psutil.process_iter와 같은 방식으로 동작하는 합성 프로세스 표.
+
+    스캔마다 churn 비율만큼 프로세스가 끝나고 새로 생기며, 바쁜 프로세스만 CPU 시간과
+    I/O 바이트가 늘어납니다.
+    """
+
+    def __init__(self, count, churn, seed=1):
+        self.rng = random.Random(seed)
+        self.churn = churn
+        self.next_pid = 1
+        self.processes = [self._spawn() for _ in range(count)]
+
+    def _spawn(self):
+        proc = FakeProcess(self.next_pid, self.rng)
+        self.next_pid += 1
+        return proc
+
+    def tick(self):
+        rng = self.rng
+        for _ in range(int(len(self.processes) * self.churn)):
+            self.processes[rng.randrange(len(self.processes))] = self._spawn()
+        for proc in self.processes:
+            if proc._busy:
+                proc._cpu += rng.uniform(0, 2)
+                proc._io += rng.randrange(0, 1 << 24)
+
+    def __call__(self, attrs):
+        for proc in self.processes:
+            proc.info = {'cpu_times': CpuTimes(proc._cpu, 0.0), 'memory_info': MemoryInfo(proc._rss, 0),
+                         'io_counters': IoCounters(proc._io, 0)}
+            yield proc
+
+
+def scan_cost(count, churn, scans, limit):
+    """스캔당 시간(ms, 중앙값)과 결과를 반환합니다. 첫 스캔(이름 읽기)은 따로 잽니다."""
+    table = FakeProcessTable(count, churn)
+    scanner = ProcessScanner(limit, process_iter=table, max_duty=1.0)
+    started = time.perf_counter()
+    scanner()
+    first_ms = (time.perf_counter() - started) * 1000
+    timings = []
+    for _ in range(scans):
+        table.tick()
+        scanner._next_scan = 0.0  # benchmark every call
+        started = time.perf_counter()
+        result = scanner()
+        timings.append((time.perf_counter() - started) * 1000)
+    return first_ms, statistics.median(timings), result
+
+
+def selection_cost(count, limit, repeat=20):
+    """같은 행 목록에서 heapq.nlargest와 전체 정렬의 비용(us)을 비교합니다."""
+    rng = random.Random(2)
+    rows = [(rng.uniform(0, 100), rng.randrange(1 << 32), rng.uniform(0, 50), pid, f"p{pid}") for pid in range(count)]
+    key = itemgetter(0)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        heapq.nlargest(limit, rows, key=key)
+    heap_us = (time.perf_counter() - started) / repeat * 1e6
+    started = time.perf_counter()
+    for _ in range(repeat):
+        sorted(rows, key=key, reverse=True)[:limit]
+    sort_us = (time.perf_counter() - started) / repeat * 1e6
+    return heap_us, sort_us
+
+
+def live_cost(scans, limit):
+    import psutil
+
+    scanner = ProcessScanner(limit, max_duty=1.0)
+    scanner()
+    timings = []
+    for _ in range(scans):
+        time.sleep(0.2)
+        scanner._next_scan = 0.0
+        started = time.perf_counter()
+        result = scanner()
+        timings.append((time.perf_counter() - started) * 1000)
+    return len(psutil.pids()), statistics.median(timings), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--counts', default='500,5000,20000', help="쉼표로 구분한 프로세스 수 목록")
+    parser.add_argument('--churn', type=float, default=0.01, help="스캔마다 교체되는 프로세스 비율")
+    parser.add_argument('--scans', type=int, default=20)
+    parser.add_argument('--limit', type=int, default=TOP_LIMIT)
+    parser.add_argument('--max-duty', type=float, default=MAX_DUTY, help="스캔 간격 계산에 쓸 최대 점유율")
+    parser.add_argument('--live', action='store_true', help="이 시스템의 실제 프로세스 스캔도 측정합니다.")
+    args = parser.parse_args(argv)
+
+    print(f"top {args.limit}, churn {args.churn:.1%} per scan, max duty {args.max_duty:.0%}")
+    print(f"{'procs':>7}{'first ms':>10}{'scan ms':>9}{'us/proc':>9}{'heap us':>9}{'sort us':>9}{'interval s':>12}")
+    for count in map(int, args.counts.split(',')):
+        first_ms, scan_ms, result = scan_cost(count, args.churn, args.scans, args.limit)
+        heap_us, sort_us = selection_cost(count, args.limit)
+        print(f"{count:>7}{first_ms:>10.1f}{scan_ms:>9.2f}{scan_ms * 1000 / count:>9.2f}"
+              f"{heap_us:>9.0f}{sort_us:>9.0f}{max(2.0, scan_ms / 1000 / args.max_duty):>12.2f}")
+        assert len(result.by_rss) == min(args.limit, count)
+
+    if args.live:
+        count, scan_ms, result = live_cost(args.scans, args.limit)
+        print(f"live: {count} processes, scan {scan_ms:.1f} ms ({scan_ms * 1000 / max(count, 1):.0f} us/proc), "
+              f"interval {max(2.0, scan_ms / 1000 / args.max_duty):.2f} s")
+        for entry in result.by_cpu:
+            print(f"  {entry.pid:>7} {entry.name:<20} {entry.cpu_percent:6.1f}% {entry.rss_mb:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
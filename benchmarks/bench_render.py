@@ -0,0 +1,317 @@
+"""게이지 그리기 함수의 헤드리스 렌더 벤치마크.
+
+GL 컨텍스트 없이 ImGui 프레임만 만들어 위젯별 CPU 시간, 정점/인덱스 수,
+프레임당 메모리 할당량을 측정합니다.
+
+    python benchmarks/bench_render.py
+    python benchmarks/bench_render.py --cores 8,64,256,1024 --frames 300 --json out.json
+    python benchmarks/bench_render.py --replay incident.rec
+    python benchmarks/bench_render.py --layout my_layout.toml
+    python benchmarks/bench_render.py --compare baseline.json --tolerance 0.25
+"""
+import argparse
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from types import MappingProxyType
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import imgui
+
+import HWMoniter as hw
+from collectors import CpuSample, RamSample, GpuSample, NetSample, DiskIoSample, DiskSample
+from history import MetricHistory
+from layout import LayoutEngine
+from processes import ProcessEntry, TopProcesses
+from storage import DiskRate, VolumeUsage
+from recording import RecordingFile, row_to_samples
+from sampler import Sample, Snapshot
+
+hw.load_numpy()  # the app loads NumPy in the background; measure the steady state
+
+WINDOW_FLAGS = (imgui.WINDOW_NO_TITLE_BAR | imgui.WINDOW_NO_RESIZE | imgui.WINDOW_NO_MOVE |
+                imgui.WINDOW_NO_SCROLLBAR | imgui.WINDOW_NO_COLLAPSE | imgui.WINDOW_NO_BACKGROUND)
+
+MAX_NET_MBPS = 1000
+MAX_DISK_MBPS = 1000
+
+
+def synthetic_snapshots(num_cores, num_disks=1, seed=1):
+    """무작위로 흔들리는 값을 가진 스냅샷을 끝없이 생성합니다."""
+    rng = random.Random(seed)
+    generation = 0
+    while True:
+        generation += 1
+        t = generation * 0.1
+        cores = tuple(50 + 50 * math.sin(t + i * 0.37) * rng.random() for i in range(num_cores))
+        disk_rates = tuple(DiskRate(f'nvme{i}n1', rng.uniform(0, 800), rng.uniform(0, 400)) for i in range(num_disks))
+        volumes = tuple(VolumeUsage(f'/mnt/disk{i}', f'nvme{i}n1', 63.0, 601.2, 953.9) for i in range(num_disks))
+        values = {
+            'cpu': CpuSample(sum(cores) / num_cores, cores),
+            'ram': RamSample(rng.uniform(20, 90), 12.3, 31.9),
+            'gpu': GpuSample(rng.uniform(0, 100), rng.uniform(0, 100), 6123.0, 12288.0),
+            'net': NetSample(rng.uniform(0, 300), rng.uniform(0, 900)),
+            'disk_io': DiskIoSample(sum(d.read_mbps for d in disk_rates), sum(d.write_mbps for d in disk_rates),
+                                    disk_rates),
+            'disk': DiskSample(63.0, 601.2 * num_disks, 953.9 * num_disks, volumes),
+            'processes': TopProcesses(*(tuple(ProcessEntry(1000 + i, f'process-{i}', rng.uniform(0, 400),
+                                                           rng.uniform(10, 8000), rng.uniform(0, 200))
+                                              for i in range(5)) for _ in range(3)), 300, 4.2),
+        }
+        samples = {name: Sample(value, time.time(), None) for name, value in values.items()}
+        yield Snapshot(generation, MappingProxyType(samples))
+
+
+def replay_snapshots(path):
+    """기록 파일의 레코드를 순서대로 스냅샷으로 돌려줍니다. 끝에 도달하면 반복합니다."""
+    recording = RecordingFile(path)
+    generation = 0
+    while True:
+        for index in range(len(recording)):
+            timestamp, row = recording.record(index)
+            generation += 1
+            samples = {name: Sample(value, timestamp, None)
+                       for name, value in row_to_samples(recording.fields, row).items()}
+            yield Snapshot(generation, MappingProxyType(samples))
+
+
+def widget_calls(snapshot, history, width, height, layout=None):
+    """대시보드와 같은 배치로 (위젯 이름, 호출 함수) 목록을 만듭니다."""
+    V = imgui.Vec2
+    radius = min(width, height) * 0.25
+    center_y = height / 2
+    # Replayed records may lack some sources (e.g. no disk on Linux), so draw zeros.
+    cpu = snapshot.get('cpu', CpuSample(0, ()))
+    ram = snapshot.get('ram', RamSample(0, 0, 0))
+    net = snapshot.get('net', NetSample(0, 0))
+    disk_io = snapshot.get('disk_io', DiskIoSample(0, 0))
+    disk = snapshot.get('disk', DiskSample(0, 0, 0))
+    grid = radius * 2 * 0.5
+    graph_size = V(radius * 2, center_y - radius - 40)
+    x = 20 + radius
+
+    return [
+        ('combined_gauge', lambda dl: hw.draw_combined_gauge(
+            dl, V(x, center_y), radius, cpu.total, ram.percent, "CPU / RAM",
+            f"{ram.used_gb:.1f}/{ram.total_gb:.1f} GB")),
+        ('core_grid', lambda dl: hw.draw_core_grid(
+            dl, V(x + radius + 20, center_y - grid / 2), V(grid, grid), cpu.cores)),
+        ('network_gauge', lambda dl: hw.draw_network_gauge(
+            dl, V(x + 4 * radius, center_y), radius,
+            net.upload_mbps / MAX_NET_MBPS * 100, net.download_mbps / MAX_NET_MBPS * 100,
+            "Network", net.upload_mbps, net.download_mbps)),
+        ('disk_gauge', lambda dl: hw.draw_disk_gauge(
+            dl, V(x + 7 * radius, center_y), radius, disk.percent,
+            disk_io.read_mbps / MAX_DISK_MBPS * 100, disk_io.write_mbps / MAX_DISK_MBPS * 100,
+            "Disk (C:)", disk_io.read_mbps, disk_io.write_mbps,
+            f"{disk.used_gb:.1f}/{disk.total_gb:.1f} GB")),
+        ('disk_strip', lambda dl: hw.draw_disk_strip(
+            dl, V(x + 9 * radius, center_y - radius), V(radius * 3, radius * 1.5),
+            hw.disk_panel_items(disk, disk_io), MAX_DISK_MBPS)),
+        ('process_panel', lambda dl: hw.draw_process_panel(
+            dl, V(x + radius * 2.2, center_y - radius), V(radius * 1.5, radius * 2),
+            snapshot.get('processes', TopProcesses((), (), (), 0, 0.0)))),
+        ('history_graph', lambda dl: hw.draw_history_graph(
+            dl, V(x - radius, 10), graph_size,
+            [(history.buffer('vram'), hw.GRAPH_SECONDARY_COLOR), (history.buffer('gpu'), hw.GRAPH_PRIMARY_COLOR)],
+            max_value=100)),
+        ('dashboard', lambda dl: hw.draw_dashboard(
+            dl, width, height, snapshot, history, MAX_NET_MBPS, MAX_NET_MBPS, MAX_DISK_MBPS, layout)),
+    ]
+
+
+def feed_history(history, snapshot):
+    for name, sample in snapshot.samples.items():
+        history.on_sample(name, sample, snapshot)
+
+
+def run_frames(snapshots, frames, width, height, track_allocations=False, layout=None):
+    """frames개의 프레임을 만들고 위젯별 측정값 목록을 반환합니다."""
+    history = MetricHistory()
+    timings = {}
+    geometry = {}
+    frame_totals = []
+    allocations = []
+
+    for _ in range(frames):
+        snapshot = next(snapshots)
+        feed_history(history, snapshot)
+
+        if track_allocations:
+            tracemalloc.reset_peak()
+            start_bytes = tracemalloc.get_traced_memory()[0]
+            start_blocks = sys.getallocatedblocks()
+
+        imgui.get_io().display_size = (width, height)
+        imgui.new_frame()
+        imgui.set_next_window_size(width, height)
+        imgui.set_next_window_position(0, 0)
+        imgui.begin("Background", flags=WINDOW_FLAGS)
+        draw_list = imgui.get_window_draw_list()
+
+        for name, call in widget_calls(snapshot, history, width, height, layout):
+            vtx_before = draw_list.vtx_buffer_size
+            idx_before = draw_list.idx_buffer_size
+            started = time.perf_counter_ns()
+            call(draw_list)
+            timings.setdefault(name, []).append((time.perf_counter_ns() - started) / 1000.0)
+            vtx, idx = draw_list.vtx_buffer_size - vtx_before, draw_list.idx_buffer_size - idx_before
+            # Geometry depends on the values drawn, so keep the worst case.
+            worst_vtx, worst_idx = geometry.get(name, (0, 0))
+            geometry[name] = (max(worst_vtx, vtx), max(worst_idx, idx))
+
+        imgui.end()
+        imgui.render()
+        draw_data = imgui.get_draw_data()
+        frame_totals.append((draw_data.total_vtx_count, draw_data.total_idx_count))
+
+        if track_allocations:
+            peak = tracemalloc.get_traced_memory()[1]
+            allocations.append((peak - start_bytes, sys.getallocatedblocks() - start_blocks))
+
+    return timings, geometry, frame_totals, allocations
+
+
+def layout_cost(layout, snapshot, history, width, height, repeat=200):
+    """레이아웃을 한 번 푸는 비용과 프레임마다 하는 모양 확인 비용(us, 중앙값)을 잽니다."""
+    data = hw.DashboardData(snapshot, history, MAX_NET_MBPS, MAX_NET_MBPS, MAX_DISK_MBPS, None, None)
+    shapes = tuple(widget.shape(data) for widget in layout._dynamic)
+    solve, check = [], []
+    for _ in range(repeat):
+        started = time.perf_counter_ns()
+        ops = layout.solve(width, height, shapes)
+        solve.append((time.perf_counter_ns() - started) / 1000)
+        started = time.perf_counter_ns()
+        tuple([widget.shape(data) for widget in layout._dynamic])
+        check.append((time.perf_counter_ns() - started) / 1000)
+    return {'solve_us': statistics.median(solve), 'shape_check_us': statistics.median(check), 'ops': len(ops)}
+
+
+def summarize(timings, geometry, frame_totals, allocations):
+    widgets = {}
+    for name, samples in timings.items():
+        samples = sorted(samples)
+        widgets[name] = {
+            'median_us': statistics.median(samples),
+            'p95_us': samples[int(len(samples) * 0.95) - 1] if len(samples) > 1 else samples[0],
+            'vertices': geometry[name][0],
+            'indices': geometry[name][1],
+        }
+    result = {
+        'widgets': widgets,
+        'frame_vertices': max(v for v, _ in frame_totals),
+        'frame_indices': max(i for _, i in frame_totals),
+    }
+    if allocations:
+        result['alloc_peak_kib'] = statistics.median(a for a, _ in allocations) / 1024
+        result['alloc_net_blocks'] = statistics.median(b for _, b in allocations)
+    return result
+
+
+def print_report(label, result):
+    print(f"\n== {label} ==")
+    print(f"{'widget':<16}{'median us':>12}{'p95 us':>12}{'vtx':>10}{'idx':>10}")
+    for name, w in result['widgets'].items():
+        print(f"{name:<16}{w['median_us']:>12.1f}{w['p95_us']:>12.1f}{w['vertices']:>10}{w['indices']:>10}")
+    print(f"frame draw data: {result['frame_vertices']} vtx, {result['frame_indices']} idx")
+    if 'layout' in result:
+        cost = result['layout']
+        print(f"layout: {cost['ops']} draw calls, solve {cost['solve_us']:.1f} us (on resize/config/shape change), "
+              f"shape check {cost['shape_check_us']:.1f} us/frame, {cost['solves']} solves in {cost['frames']} frames")
+    if 'alloc_peak_kib' in result:
+        print(f"allocations/frame: peak {result['alloc_peak_kib']:.1f} KiB, net {result['alloc_net_blocks']:+.0f} blocks")
+
+
+def compare(results, baseline, tolerance):
+    """기준 결과보다 시간이나 정점 수가 tolerance 비율 이상 늘어난 위젯 목록을 반환합니다."""
+    regressions = []
+    for label, result in results.items():
+        base = baseline.get(label)
+        if base is None:
+            continue
+        for name, w in result['widgets'].items():
+            b = base['widgets'].get(name)
+            if b is None:
+                continue
+            if w['median_us'] > b['median_us'] * (1 + tolerance):
+                regressions.append(f"{label}/{name}: {b['median_us']:.1f} -> {w['median_us']:.1f} us")
+            if w['vertices'] > b['vertices'] * (1 + tolerance):
+                regressions.append(f"{label}/{name}: {b['vertices']} -> {w['vertices']} vertices")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cores', default='8,64,256,1024', help="쉼표로 구분한 코어 수 목록")
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--width', type=int, default=2400)
+    parser.add_argument('--height', type=int, default=480)
+    parser.add_argument('--disks', type=int, default=1, help="합성 데이터의 디스크 수")
+    parser.add_argument('--font', help="실제 화면과 같은 조건을 위한 TTF 폰트 경로")
+    parser.add_argument('--font-size', type=float, default=32.0)
+    parser.add_argument('--replay', metavar='FILE', help="합성 데이터 대신 기록 파일을 사용합니다.")
+    parser.add_argument('--layout', metavar='FILE', help="기본 배치 대신 이 레이아웃 파일(TOML/JSON)로 대시보드를 그립니다.")
+    parser.add_argument('--no-alloc', action='store_true', help="메모리 할당 측정을 생략합니다.")
+    parser.add_argument('--json', metavar='FILE', help="결과를 JSON으로 저장합니다.")
+    parser.add_argument('--compare', metavar='FILE', help="기준 JSON과 비교해 회귀가 있으면 1로 종료합니다.")
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    imgui.create_context()
+    io = imgui.get_io()
+    io.display_size = (args.width, args.height)
+    if args.font:
+        io.fonts.add_font_from_file_ttf(args.font, args.font_size)
+    io.fonts.get_tex_data_as_rgba32()
+
+    if args.replay:
+        scenarios = {os.path.basename(args.replay): lambda: replay_snapshots(args.replay)}
+    else:
+        scenarios = {f"{n} cores": (lambda n=n: synthetic_snapshots(n, args.disks)) for n in map(int, args.cores.split(','))}
+
+    layout = LayoutEngine.from_file(hw.WIDGET_TYPES, args.layout, group_overlay=hw.alert_border) if args.layout else hw.default_layout()
+
+    results = {}
+    for label, make_snapshots in scenarios.items():
+        # Warm-up so ImGui buffers have grown to steady-state size.
+        run_frames(make_snapshots(), 10, args.width, args.height, layout=layout)
+        solves = layout.solves
+        timings, geometry, frame_totals, _ = run_frames(make_snapshots(), args.frames, args.width, args.height,
+                                                        layout=layout)
+        solves = layout.solves - solves
+        allocations = []
+        if not args.no_alloc:
+            tracemalloc.start()
+            allocations = run_frames(make_snapshots(), min(args.frames, 50), args.width, args.height,
+                                     track_allocations=True, layout=layout)[3]
+            tracemalloc.stop()
+        result = summarize(timings, geometry, frame_totals, allocations)
+        history = MetricHistory()
+        snapshot = next(make_snapshots())
+        feed_history(history, snapshot)
+        result['layout'] = dict(layout_cost(layout, snapshot, history, args.width, args.height),
+                                solves=solves, frames=args.frames)
+        results[label] = result
+        print_report(label, result)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
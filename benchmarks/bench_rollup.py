@@ -0,0 +1,166 @@
+"""다중 해상도 롤업의 적재 비용, 메모리, 장기 구간 조회 비용을 측정합니다.
+
+일주일치 합성 데이터(하루 주기 + 잡음 + 드문 스파이크)를 RollupStore에 넣으면서 샘플당
+비용을 재고, 1시간부터 7일까지의 구간을 픽셀 폭으로 줄이는 조회(LTTB, 픽셀별 min/max)의
+지연 시간과 고른 해상도를 보고합니다. 원본과 비교해 구간 최대값(스파이크)이 남는지도
+단순 간격 추출과 나란히 보여 줍니다. 끝으로 컨테이너의 veth처럼 인터페이스 이름이 계속
+바뀌는 네트워크 샘플을 넣어 RollupStore와 MetricHistory의 메모리가 상한 안에 머무는지
+확인하고(처음 1분은 코어가 한도보다 많은 CPU 샘플도 함께 넣어 NIC 메트릭이 밀려나지
+않는지도 봅니다), 넘으면 종료 코드 1로 끝냅니다.
+
+    python benchmarks/bench_rollup.py
+    python benchmarks/bench_rollup.py --days 7 --rate 10 --metrics 8 --widths 600,1200,1920
+"""
+import argparse
+import math
+import os
+import random
+import statistics
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from collectors import AGGREGATE_METRICS, METRIC_FAMILIES, CpuSample, NetSample
+from history import MetricHistory
+from network import NicRate
+from rollup import QUERY_METHODS, RollupStore
+from sampler import Sample
+
+DAY = 86400
+SPANS = (('1h', 3600), ('6h', 6 * 3600), ('24h', DAY), ('7d', 7 * DAY))
+START = 1_700_000_000.0
+
+
+def synthetic_values(seed, count, rate):
+    """하루 주기 사인파에 잡음과 드문 스파이크(최대 100)를 얹은 0~100 값을 생성합니다."""
+    rng = random.Random(seed)
+    phase = rng.random() * math.tau
+    level = 0.0
+    for i in range(count):
+        t = i / rate
+        level = 0.98 * level + rng.gauss(0, 2)
+        value = 40 + 25 * math.sin(t / DAY * math.tau + phase) + level
+        if rng.random() < 2e-5:
+            value = 100.0
+        yield min(max(value, 0.0), 100.0)
+
+
+def ingest(store, metrics, days, rate, seed):
+    """모든 메트릭에 days일치 샘플을 넣고 (샘플 수, 걸린 초, 첫 메트릭의 원본 값)을 반환합니다."""
+    count = int(days * DAY * rate)
+    raw = array('f')
+    elapsed = 0.0
+    for index in range(metrics):
+        name = f'metric{index}'
+        values = list(synthetic_values(seed + index, count, rate))
+        timestamps = [START + i / rate for i in range(count)]
+        add = store.add
+        started = time.perf_counter()
+        for timestamp, value in zip(timestamps, values):
+            add(name, timestamp, value)
+        elapsed += time.perf_counter() - started
+        if index == 0:
+            raw.extend(values)
+    return count * metrics, elapsed, raw
+
+
+def churn(hours, lifetime, seed):
+    """lifetime초마다 veth 하나가 사라지고 새로 생기는 net 샘플(1초 간격)을 넣고 최대 메모리를 잽니다."""
+    rng = random.Random(seed)
+    store, history = RollupStore(), MetricHistory()
+    nics = [f'veth{i}' for i in range(8)]
+    created = len(nics)
+    peak_store = peak_history = 0
+    for second in range(int(hours * 3600)):
+        if second % lifetime == 0 and second:
+            nics[rng.randrange(len(nics))] = f'veth{created}'
+            created += 1
+        rates = tuple(NicRate(name, rng.uniform(0, 10), rng.uniform(0, 10), 10000, True) for name in ['eth0'] + nics)
+        sample = Sample(NetSample(sum(r.upload_mbps for r in rates), sum(r.download_mbps for r in rates), rates),
+                        START + second, None)
+        store.on_sample('net', sample, None)
+        history.on_sample('net', sample, None)
+        if second < 60:  # a many-core host must not crowd the interfaces out of their own budget
+            cpu = Sample(CpuSample(50.0, (50.0,) * 2 * store.max_detail), START + second, None)
+            store.on_sample('cpu', cpu, None)
+            history.on_sample('cpu', cpu, None)
+        if second % 60 == 0:
+            peak_store = max(peak_store, store.memory_bytes())
+            peak_history = max(peak_history, history.memory_bytes())
+    return created, store, history, peak_store, peak_history
+
+
+def time_call(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter_ns()
+        func()
+        timings.append(time.perf_counter_ns() - started)
+    return statistics.median(timings) / 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--days', type=float, default=7.0)
+    parser.add_argument('--rate', type=float, default=1.0, help="메트릭당 초당 샘플 수")
+    parser.add_argument('--metrics', type=int, default=4)
+    parser.add_argument('--widths', default='600,1200', help="조회 폭(픽셀) 목록")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--churn-hours', type=float, default=24.0, help="인터페이스가 바뀌는 샘플을 넣을 시간")
+    parser.add_argument('--churn-lifetime', type=int, default=30, help="새 인터페이스가 생기는 간격(초)")
+    args = parser.parse_args(argv)
+    widths = [int(w) for w in args.widths.split(',')]
+
+    store = RollupStore()
+    samples, elapsed, raw = ingest(store, args.metrics, args.days, args.rate, args.seed)
+    raw_bytes = samples * 12  # float32 value + float64 timestamp per sample
+    print(f"ingest: {samples:,} samples ({args.metrics} metrics x {args.days:g} days at {args.rate:g}/s) in {elapsed:.1f} s, "
+          f"{elapsed / samples * 1e9:.0f} ns/sample")
+    print(f"memory: {store.memory_bytes() / 1024:.0f} KiB for {len(store.names())} metrics "
+          f"(raw samples would need {raw_bytes / 1024**2:.1f} MiB)")
+
+    end = store.latest_time + 1
+    print(f"\n{'span':<5}{'width':>6}{'method':>8}{'tier':>7}{'points':>8}{'query us':>10}"
+          f"{'raw max':>9}{'kept max':>10}{'stride max':>11}")
+    for label, span in SPANS:
+        span = min(span, args.days * DAY)
+        start = end - span
+        first = max(int((start - START) * args.rate), 0)
+        window = raw[first:]
+        raw_max = max(window) if window else float('nan')
+        for width in widths:
+            # Plain decimation (every n-th sample) for comparison: spikes fall between the picks.
+            stride = max(len(window) // width, 1)
+            stride_max = max(window[::stride]) if window else float('nan')
+            for method in QUERY_METHODS:
+                series = store.query('metric0', start, end, width, method)
+                cost = time_call(lambda: store.query('metric0', start, end, width, method), args.repeat)
+                kept = float(max(series.high[~(series.high != series.high)], default=float('nan')))
+                print(f"{label:<5}{width:>6}{method:>8}{series.resolution:>6}s{len(series.values):>8}{cost:>10.0f}"
+                      f"{raw_max:>9.1f}{kept:>10.1f}{stride_max:>11.1f}")
+
+    view = store.view('metric0', 7 * DAY)
+    uncached = time_call(lambda: (setattr(view, '_key', None), view.values(1200)), args.repeat)
+    cached = time_call(lambda: view.values(1200), args.repeat * 10)
+    print(f"\ngraph view (7d, 600 columns): {uncached:.0f} us on refresh, {cached:.2f} us per cached frame")
+
+    created, store, history, peak_store, peak_history = churn(args.churn_hours, args.churn_lifetime, args.seed)
+    per_rollup = store.memory_bytes() // len(store.names())
+    store_bound = (len(AGGREGATE_METRICS) + len(METRIC_FAMILIES) * store.max_detail) * per_rollup
+    history_bound = (len(AGGREGATE_METRICS) + len(METRIC_FAMILIES) * history.max_detail) * history.capacity * 4
+    print(f"\nname churn ({args.churn_hours:g} h, {created} interfaces, {2 * created + 2} metric names): "
+          f"rollups peak {peak_store / 1024**2:.1f} MiB (bound {store_bound / 1024**2:.1f} MiB), "
+          f"history peak {peak_history / 1024:.0f} KiB (bound {history_bound / 1024:.0f} KiB)")
+    if peak_store > store_bound or peak_history > history_bound:
+        print("memory exceeded its bound under name churn", file=sys.stderr)
+        sys.exit(1)
+    if 'net_up_eth0' not in store or 'net_up_eth0' not in history:
+        print("per-interface metrics were crowded out by per-core metrics", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""콜드 스타트 시간(첫 프레임까지 걸린 시간)을 측정합니다.
+
+HWMoniter.py --first-frame-exit를 여러 번 실행해, 프로세스를 띄운 순간부터 첫 프레임이
+화면에 나갈 때까지의 벽시계 시간과 프로세스 안에서 잰 시간을 보고합니다. 임포트 단계의
+비용은 python -X importtime으로 따로 나눠 보여 줍니다. 디스플레이가 없어 창을 만들 수
+없으면 임포트 비용만 보고합니다.
+
+    python benchmarks/bench_startup.py --runs 5
+    python benchmarks/bench_startup.py --runs 5 --app-args "--replay session.hwrec"
+"""
+import argparse
+import os
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, 'HWMoniter.py')
+
+
+def first_frame(app_args, timeout):
+    """한 번 실행해 (벽시계 초, 프로세스 안에서 잰 초)를 반환합니다. 실패하면 (None, 오류 출력)."""
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, APP, '--first-frame-exit'] + app_args, cwd=ROOT,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    try:
+        for line in process.stdout:
+            if line.startswith('first frame '):
+                wall = time.perf_counter() - started
+                process.wait(timeout)
+                return wall, float(line.split()[2].rstrip('s'))
+        _, stderr = process.communicate(timeout=timeout)
+        return None, stderr.strip()
+    except subprocess.TimeoutExpired:
+        process.kill()
+        return None, "timeout"
+
+
+def import_profile(module, runs):
+    """module 임포트의 누적 시간(ms)과 가장 비싼 하위 모듈 목록을 반환합니다."""
+    totals = []
+    modules = {}
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], cwd=ROOT,
+                                capture_output=True, text=True)
+        children = []
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _, cumulative, name = line[len('import time:'):].split('|')
+            name = name.rstrip()[1:]  # drop the separator space; the rest is 2 spaces per level
+            depth = (len(name) - len(name.lstrip())) // 2
+            cumulative_ms = int(cumulative) / 1000
+            # Children are printed before their parent, so collect direct children until the parent line.
+            if depth == 1:
+                children.append((name.strip(), cumulative_ms))
+            elif depth == 0:
+                if name == module:
+                    totals.append(cumulative_ms)
+                    for child, cost in children:
+                        modules.setdefault(child, []).append(cost)
+                children = []
+    top = sorted(((statistics.median(v), k) for k, v in modules.items()), reverse=True)
+    return statistics.median(totals) if totals else 0.0, top
+
+
+def interpreter_startup(runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'pass'], check=True)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--app-args', default='', help="HWMoniter.py에 넘길 추가 인자")
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--top', type=int, default=8, help="보여 줄 하위 임포트 수")
+    args = parser.parse_args(argv)
+
+    print(f"python -c pass: {interpreter_startup(args.runs) * 1000:.0f} ms")
+    total, top = import_profile('HWMoniter', args.runs)
+    print(f"import HWMoniter: {total:.0f} ms")
+    for cost, name in top[:args.top]:
+        print(f"  {name:<20}{cost:>8.1f} ms")
+
+    walls, inner = [], []
+    for _ in range(args.runs):
+        wall, detail = first_frame(shlex.split(args.app_args), args.timeout)
+        if wall is None:
+            print(f"time to first frame: not measured ({detail.splitlines()[-1] if detail else 'no output'})")
+            return
+        walls.append(wall)
+        inner.append(detail)
+    print(f"time to first frame: wall median {statistics.median(walls) * 1000:.0f} ms "
+          f"(min {min(walls) * 1000:.0f}, max {max(walls) * 1000:.0f}), "
+          f"in-process median {statistics.median(inner) * 1000:.0f} ms over {args.runs} runs")
+
+
+if __name__ == "__main__":
+    main()
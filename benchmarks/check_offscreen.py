@@ -0,0 +1,203 @@
+"""오프스크린 렌더링의 골든 이미지 검사와 읽기/내보내기 비용 측정.
+
+EGL(창 없는 GL, CI에서는 Mesa llvmpipe)로 고정된 합성 스냅샷의 대시보드를 그려
+benchmarks/golden/*.png와 비교합니다. 폰트는 ImGui 기본 폰트만 씁니다. 한 장면이라도
+허용 오차를 넘으면 종료 코드 1로 끝나고, 실제 결과를 임시 디렉터리에 PNG로 남깁니다.
+이어서 동기 glReadPixels와 PBO 비동기 읽기, 픽셀 변환, 바뀐 사각형 계산의 비용과
+프레임 전체 대비 실제로 보낸 바이트 비율을 보고합니다.
+
+    python benchmarks/check_offscreen.py
+    python benchmarks/check_offscreen.py --update-golden
+    python benchmarks/check_offscreen.py --frames 300 --size 1920x480
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from types import MappingProxyType
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import offscreen
+
+offscreen.use_egl_platform()  # before anything imports OpenGL
+
+import imgui
+
+import HWMoniter as hw
+from benchmarks.bench_render import MAX_DISK_MBPS, MAX_NET_MBPS, feed_history, synthetic_snapshots
+from history import MetricHistory
+from sampler import Snapshot
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden')
+
+# name -> (width, height, cores, disks, frames of history before the captured frame)
+SCENES = {
+    'empty_1200x240': (1200, 240, 0, 0, 0),
+    'dashboard_1200x240': (1200, 240, 8, 1, 60),
+    'dashboard_1920x480': (1920, 480, 64, 3, 120),
+}
+# Drivers differ in rasterization and blending rounding; allow small per-channel differences.
+CHANNEL_TOLERANCE = 8
+MAX_MISMATCH = 0.005  # fraction of pixels allowed beyond CHANNEL_TOLERANCE
+
+
+def render_frame(impl, reader, snapshot, history):
+    """스냅샷 하나를 reader의 FBO에 그리고 읽기를 시작합니다."""
+    width, height = reader.width, reader.height
+    imgui.get_io().display_size = (width, height)
+    imgui.new_frame()
+    imgui.set_next_window_size(width, height)
+    imgui.set_next_window_position(0, 0)
+    imgui.begin("Background", flags=hw.BACKGROUND_WINDOW_FLAGS)
+    hw.draw_dashboard(imgui.get_window_draw_list(), width, height, snapshot, history,
+                      MAX_NET_MBPS, MAX_NET_MBPS, MAX_DISK_MBPS)
+    imgui.end()
+    reader.bind()
+    gl = reader.gl
+    gl.glClearColor(0.0, 0.0, 0.0, 1.0)
+    gl.glClear(gl.GL_COLOR_BUFFER_BIT)
+    imgui.render()
+    impl.render(imgui.get_draw_data())
+    reader.start()
+
+
+def scene_frame(impl, width, height, cores, disks, warmup):
+    """장면의 마지막 프레임을 (높이, 너비, 3) RGB 배열로 반환합니다."""
+    history = MetricHistory()
+    if cores:
+        snapshots = synthetic_snapshots(cores, disks)
+        for _ in range(warmup):
+            feed_history(history, next(snapshots))
+        snapshot = next(snapshots)
+        feed_history(history, snapshot)
+    else:
+        snapshot = Snapshot(0, MappingProxyType({}))  # before the first sample arrives
+    reader = offscreen.FrameReader(width, height, asynchronous=False)
+    try:
+        render_frame(impl, reader, snapshot, history)
+        return reader.poll(block=True)[-1][:, :, :3].copy()
+    finally:
+        reader.close()
+
+
+def compare_images(actual, expected):
+    """허용 오차를 넘는 픽셀 비율과 가장 큰 채널 차이를 반환합니다. 크기가 다르면 (1.0, 255)."""
+    if actual.shape != expected.shape:
+        return 1.0, 255
+    diff = abs(actual.astype('i2') - expected.astype('i2')).max(axis=2)
+    return float((diff > CHANNEL_TOLERANCE).mean()), int(diff.max())
+
+
+def check_golden(impl, update):
+    failed = []
+    for name, (width, height, cores, disks, warmup) in SCENES.items():
+        actual = scene_frame(impl, width, height, cores, disks, warmup)
+        path = os.path.join(GOLDEN_DIR, f'{name}.png')
+        if update or not os.path.exists(path):
+            os.makedirs(GOLDEN_DIR, exist_ok=True)
+            offscreen.write_png(path, actual)
+            print(f"golden {name:<22} written {path}")
+            continue
+        mismatch, worst = compare_images(actual, offscreen.read_png(path))
+        ok = mismatch <= MAX_MISMATCH
+        print(f"golden {name:<22} {'ok' if ok else 'FAIL':<5} {mismatch:7.3%} pixels off "
+              f"(max channel diff {worst})")
+        if not ok:
+            actual_path = os.path.join(tempfile.gettempdir(), f'{name}.actual.png')
+            offscreen.write_png(actual_path, actual)
+            print(f"  actual frame: {actual_path}")
+            failed.append(name)
+    return failed
+
+
+def median_ms(values):
+    return statistics.median(values) / 1e6 if values else 0.0
+
+
+def measure_readback(impl, width, height, frames, asynchronous):
+    """프레임마다 그리기 + 읽기 시작 + 끝난 읽기 수거에 걸린 시간(ns)과 읽은 프레임 목록."""
+    reader = offscreen.FrameReader(width, height, asynchronous=asynchronous)
+    snapshots = synthetic_snapshots(16, 2)
+    history = MetricHistory()
+    timings = []
+    captured = []
+    try:
+        for _ in range(frames):
+            snapshot = next(snapshots)
+            feed_history(history, snapshot)
+            started = time.perf_counter_ns()
+            render_frame(impl, reader, snapshot, history)
+            ready = reader.poll()
+            timings.append(time.perf_counter_ns() - started)
+            captured.extend(frame.copy() for frame in ready)
+        captured.extend(frame.copy() for frame in reader.poll(block=True))
+    finally:
+        reader.close()
+    return timings, captured
+
+
+def measure_export(captured, pixel_format):
+    convert, diff = [], []
+    previous = None
+    for rgba in captured:
+        started = time.perf_counter_ns()
+        frame = offscreen.convert_pixels(rgba, pixel_format)
+        convert.append(time.perf_counter_ns() - started)
+        if previous is not None:
+            started = time.perf_counter_ns()
+            offscreen.dirty_rects(previous, frame)
+            diff.append(time.perf_counter_ns() - started)
+        previous = frame
+    exporter = offscreen.FrameExporter(pixel_format)
+    rect_counts = [len(exporter.push(rgba)) for rgba in captured]
+    return convert, diff, exporter, rect_counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--update-golden', action='store_true', help="골든 이미지를 지금 결과로 다시 씁니다")
+    parser.add_argument('--frames', type=int, default=120, help="비용 측정에 쓸 프레임 수")
+    parser.add_argument('--size', default='1200x240', help="비용 측정 해상도 (WxH)")
+    parser.add_argument('--skip-timing', action='store_true')
+    args = parser.parse_args(argv)
+
+    try:
+        context = offscreen.EglContext()
+    except Exception as e:
+        print(f"EGL 컨텍스트를 만들 수 없습니다: {e}", file=sys.stderr)
+        sys.exit(2)
+    from imgui.integrations.opengl import ProgrammablePipelineRenderer
+
+    hw.load_numpy()
+    imgui.create_context()
+    impl = ProgrammablePipelineRenderer()  # builds the default font atlas
+    print(f"renderer: {context.renderer}")
+    try:
+        failed = check_golden(impl, args.update_golden)
+        if not args.skip_timing:
+            width, height = offscreen.parse_size(args.size)
+            print(f"\n{width}x{height}, {args.frames} frames, synthetic snapshots")
+            captured = None
+            for asynchronous in (False, True):
+                timings, frames = measure_readback(impl, width, height, args.frames, asynchronous)
+                captured = captured or frames
+                print(f"  render + readback ({'pbo async' if asynchronous else 'sync':<9}) "
+                      f"median {median_ms(timings):6.2f} ms, max {max(timings) / 1e6:6.2f} ms")
+            for pixel_format in offscreen.PIXEL_FORMATS:
+                convert, diff, exporter, rect_counts = measure_export(captured, pixel_format)
+                print(f"  {pixel_format}: convert {median_ms(convert):5.2f} ms, dirty rects {median_ms(diff):5.2f} ms, "
+                      f"{statistics.mean(rect_counts):.1f} rects/frame, "
+                      f"pushed {exporter.pushed_bytes / exporter.full_bytes:.1%} of full-frame bytes")
+    finally:
+        impl.shutdown()
+        context.close()
+    if failed:
+        print(f"golden mismatch: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
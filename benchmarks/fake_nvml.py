@@ -0,0 +1,82 @@
+"""pynvml과 같은 인터페이스를 가진 가짜 NVML. GPU 없는 환경에서 NvmlPoller를 시험할 때 씁니다.
+
+    from benchmarks.fake_nvml import FakeNvml
+    poller = NvmlPoller(nvml=FakeNvml(device_count=8, failing={3}))
+"""
+import random
+import time
+from types import SimpleNamespace
+
+
+class NVMLError(Exception):
+    pass
+
+
+class NVMLError_NotSupported(NVMLError):
+    pass
+
+
+class FakeNvml:
+    """모듈처럼 쓰는 가짜 NVML 객체. failing에 든 장치 인덱스는 모든 쿼리에서 NVMLError를 던집니다."""
+
+    NVMLError = NVMLError
+    NVMLError_NotSupported = NVMLError_NotSupported
+    NVML_TEMPERATURE_GPU = 0
+    NVML_CLOCK_GRAPHICS = 0
+
+    def __init__(self, device_count=1, failing=(), no_power=(), latency=0.0, seed=1):
+        self.device_count = device_count
+        self.failing = set(failing)
+        self.no_power = set(no_power)
+        self.latency = latency
+        self.calls = {}
+        self._rng = random.Random(seed)
+
+    def _call(self, name, handle=None):
+        self.calls[(name, handle)] = self.calls.get((name, handle), 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+        if handle in self.failing:
+            raise NVMLError(f"GPU {handle} is lost")
+
+    def nvmlInit(self):
+        self._call('init')
+
+    def nvmlShutdown(self):
+        self._call('shutdown')
+
+    def nvmlDeviceGetCount(self):
+        self._call('count')
+        return self.device_count
+
+    def nvmlDeviceGetHandleByIndex(self, index):
+        self._call('handle')
+        return index
+
+    def nvmlDeviceGetName(self, handle):
+        self._call('name')
+        return f"Fake GPU {handle}".encode()
+
+    def nvmlDeviceGetUtilizationRates(self, handle):
+        self._call('utilization', handle)
+        return SimpleNamespace(gpu=self._rng.randint(0, 100), memory=self._rng.randint(0, 100))
+
+    def nvmlDeviceGetMemoryInfo(self, handle):
+        self._call('memory', handle)
+        total = 24 * 1024**3
+        used = int(total * self._rng.random())
+        return SimpleNamespace(total=total, used=used, free=total - used)
+
+    def nvmlDeviceGetTemperature(self, handle, sensor):
+        self._call('temperature', handle)
+        return self._rng.randint(30, 85)
+
+    def nvmlDeviceGetPowerUsage(self, handle):
+        self._call('power', handle)
+        if handle in self.no_power:
+            raise NVMLError_NotSupported("power not supported")
+        return self._rng.randint(50_000, 350_000)
+
+    def nvmlDeviceGetClockInfo(self, handle, clock_type):
+        self._call('clock', handle)
+        return self._rng.randint(300, 2100)
@@ -0,0 +1,425 @@
+"""하드웨어 메트릭 수집 함수와 기본 Collector 구성."""
+import functools
+import glob
+import math
+import os
+import re
+import sys
+import time
+from collections import namedtuple
+
+import psutil
+
+from processes import START_DELAY, ProcessScanner
+from procfs import open_procfs
+from sampler import Collector
+from network import (ACTIVE_HOLD, ACTIVE_THRESHOLD_MBPS, SMOOTHING_TAU, WRAP_MAX_RATE, LinkMonitor, NicRate,
+                     counter_delta, is_loopback)
+from storage import DiskRate, StorageInventory, VolumeUsage, is_whole_disk
+
+# --- System Info Functions ---
+def get_ram_usage():
+    """메인 메모리(RAM) 사용 정보를 반환합니다. (퍼센트, 사용량 GB, 총량 GB)"""
+    mem_info = psutil.virtual_memory()
+    percent = mem_info.percent
+    used_gb = mem_info.used / (1024**3)
+    total_gb = mem_info.total / (1024**3)
+    return percent, used_gb, total_gb
+
+def get_disk_info(mountpoint):
+    """지정된 마운트 지점(예: 'C:\\', '/')의 디스크 정보를 반환합니다. (퍼센트, 사용량 GB, 총량 GB)"""
+    try:
+        usage = psutil.disk_usage(mountpoint)
+        return {
+            'percent': usage.percent,
+            'used_gb': usage.used / (1024**3),
+            'total_gb': usage.total / (1024**3)
+        }
+    except (FileNotFoundError, PermissionError):
+        return None
+
+
+def _parse_cpu_list(text):
+    """'0-3,8-11' 형식의 CPU 목록을 정수 목록으로 변환합니다."""
+    cpus = []
+    for part in text.strip().split(','):
+        if not part:
+            continue
+        if '-' in part:
+            start, end = part.split('-')
+            cpus.extend(range(int(start), int(end) + 1))
+        else:
+            cpus.append(int(part))
+    return cpus
+
+@functools.lru_cache(maxsize=None)
+def get_cpu_groups(num_cores):
+    """코어 인덱스를 NUMA 노드별(없으면 소켓별)로 묶은 튜플 목록을 반환합니다.
+
+    Linux가 아니거나 그룹이 하나뿐이면 None을 반환합니다.
+    """
+    if not sys.platform.startswith('linux'):
+        return None
+
+    groups = []
+    for path in sorted(glob.glob('/sys/devices/system/node/node[0-9]*/cpulist'),
+                       key=lambda p: int(os.path.basename(os.path.dirname(p))[4:])):
+        try:
+            with open(path) as f:
+                cpus = [c for c in _parse_cpu_list(f.read()) if c < num_cores]
+        except (OSError, ValueError):
+            continue
+        if cpus:
+            groups.append(tuple(cpus))
+
+    if len(groups) <= 1:
+        sockets = {}
+        for core in range(num_cores):
+            try:
+                with open(f'/sys/devices/system/cpu/cpu{core}/topology/physical_package_id') as f:
+                    sockets.setdefault(int(f.read()), []).append(core)
+            except (OSError, ValueError):
+                return None
+        groups = [tuple(cores) for _, cores in sorted(sockets.items())]
+
+    return groups if len(groups) > 1 else None
+
+# --- Snapshot Values ---
+# Collector 결과는 불변 튜플이어야 스냅샷을 락 없이 공유할 수 있습니다.
+CpuSample = namedtuple('CpuSample', ['total', 'cores'])
+RamSample = namedtuple('RamSample', ['percent', 'used_gb', 'total_gb'])
+# devices: 장치별 gpu.GpuDeviceSample 튜플 (percent/VRAM은 정상 장치의 평균/합계)
+GpuSample = namedtuple('GpuSample', ['percent', 'vram_percent', 'vram_used_mb', 'vram_total_mb', 'devices'],
+                       defaults=((),))
+# nics: 루프백을 뺀, 켜져 있는 인터페이스별 network.NicRate 튜플 (속도는 EWMA로 평활)
+NetSample = namedtuple('NetSample', ['upload_mbps', 'download_mbps', 'nics'], defaults=((),))
+# devices: 장치별 storage.DiskRate 튜플 (read/write는 파티션을 뺀 디스크 장치 합계)
+DiskIoSample = namedtuple('DiskIoSample', ['read_mbps', 'write_mbps', 'devices'], defaults=((),))
+# volumes: 마운트별 storage.VolumeUsage 튜플 (percent/GB는 전체 볼륨 합계)
+DiskSample = namedtuple('DiskSample', ['percent', 'used_gb', 'total_gb', 'volumes'], defaults=((),))
+
+def cpu_core_count():
+    """논리 코어 수를 반환합니다."""
+    return psutil.cpu_count() or 1
+
+def collect_cpu():
+    """전체 및 코어별 CPU 사용률을 한 번의 호출로 수집합니다."""
+    cores = tuple(psutil.cpu_percent(interval=None, percpu=True))
+    total = sum(cores) / len(cores) if cores else 0.0
+    return CpuSample(total, cores)
+
+def collect_ram():
+    return RamSample(*get_ram_usage())
+
+class ProcCpuCollector:
+    """/proc/stat 한 번 읽기로 전체 및 코어별 CPU 사용률을 계산합니다. (psutil.cpu_percent와 같은 방식)
+
+    이전 값은 cpu id로 짝지으므로 코어가 오프라인/온라인이 되어 줄 순서가 바뀌어도 섞이지 않습니다.
+    이전 값이 없는 코어는 이번 한 번 0으로 보고합니다.
+    """
+
+    def __init__(self, procfs):
+        self._procfs = procfs
+        self._last = {cpu: (busy, total) for cpu, busy, total in procfs.cpu_times()}
+
+    def __call__(self):
+        current = self._procfs.cpu_times()
+        last = self._last
+        usages = []
+        for cpu, busy, total in current:
+            previous = last.get(cpu)
+            if previous is None:
+                usages.append(0.0)  # newly online core: no baseline yet
+                continue
+            total_delta = total - previous[1]
+            usages.append(min(max((busy - previous[0]) / total_delta * 100, 0.0), 100.0) if total_delta > 0 else 0.0)
+        self._last = {cpu: (busy, total) for cpu, busy, total in current}
+        if not usages:
+            return CpuSample(0.0, ())
+        return CpuSample(usages[0], tuple(usages[1:]))
+
+def make_proc_ram_collector(procfs):
+    """/proc/meminfo에서 RAM 사용 정보를 읽는 수집 함수를 만듭니다."""
+    def collect_ram():
+        total, available, used = procfs.memory()
+        percent = (total - available) / total * 100 if total else 0.0
+        return RamSample(round(percent, 1), used / (1024**3), total / (1024**3))
+    return collect_ram
+
+def psutil_net_bytes_pernic():
+    # Raw counters: NetRateCollector handles wraparound itself.
+    counters = psutil.net_io_counters(pernic=True, nowrap=False)
+    return {name: (io.bytes_sent, io.bytes_recv) for name, io in counters.items()}
+
+def psutil_disk_bytes_perdisk():
+    counters = psutil.disk_io_counters(perdisk=True) or {}
+    return {name: (io.read_bytes, io.write_bytes) for name, io in counters.items()}
+
+def make_gpu_collector(poller):
+    """NvmlPoller로 모든 GPU를 한 번에 읽는 수집 함수를 만듭니다.
+
+    모든 장치가 실패하면 예외를 던져 스냅샷에 0%가 아닌 오류로 기록되게 합니다.
+    NVML 초기화가 아직 끝나지 않았거나 GPU가 없으면 None을 반환합니다.
+    """
+    def collect_gpu():
+        if not poller.ready.is_set() or not poller.devices:
+            return None
+        devices = poller.poll()
+        healthy = [d for d in devices if d.error is None]
+        if not healthy:
+            raise RuntimeError(devices[0].error if devices else "GPU 없음")
+        used = sum(d.vram_used_mb for d in healthy)
+        total = sum(d.vram_total_mb for d in healthy)
+        return GpuSample(
+            sum(d.percent for d in healthy) / len(healthy),
+            (used / total) * 100 if total else 0,
+            used, total, devices,
+        )
+    return collect_gpu
+
+class NetRateCollector:
+    """인터페이스별 누적 바이트의 변화로 송수신 속도(Mbps)를 계산합니다.
+
+    counters는 인터페이스 이름별 누적 (송신, 수신) 바이트 딕셔너리를 반환하는 함수입니다.
+    속도는 SMOOTHING_TAU 시간 상수의 EWMA로 평활하고, 전체 속도는 루프백을 뺀 합계입니다.
+    """
+
+    def __init__(self, counters=psutil_net_bytes_pernic, links=None):
+        self._counters = counters
+        self._links = links if links is not None else LinkMonitor()
+        self._last_io = None     # first call takes the baseline on the collector thread
+        self._last_time = None
+        self._smoothed = {}      # name -> (upload, download)
+        self._last_traffic = {}  # name -> monotonic time of the last non-idle sample
+
+    def __call__(self):
+        current_time = time.monotonic()
+        current_io = self._counters()
+        if self._last_io is None:
+            self._last_io, self._last_time = current_io, current_time
+            return NetSample(0.0, 0.0)
+        time_delta = current_time - self._last_time
+        links = self._links.links(current_io.keys(), current_time)
+        alpha = 1 - math.exp(-time_delta / SMOOTHING_TAU) if time_delta > 0 else 0
+
+        upload_speed_mbps = 0
+        download_speed_mbps = 0
+        nics = []
+        for name, (bytes_sent, bytes_recv) in current_io.items():
+            last = self._last_io.get(name)
+            isup, link_mbps = links.get(name, (True, 0))
+            if last is None or time_delta <= 0 or is_loopback(name) or not isup:
+                continue
+            max_rate = link_mbps * 1e6 / 8 if link_mbps else WRAP_MAX_RATE
+            upload = (counter_delta(bytes_sent, last[0], time_delta, max_rate) * 8 / time_delta) / (1024**2)
+            download = (counter_delta(bytes_recv, last[1], time_delta, max_rate) * 8 / time_delta) / (1024**2)
+            if upload > ACTIVE_THRESHOLD_MBPS or download > ACTIVE_THRESHOLD_MBPS:
+                self._last_traffic[name] = current_time
+
+            previous = self._smoothed.get(name)
+            if previous is not None:
+                upload = previous[0] + alpha * (upload - previous[0])
+                download = previous[1] + alpha * (download - previous[1])
+            self._smoothed[name] = (upload, download)
+
+            active = current_time - self._last_traffic.get(name, -ACTIVE_HOLD) < ACTIVE_HOLD
+            nics.append(NicRate(name, upload, download, link_mbps, active))
+            upload_speed_mbps += upload
+            download_speed_mbps += download
+
+        # Forget interfaces that are gone (e.g. container veths) so the state does not grow.
+        for state in (self._smoothed, self._last_traffic):
+            for name in [name for name in state if name not in current_io]:
+                del state[name]
+
+        self._last_io = current_io
+        self._last_time = current_time
+        return NetSample(upload_speed_mbps, download_speed_mbps, tuple(nics))
+
+class DiskIoRateCollector:
+    """이전 호출 대비 장치별, 전체 디스크 읽기/쓰기 속도(MB/s)를 계산합니다.
+
+    counters는 장치 이름별 누적 (읽기, 쓰기) 바이트 딕셔너리를 반환하는 함수입니다.
+    전체 속도는 파티션을 중복해 세지 않도록 is_whole_disk인 장치만 더합니다.
+    inventory가 있으면 화면에 표시되는 장치의 속도만 devices에 담습니다.
+    """
+
+    def __init__(self, counters=psutil_disk_bytes_perdisk, whole_disk=is_whole_disk, inventory=None):
+        self._counters = counters
+        self._whole_disk = whole_disk
+        self._inventory = inventory
+        self._last_io = None  # first call takes the baseline (and enumerates disks) on the collector thread
+        self._last_time = None
+
+    def __call__(self):
+        current_time = time.monotonic()
+        current_io = self._counters()
+        if self._last_io is None:
+            self._last_io, self._last_time = current_io, current_time
+            if self._inventory is not None:
+                self._inventory.entries(current_io)
+            return DiskIoSample(0.0, 0.0)
+        time_delta = current_time - self._last_time
+        scale = 1 / (time_delta * 1024**2) if time_delta > 0 else 0
+
+        read_speed_mbps = 0
+        write_speed_mbps = 0
+        rates = {}
+        for name, (bytes_read, bytes_written) in current_io.items():
+            last = self._last_io.get(name)
+            if last is None:
+                continue  # device appeared since the last call
+            read_mbps = max(bytes_read - last[0], 0) * scale
+            write_mbps = max(bytes_written - last[1], 0) * scale
+            rates[name] = (read_mbps, write_mbps)
+            if self._whole_disk(name):
+                read_speed_mbps += read_mbps
+                write_speed_mbps += write_mbps
+
+        devices = ()
+        if self._inventory is not None:
+            devices = tuple(DiskRate(entry.io_name, *rates.get(entry.io_name, (0.0, 0.0)))
+                            for entry in self._inventory.entries(current_io)
+                            if entry.io_name is not None)
+
+        self._last_io = current_io
+        self._last_time = current_time
+        return DiskIoSample(read_speed_mbps, write_speed_mbps, devices)
+
+def make_volume_collector(inventory):
+    """마운트된 볼륨별 용량 수집 함수를 만듭니다. 볼륨이 없으면 None을 반환합니다."""
+    def collect_disk():
+        volumes = []
+        for entry in inventory.entries():
+            if entry.mountpoint is None:
+                continue
+            info = get_disk_info(entry.mountpoint)
+            if info is not None:
+                volumes.append(VolumeUsage(entry.mountpoint, entry.io_name,
+                                           info['percent'], info['used_gb'], info['total_gb']))
+        if not volumes:
+            return None
+        used = sum(v.used_gb for v in volumes)
+        total = sum(v.total_gb for v in volumes)
+        # Weight psutil's per-volume percent (which excludes reserved blocks) by size.
+        percent = sum(v.percent * v.total_gb for v in volumes) / total if total else 0
+        return DiskSample(percent, used, total, tuple(volumes))
+    return collect_disk
+
+# One metric per collector value; sample_metrics also emits per-core/GPU/NIC/device/mount ones
+# that match DETAIL_METRIC and come and go with the hardware (e.g. veth interfaces of containers).
+# The group name of a detail metric is its family.
+AGGREGATE_METRICS = frozenset(('cpu', 'ram', 'gpu', 'vram', 'net_up', 'net_down', 'disk_read', 'disk_write', 'disk_usage'))
+DETAIL_METRIC = re.compile(r'(?P<cores>cpu_core_\d+)|(?P<gpus>gpu\d+(?:_vram)?)|(?P<nics>net_(?:up|down)_.+)'
+                           r'|(?P<disks>disk_(?:read|write)_.+)|(?P<mounts>disk_usage_.+)')
+METRIC_FAMILIES = tuple(DETAIL_METRIC.groupindex)
+
+def is_metric_name(name):
+    """sample_metrics가 만들 수 있는 메트릭 이름이면 True."""
+    return name in AGGREGATE_METRICS or DETAIL_METRIC.fullmatch(name) is not None
+
+def metric_family(name):
+    """코어/GPU/NIC/디스크/마운트별 메트릭이면 그 종류('cores', 'gpus', 'nics', 'disks', 'mounts'), 아니면 None."""
+    if name in AGGREGATE_METRICS:
+        return None
+    match = DETAIL_METRIC.fullmatch(name)
+    return match.lastgroup if match else None
+
+class MetricBudget:
+    """코어/GPU/NIC/디스크/마운트별 메트릭을 종류마다 limit개까지만 받아들입니다. 집계 메트릭은 항상 받습니다.
+
+    한도를 넘은 종류는 owner 이름으로 stderr에 한 번 알립니다.
+    """
+
+    def __init__(self, limit, owner):
+        self.limit = limit
+        self.owner = owner
+        self._members = {}  # family -> set of admitted names
+        self._warned = set()
+
+    def __len__(self):
+        return sum(len(members) for members in self._members.values())
+
+    def admit(self, name):
+        family = metric_family(name)
+        if family is None:
+            return True
+        members = self._members.setdefault(family, set())
+        if name in members:
+            return True
+        if len(members) >= self.limit:
+            if family not in self._warned:
+                self._warned.add(family)
+                print(f"{self.owner}: {family} 메트릭이 {self.limit}개를 넘어 {name} 등은 기록하지 않습니다.",
+                      file=sys.stderr)
+            return False
+        members.add(name)
+        return True
+
+    def release(self, name):
+        family = metric_family(name)
+        if family is not None:
+            self._members.get(family, set()).discard(name)
+
+def sample_metrics(name, value):
+    """Collector 결과를 (메트릭 이름, 숫자 값) 쌍의 목록으로 평탄화합니다."""
+    if name == 'cpu':
+        metrics = [('cpu', value.total)]
+        metrics.extend((f'cpu_core_{i}', usage) for i, usage in enumerate(value.cores))
+        return metrics
+    if name == 'ram':
+        return [('ram', value.percent)]
+    if name == 'gpu':
+        metrics = [('gpu', value.percent), ('vram', value.vram_percent)]
+        for device in value.devices:
+            if device.error is None:
+                metrics.append((f'gpu{device.index}', device.percent))
+                metrics.append((f'gpu{device.index}_vram', device.vram_percent))
+        return metrics
+    if name == 'net':
+        metrics = [('net_up', value.upload_mbps), ('net_down', value.download_mbps)]
+        for nic in value.nics:
+            metrics.append((f'net_up_{nic.name}', nic.upload_mbps))
+            metrics.append((f'net_down_{nic.name}', nic.download_mbps))
+        return metrics
+    if name == 'disk_io':
+        metrics = [('disk_read', value.read_mbps), ('disk_write', value.write_mbps)]
+        for device in value.devices:
+            metrics.append((f'disk_read_{device.name}', device.read_mbps))
+            metrics.append((f'disk_write_{device.name}', device.write_mbps))
+        return metrics
+    if name == 'disk':
+        metrics = [('disk_usage', value.percent)]
+        metrics.extend((f'disk_usage_{volume.mountpoint}', volume.percent) for volume in value.volumes)
+        return metrics
+    return []
+
+def default_collectors(gpu_poller=None, use_procfs=True, processes=True):
+    """기본 Collector 목록을 반환합니다. 주기와 시간 제한은 초 단위입니다.
+
+    Linux에서는 /proc 직접 읽기 백엔드를 쓰고, 다른 플랫폼이나 use_procfs=False이면 psutil을 씁니다.
+    GPU Collector는 gpu_poller에 장치가 있거나 아직 초기화 중(init_async)일 때만 추가됩니다.
+    processes=False이면 상위 프로세스 스캐너를 넣지 않습니다. (예: 에이전트 모드)
+    """
+    procfs = open_procfs() if use_procfs else None
+    inventory = StorageInventory()
+    if procfs is not None:
+        cpu, ram = ProcCpuCollector(procfs), make_proc_ram_collector(procfs)
+        net = NetRateCollector(procfs.net_bytes_pernic)
+        disk_io = DiskIoRateCollector(procfs.disk_bytes_perdisk, procfs.is_whole_disk, inventory)
+    else:
+        cpu, ram = collect_cpu, collect_ram
+        net, disk_io = NetRateCollector(), DiskIoRateCollector(inventory=inventory)
+    collectors = [
+        Collector('cpu', cpu, interval=0.1, timeout=1.0),
+        Collector('ram', ram, interval=0.5, timeout=2.0),
+        Collector('net', net, interval=0.1, timeout=1.0),
+        Collector('disk_io', disk_io, interval=0.1, timeout=1.0),
+        Collector('disk', make_volume_collector(inventory), interval=30.0, timeout=10.0),
+    ]
+    if gpu_poller is not None and (gpu_poller.devices or not gpu_poller.ready.is_set()):
+        collectors.append(Collector('gpu', make_gpu_collector(gpu_poller), interval=0.5, timeout=2.0))
+    if processes:
+        # The scanner stretches its own cadence further on hosts with thousands of processes.
+        collectors.append(Collector('processes', ProcessScanner(start_delay=START_DELAY), interval=2.0, timeout=30.0))
+    return collectors
@@ -0,0 +1,254 @@
+"""OpenMetrics(Prometheus) 텍스트 형식의 HTTP 내보내기.
+
+응답은 스크레이프마다 수집하지 않고 Sampler가 마지막으로 게시한 Snapshot에서
+만듭니다. 본문은 Snapshot 세대(generation)마다 한 번만 렌더링해 캐시하므로 동시에
+여러 스크레이퍼가 붙어도 psutil/NVML 호출이나 문자열 생성이 늘지 않습니다.
+
+집계 모드의 스냅샷('호스트:Collector' 이름)은 host 레이블을 붙여 내보냅니다.
+"""
+import functools
+import math
+import sys
+import threading
+
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+DEFAULT_PORT = 9840
+PREFIX = 'hwmon_'
+
+MIB = 1024**2
+GIB = 1024**3
+
+# name -> (type, unit, help); output order follows this table.
+FAMILIES = {
+    'collector_up': ('gauge', None, "1 if the collector's last run succeeded."),
+    'collector_last_sample_timestamp_seconds': ('gauge', 'seconds', "Wall-clock time of the collector's last sample."),
+    'cpu_usage_percent': ('gauge', None, "Total CPU usage."),
+    'cpu_core_usage_percent': ('gauge', None, "Per-core CPU usage."),
+    'memory_usage_percent': ('gauge', None, "RAM usage."),
+    'memory_used_bytes': ('gauge', 'bytes', "RAM in use."),
+    'memory_total_bytes': ('gauge', 'bytes', "Total RAM."),
+    'gpu_usage_percent': ('gauge', None, "GPU utilization."),
+    'gpu_memory_usage_percent': ('gauge', None, "VRAM usage."),
+    'gpu_memory_used_bytes': ('gauge', 'bytes', "VRAM in use."),
+    'gpu_memory_total_bytes': ('gauge', 'bytes', "Total VRAM."),
+    'gpu_temperature_celsius': ('gauge', 'celsius', "GPU temperature."),
+    'gpu_power_watts': ('gauge', 'watts', "GPU power draw."),
+    'gpu_clock_hertz': ('gauge', 'hertz', "GPU graphics clock."),
+    'network_transmit_bytes_per_second': ('gauge', 'bytes_per_second', "Upload rate, all non-loopback interfaces."),
+    'network_receive_bytes_per_second': ('gauge', 'bytes_per_second', "Download rate, all non-loopback interfaces."),
+    'network_interface_transmit_bytes_per_second': ('gauge', 'bytes_per_second', "Per-interface upload rate."),
+    'network_interface_receive_bytes_per_second': ('gauge', 'bytes_per_second', "Per-interface download rate."),
+    'network_interface_active': ('gauge', None, "1 if the interface carried traffic recently."),
+    'disk_read_bytes_per_second': ('gauge', 'bytes_per_second', "Read rate, whole disks."),
+    'disk_write_bytes_per_second': ('gauge', 'bytes_per_second', "Write rate, whole disks."),
+    'disk_device_read_bytes_per_second': ('gauge', 'bytes_per_second', "Per-device read rate."),
+    'disk_device_write_bytes_per_second': ('gauge', 'bytes_per_second', "Per-device write rate."),
+    'disk_usage_percent': ('gauge', None, "Filesystem usage."),
+    'disk_used_bytes': ('gauge', 'bytes', "Filesystem space in use."),
+    'disk_total_bytes': ('gauge', 'bytes', "Filesystem size."),
+}
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value):
+    if not math.isfinite(value):
+        return 'NaN' if value != value else ('+Inf' if value > 0 else '-Inf')
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _collector_series(name, value):
+    """Collector 값을 (패밀리, 레이블 딕셔너리, 값) 목록으로 바꿉니다."""
+    if name == 'cpu':
+        series = [('cpu_usage_percent', {}, value.total)]
+        series.extend(('cpu_core_usage_percent', {'core': i}, usage) for i, usage in enumerate(value.cores))
+        return series
+    if name == 'ram':
+        return [('memory_usage_percent', {}, value.percent),
+                ('memory_used_bytes', {}, value.used_gb * GIB),
+                ('memory_total_bytes', {}, value.total_gb * GIB)]
+    if name == 'gpu':
+        series = []
+        for device in value.devices:
+            labels = {'gpu': device.index, 'name': device.name}
+            for family, attr, scale in (('gpu_usage_percent', 'percent', 1),
+                                        ('gpu_memory_usage_percent', 'vram_percent', 1),
+                                        ('gpu_memory_used_bytes', 'vram_used_mb', MIB),
+                                        ('gpu_memory_total_bytes', 'vram_total_mb', MIB),
+                                        ('gpu_temperature_celsius', 'temperature_c', 1),
+                                        ('gpu_power_watts', 'power_w', 1),
+                                        ('gpu_clock_hertz', 'clock_mhz', 1e6)):
+                reading = getattr(device, attr)
+                if reading is not None:
+                    series.append((family, labels, reading * scale))
+        if not value.devices:
+            series = [('gpu_usage_percent', {'gpu': 'all'}, value.percent),
+                      ('gpu_memory_usage_percent', {'gpu': 'all'}, value.vram_percent),
+                      ('gpu_memory_used_bytes', {'gpu': 'all'}, value.vram_used_mb * MIB),
+                      ('gpu_memory_total_bytes', {'gpu': 'all'}, value.vram_total_mb * MIB)]
+        return series
+    if name == 'net':
+        # The UI's "Mbps" is bits / 2**20 per second.
+        series = [('network_transmit_bytes_per_second', {}, value.upload_mbps * MIB / 8),
+                  ('network_receive_bytes_per_second', {}, value.download_mbps * MIB / 8)]
+        for nic in value.nics:
+            labels = {'interface': nic.name}
+            series.append(('network_interface_transmit_bytes_per_second', labels, nic.upload_mbps * MIB / 8))
+            series.append(('network_interface_receive_bytes_per_second', labels, nic.download_mbps * MIB / 8))
+            series.append(('network_interface_active', labels, 1 if nic.active else 0))
+        return series
+    if name == 'disk_io':
+        series = [('disk_read_bytes_per_second', {}, value.read_mbps * MIB),
+                  ('disk_write_bytes_per_second', {}, value.write_mbps * MIB)]
+        for device in value.devices:
+            labels = {'device': device.name}
+            series.append(('disk_device_read_bytes_per_second', labels, device.read_mbps * MIB))
+            series.append(('disk_device_write_bytes_per_second', labels, device.write_mbps * MIB))
+        return series
+    if name == 'disk':
+        volumes = value.volumes or ()
+        if not volumes:
+            return [('disk_usage_percent', {'mountpoint': 'all'}, value.percent),
+                    ('disk_used_bytes', {'mountpoint': 'all'}, value.used_gb * GIB),
+                    ('disk_total_bytes', {'mountpoint': 'all'}, value.total_gb * GIB)]
+        series = []
+        for volume in volumes:
+            labels = {'mountpoint': volume.mountpoint}
+            series.append(('disk_usage_percent', labels, volume.percent))
+            series.append(('disk_used_bytes', labels, volume.used_gb * GIB))
+            series.append(('disk_total_bytes', labels, volume.total_gb * GIB))
+        return series
+    return []
+
+
+def render_openmetrics(snapshot):
+    """Snapshot 전체를 OpenMetrics 텍스트(bytes)로 렌더링합니다."""
+    families = {family: [] for family in FAMILIES}
+    for key, sample in sorted(snapshot.samples.items()):
+        host, _, name = key.rpartition(':')
+        base_labels = {'host': host} if host else {}
+        collector_labels = dict(base_labels, collector=name)
+        families['collector_up'].append((collector_labels, 1 if sample.error is None else 0))
+        families['collector_last_sample_timestamp_seconds'].append((collector_labels, sample.timestamp))
+        if sample.value is None:
+            continue
+        for family, labels, value in _collector_series(name, sample.value):
+            families[family].append((dict(base_labels, **labels) if base_labels else labels, value))
+
+    lines = []
+    for family, series in families.items():
+        if not series:
+            continue
+        metric_type, unit, help_text = FAMILIES[family]
+        full_name = PREFIX + family
+        lines.append(f"# TYPE {full_name} {metric_type}")
+        if unit:
+            lines.append(f"# UNIT {full_name} {unit}")
+        lines.append(f"# HELP {full_name} {help_text}")
+        for labels, value in series:
+            if labels:
+                label_text = ','.join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                lines.append(f"{full_name}{{{label_text}}} {_format_value(value)}")
+            else:
+                lines.append(f"{full_name} {_format_value(value)}")
+    lines.append("# EOF\n")
+    return '\n'.join(lines).encode('utf-8')
+
+
+class MetricsCache:
+    """Snapshot 세대마다 한 번만 렌더링한 본문(일반, gzip)을 보관합니다."""
+
+    def __init__(self, sampler):
+        self.sampler = sampler
+        self.renders = 0
+        self._lock = threading.Lock()
+        self._generation = None
+        self._body = b''
+        self._gzip_body = None
+
+    def body(self, compressed=False):
+        """최신 스냅샷의 본문을 반환합니다. 여러 스레드가 동시에 불러도 렌더링은 한 번입니다."""
+        snapshot = self.sampler.snapshot
+        with self._lock:
+            if snapshot.generation != self._generation:
+                self._body = render_openmetrics(snapshot)
+                self._gzip_body = None
+                self._generation = snapshot.generation
+                self.renders += 1
+            if not compressed:
+                return self._body
+            if self._gzip_body is None:
+                import gzip
+                self._gzip_body = gzip.compress(self._body, compresslevel=1)
+            return self._gzip_body
+
+
+@functools.lru_cache(maxsize=None)
+def _server_classes():
+    """HTTP 서버와 핸들러 클래스를 만듭니다. http.server는 가져오는 데 수십 ms가 걸려 --metrics를 쓸 때만 가져옵니다."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive for repeated scrapes
+        disable_nagle_algorithm = True  # headers and body are separate writes; avoid the delayed-ACK stall
+
+        def do_GET(self):
+            if self.path.split('?', 1)[0] not in ('/metrics', '/'):
+                self.send_error(404)
+                return
+            compressed = 'gzip' in self.headers.get('Accept-Encoding', '')
+            body = self.server.cache.body(compressed)
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            if compressed:
+                self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # scrapes are too frequent to log
+
+    class MetricsHttpServer(ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = 128  # many scrapers connecting at once must not overflow the listen backlog
+
+    return MetricsHttpServer, MetricsHandler
+
+
+class MetricsServer:
+    """sampler(snapshot 속성을 가진 객체)의 최신 값을 /metrics로 내보내는 백그라운드 HTTP 서버."""
+
+    def __init__(self, sampler, address=('127.0.0.1', DEFAULT_PORT)):
+        self.cache = MetricsCache(sampler)
+        server_class, handler_class = _server_classes()
+        self._server = server_class(address, handler_class)
+        self._server.cache = self.cache
+        self.address = self._server.server_address
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join(1.0)
+
+
+def start_metrics_server(sampler, address):
+    """MetricsServer를 시작합니다. 포트를 열 수 없으면 경고만 출력하고 None을 반환합니다."""
+    try:
+        server = MetricsServer(sampler, address)
+    except OSError as e:
+        print(f"메트릭 서버를 시작할 수 없습니다 ({address[0]}:{address[1]}): {e}", file=sys.stderr)
+        return None
+    server.start()
+    print(f"메트릭: http://{server.address[0]}:{server.address[1]}/metrics")
+    return server
@@ -0,0 +1,74 @@
+"""게이지 도형 캐시.
+
+호(arc)와 원은 num_segments=0으로 그려 ImGui가 내부에 미리 계산해 둔 단위 원
+테이블(ArcFastVtx)과 반지름별 세그먼트 수 캐시를 쓰게 합니다. 128 세그먼트로
+sin/cos를 매번 다시 계산하는 것보다 빠르고 정점 수도 적습니다.
+
+파이썬 쪽에서 미리 만든 정점 목록을 add_polyline으로 넘기는 방식은 pyimgui에서
+리스트 변환 비용 때문에 오히려 느립니다. 호의 각도는 곱셈 한 번이라 매번 계산하고,
+캐시에는 텍스트 크기만 보관합니다. 창 크기가 바뀔 때만 비웁니다.
+"""
+import math
+
+import imgui
+
+# Arc lengths are quantized to 1/ARC_STEPS of the full sweep (0.5%).
+ARC_STEPS = 200
+TEXT_CACHE_LIMIT = 1024
+
+TOP_ANGLE = -math.pi / 2
+FULL_TURN = 2 * math.pi
+HALF_TURN = math.pi
+
+
+class GeometryCache:
+    """imgui.calc_text_size 결과를 문자열별로 캐시합니다."""
+
+    def __init__(self):
+        self._size = None
+        self._text_sizes = {}
+
+    def invalidate(self):
+        self._text_sizes.clear()
+
+    def update_window_size(self, width, height):
+        """창 크기가 바뀐 경우에만 캐시를 비웁니다."""
+        if self._size != (width, height):
+            self._size = (width, height)
+            self.invalidate()
+
+    def text_size(self, text):
+        """imgui.calc_text_size 결과를 캐시합니다. 폰트가 바뀌면 invalidate()해야 합니다."""
+        size = self._text_sizes.get(text)
+        if size is None:
+            if len(self._text_sizes) >= TEXT_CACHE_LIMIT:
+                self._text_sizes.clear()
+            size = self._text_sizes[text] = imgui.calc_text_size(text)
+        return size
+
+
+def arc_angles(start_angle, sweep, percent):
+    """start_angle에서 sweep * percent/100 만큼의 호 각도 (a_min, a_max)를 반환합니다.
+
+    sweep이 음수이면 반시계 방향입니다. 그릴 것이 없으면 None을 반환합니다.
+    """
+    steps = int(min(max(percent, 0), 100) * ARC_STEPS / 100)
+    if steps == 0:
+        return None
+    end_angle = start_angle + sweep * steps / ARC_STEPS
+    return (start_angle, end_angle) if sweep >= 0 else (end_angle, start_angle)
+
+
+def disc_radius(radius, percent):
+    """percent에 비례하는 내부 원의 반지름을 양자화해 반환합니다."""
+    return radius * int(min(max(percent, 0), 100) * ARC_STEPS / 100) / ARC_STEPS
+
+
+def stroke_arc(draw_list, cx, cy, radius, angles, color, thickness):
+    """캐시된 각도의 호를 하나의 경로로 그립니다."""
+    draw_list.path_clear()
+    draw_list.path_arc_to(cx, cy, radius, angles[0], angles[1], num_segments=0)
+    draw_list.path_stroke(color, thickness=thickness)
+
+
+gauge_geometry = GeometryCache()
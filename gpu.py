@@ -0,0 +1,141 @@
+"""NVML 기반 다중 GPU 수집.
+
+NvmlPoller는 초기화 시 모든 장치를 한 번만 열거해 핸들을 캐시하고, 한 번의
+폴링 패스에서 장치별 사용률, 메모리, 온도, 전력, 클럭을 모두 읽습니다.
+오류가 난 장치는 지수 백오프로 재시도 간격을 늘립니다. nvml 인자로 pynvml과
+같은 인터페이스의 가짜 모듈을 넘겨 GPU 없이도 시험할 수 있습니다.
+"""
+import sys
+import threading
+import time
+from collections import namedtuple
+
+GpuDeviceSample = namedtuple('GpuDeviceSample', [
+    'index', 'name', 'percent', 'vram_percent', 'vram_used_mb', 'vram_total_mb',
+    'temperature_c', 'power_w', 'clock_mhz', 'error',
+])
+
+BACKOFF_INITIAL = 1.0
+BACKOFF_MAX = 60.0
+
+
+class _Device:
+    def __init__(self, index, handle, name):
+        self.index = index
+        self.handle = handle
+        self.name = name
+        self.failures = 0
+        self.retry_at = 0.0
+        self.last_sample = None
+        self.unsupported = set()  # optional queries the device does not support
+
+
+class NvmlPoller:
+    """모든 NVIDIA GPU를 한 번의 패스로 폴링합니다."""
+
+    def __init__(self, nvml=None):
+        self.nvml = nvml  # pynvml is imported by init(), off the startup path
+        self.devices = []
+        self.initialized = False
+        self.ready = threading.Event()  # init()이 끝나면 성공 여부와 관계없이 설정됩니다.
+        self._init_thread = None
+
+    def init_async(self):
+        """init()을 백그라운드 스레드에서 실행합니다. 끝나면 ready가 설정됩니다."""
+        self._init_thread = threading.Thread(target=self.init, name="nvml-init", daemon=True)
+        self._init_thread.start()
+
+    def init(self):
+        """NVML을 초기화하고 장치를 열거합니다. 성공하면 장치 수를 반환합니다."""
+        try:
+            return self._init()
+        finally:
+            self.ready.set()
+
+    def _init(self):
+        if self.nvml is None:
+            try:
+                import pynvml
+            except ImportError as error:
+                print(f"pynvml을 가져올 수 없습니다: {error}. GPU 모니터링이 비활성화됩니다.", file=sys.stderr)
+                return 0
+            self.nvml = pynvml
+        nvml = self.nvml
+        try:
+            nvml.nvmlInit()
+            self.initialized = True
+            count = nvml.nvmlDeviceGetCount()
+        except nvml.NVMLError as error:
+            print(f"NVML 초기화 오류: {error}", file=sys.stderr)
+            print("NVIDIA 드라이버가 설치되어 있는지 확인하세요. GPU 모니터링이 비활성화됩니다.", file=sys.stderr)
+            return 0
+
+        for index in range(count):
+            try:
+                handle = nvml.nvmlDeviceGetHandleByIndex(index)
+                name = nvml.nvmlDeviceGetName(handle)
+                if isinstance(name, bytes):
+                    name = name.decode('utf-8', 'replace')
+            except nvml.NVMLError as error:
+                print(f"GPU {index} 핸들을 가져올 수 없습니다: {error}", file=sys.stderr)
+                continue
+            self.devices.append(_Device(index, handle, name))
+
+        print(f"NVML 초기화 성공. GPU {len(self.devices)}개")
+        return len(self.devices)
+
+    def shutdown(self):
+        if self._init_thread is not None:
+            self._init_thread.join(1.0)
+        if self.initialized:
+            self.nvml.nvmlShutdown()
+            self.initialized = False
+
+    def _optional(self, device, key, query):
+        """지원하지 않는 장치에서는 다시 묻지 않는 선택적 쿼리."""
+        if key in device.unsupported:
+            return None
+        try:
+            return query()
+        except self.nvml.NVMLError_NotSupported:
+            device.unsupported.add(key)
+            return None
+
+    def _query(self, device):
+        nvml = self.nvml
+        handle = device.handle
+        utilization = nvml.nvmlDeviceGetUtilizationRates(handle)
+        memory = nvml.nvmlDeviceGetMemoryInfo(handle)
+        temperature = self._optional(device, 'temperature',
+                                     lambda: nvml.nvmlDeviceGetTemperature(handle, nvml.NVML_TEMPERATURE_GPU))
+        power = self._optional(device, 'power', lambda: nvml.nvmlDeviceGetPowerUsage(handle) / 1000.0)
+        clock = self._optional(device, 'clock', lambda: nvml.nvmlDeviceGetClockInfo(handle, nvml.NVML_CLOCK_GRAPHICS))
+        return GpuDeviceSample(
+            device.index, device.name,
+            utilization.gpu,
+            (memory.used / memory.total) * 100 if memory.total else 0,
+            memory.used / (1024**2),
+            memory.total / (1024**2),
+            temperature, power, clock, None,
+        )
+
+    def poll(self, now=None):
+        """장치별 GpuDeviceSample 튜플을 반환합니다. 실패한 장치는 error가 채워집니다."""
+        now = time.monotonic() if now is None else now
+        samples = []
+        for device in self.devices:
+            if now < device.retry_at:
+                samples.append(device.last_sample)
+                continue
+            try:
+                sample = self._query(device)
+                device.failures = 0
+            except self.nvml.NVMLError as error:
+                device.failures += 1
+                backoff = min(BACKOFF_INITIAL * 2 ** (device.failures - 1), BACKOFF_MAX)
+                device.retry_at = now + backoff
+                sample = GpuDeviceSample(device.index, device.name, None, None, None, None,
+                                         None, None, None, str(error))
+            device.last_sample = sample
+            samples.append(sample)
+        return tuple(samples)
@@ -0,0 +1,109 @@
+"""고정 크기 링 버퍼 기반 메트릭 히스토리."""
+import math
+from array import array
+
+from collectors import MetricBudget, metric_family, sample_metrics
+
+MAX_DETAIL_METRICS = 1024  # 코어/GPU/NIC/디스크/마운트별 메트릭은 종류마다 이 개수까지만 기록합니다. (집계 메트릭은 항상)
+IDLE_SECONDS = 600.0       # 이만큼 샘플이 없던 코어/NIC/장치/마운트별 버퍼는 버립니다.
+SWEEP_INTERVAL = 60.0
+
+
+class RingBuffer:
+    """array('f') 기반 고정 크기 링 버퍼. append는 O(1)이며 메모리는 늘어나지 않습니다.
+
+    쓰기는 한 스레드(샘플러 게시 락)에서만 일어난다고 가정합니다. 읽는 쪽은 락 없이
+    읽으므로 쓰기와 겹치면 가장 최근 한 점이 어긋날 수 있지만 그래프 표시에는 무해합니다.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._data = array('f', bytes(4 * capacity))
+        self._head = 0  # 다음에 쓸 위치
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, value):
+        self._data[self._head] = value
+        self._head = (self._head + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def latest(self, default=0.0):
+        if self._count == 0:
+            return default
+        return self._data[self._head - 1]
+
+    def values(self, count=None):
+        """오래된 것부터 최신 순으로 최대 count개의 값을 array로 반환합니다."""
+        head, available = self._head, self._count
+        if count is None or count > available:
+            count = available
+        start = head - count
+        if start >= 0:
+            return self._data[start:head]
+        return self._data[start:] + self._data[:head]
+
+
+class MetricHistory:
+    """메트릭 이름별 RingBuffer 모음. Sampler 리스너로 등록해 사용합니다.
+
+    집계 메트릭 외의 버퍼는 종류(코어, NIC 등)마다 max_detail개까지만 두고, idle_seconds 동안 샘플이 없던 것은
+    버리므로 인터페이스가 생겼다 사라져도 메모리는 늘지 않습니다.
+    """
+
+    def __init__(self, capacity=600, max_detail=MAX_DETAIL_METRICS, idle_seconds=IDLE_SECONDS):
+        self.capacity = capacity
+        self.max_detail = max_detail
+        self.idle_seconds = idle_seconds
+        self._buffers = {}
+        self._details = {}  # detail metric name -> timestamp of its last sample
+        self._budget = MetricBudget(max_detail, "히스토리")
+        self._swept = -math.inf
+
+    def __contains__(self, name):
+        return name in self._buffers
+
+    def buffer(self, name):
+        """이름에 해당하는 버퍼를 반환합니다. 없으면 새로 만듭니다."""
+        ring = self._buffers.get(name)
+        if ring is None:
+            ring = self._buffers[name] = RingBuffer(self.capacity)
+        return ring
+
+    def names(self):
+        return list(self._buffers)
+
+    def memory_bytes(self):
+        return len(self._buffers) * self.capacity * 4
+
+    def sweep(self, now):
+        """now 기준 idle_seconds 동안 샘플이 없던 코어/NIC/장치/마운트별 버퍼를 버립니다."""
+        self._swept = now
+        cutoff = now - self.idle_seconds
+        for metric in [metric for metric, updated in self._details.items() if updated < cutoff]:
+            del self._details[metric]
+            self._budget.release(metric)
+            self._buffers.pop(metric, None)
+
+    def on_sample(self, name, sample, snapshot):
+        """Sampler.add_listener에 등록할 콜백입니다."""
+        if sample.error is not None or sample.value is None:
+            return
+        timestamp = sample.timestamp
+        buffers, details = self._buffers, self._details
+        for metric, value in sample_metrics(name, sample.value):
+            if metric in details:
+                details[metric] = timestamp
+            elif metric_family(metric) is not None:
+                if not self._budget.admit(metric):
+                    continue  # this family is full until sweep() drops an idle one
+                details[metric] = timestamp
+            ring = buffers.get(metric)
+            if ring is None:
+                ring = buffers[metric] = RingBuffer(self.capacity)
+            ring.append(value)
+        if not self._swept <= timestamp < self._swept + SWEEP_INTERVAL:
+            self.sweep(timestamp)
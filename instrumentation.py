@@ -0,0 +1,327 @@
+"""모니터 자체의 계측: 구간별 소요 시간 히스토그램과 프로파일러 훅.
+
+구간 시간은 로그 눈금 버킷을 가진 고정 크기 히스토그램에 쌓이고, 최근 window개
+값에 대한 백분위수를 계산합니다. 그리기 함수와 Collector 함수는 계측을 켤 때만
+시간 측정 래퍼로 바꾸므로 꺼져 있을 때는 비용이 없습니다.
+"""
+import os
+import sys
+import threading
+import time
+from array import array
+from collections import Counter
+
+SUB_BITS = 4                     # 2**SUB_BITS sub-buckets per power of two (~6% resolution)
+SUB_COUNT = 1 << SUB_BITS
+MAX_SHIFT = 32                   # values beyond ~2**36 ns (~70 s) land in the last bucket
+BUCKET_COUNT = (MAX_SHIFT + 2) * SUB_COUNT
+DEFAULT_WINDOW = 1024
+SUMMARY_QUANTILES = (0.5, 0.9, 0.99)
+SUMMARY_REFRESH = 0.5            # 오버레이 요약을 다시 계산하는 최소 간격 (초)
+
+
+def bucket_index(ns):
+    """나노초 값을 로그 눈금 버킷 번호로 바꿉니다. 작은 값은 1ns 단위 그대로입니다."""
+    if ns < 2 * SUB_COUNT:
+        return max(ns, 0)
+    shift = ns.bit_length() - (SUB_BITS + 1)
+    if shift > MAX_SHIFT:
+        return BUCKET_COUNT - 1
+    return shift * SUB_COUNT + (ns >> shift)
+
+
+def bucket_upper(index):
+    """버킷에 들어가는 가장 큰 나노초 값."""
+    if index < 2 * SUB_COUNT:
+        return index
+    shift = index // SUB_COUNT - 1
+    top = index - shift * SUB_COUNT
+    return ((top + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """최근 window개 값의 분포를 유지하는 고정 크기 히스토그램.
+
+    버킷 번호를 링 버퍼에 함께 보관해, 새 값이 들어오면 가장 오래된 값을 빼는 방식으로
+    메모리와 기록 비용이 일정합니다. 기록은 한 스레드에서만 한다고 가정합니다.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = window
+        self.total = 0
+        self._counts = array('I', bytes(4 * BUCKET_COUNT))
+        self._ring = array('H', bytes(2 * window))
+        self._sum_ns = 0
+        self._values = array('q', bytes(8 * window))
+
+    def __len__(self):
+        return min(self.total, self.window)
+
+    def record(self, ns):
+        total = self.total
+        slot = total % self.window
+        counts, values = self._counts, self._values
+        if total >= self.window:
+            counts[self._ring[slot]] -= 1
+            self._sum_ns -= values[slot]
+        # bucket_index() inlined; this runs several times per frame.
+        if ns < 2 * SUB_COUNT:
+            index = max(ns, 0)
+        else:
+            shift = ns.bit_length() - (SUB_BITS + 1)
+            index = shift * SUB_COUNT + (ns >> shift) if shift <= MAX_SHIFT else BUCKET_COUNT - 1
+        counts[index] += 1
+        self._ring[slot] = index
+        values[slot] = ns
+        self._sum_ns += ns
+        self.total = total + 1
+
+    def mean_ns(self):
+        count = len(self)
+        return self._sum_ns / count if count else 0.0
+
+    def quantiles(self, quantiles):
+        """오름차순 quantiles(0~1)에 해당하는 값(ns, 버킷 상한)의 목록을 한 번의 순회로 구합니다."""
+        count = len(self)
+        if count == 0:
+            return [0] * len(quantiles)
+        targets = [max(int(q * count + 0.999999), 1) for q in quantiles]
+        results = []
+        seen = 0
+        for index, bucket in enumerate(self._counts):
+            if not bucket:
+                continue
+            seen += bucket
+            while len(results) < len(targets) and seen >= targets[len(results)]:
+                results.append(bucket_upper(index))
+            if len(results) == len(targets):
+                break
+        return results
+
+    def max_ns(self):
+        for index in range(BUCKET_COUNT - 1, -1, -1):
+            if self._counts[index]:
+                return bucket_upper(index)
+        return 0
+
+
+class FrameStats:
+    """구간 이름별 LatencyHistogram 모음과 프레임 구간 측정기.
+
+    메인 루프는 start_frame() 뒤에 lap(이름)으로 직전 lap 이후의 시간을 기록하고,
+    end_frame()으로 프레임 전체 시간을 'frame'에 기록합니다.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = window
+        self.histograms = {}
+        self.instrumented = False
+        self._frame_start = 0
+        self._lap_start = 0
+        self._summary = {}
+        self._summary_time = 0.0
+
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram(self.window)
+        return histogram
+
+    def record(self, name, ns):
+        self.histogram(name).record(ns)
+
+    def start_frame(self):
+        self._frame_start = self._lap_start = time.perf_counter_ns()
+
+    def lap(self, name):
+        now = time.perf_counter_ns()
+        self.histogram(name).record(now - self._lap_start)
+        self._lap_start = now
+
+    def end_frame(self):
+        self.histogram('frame').record(time.perf_counter_ns() - self._frame_start)
+
+    def summary(self, max_age=0.0):
+        """{이름: {count, mean_ms, p50_ms, p90_ms, p99_ms, max_ms}}. max_age초 안에 만든 요약은 재사용합니다."""
+        now = time.monotonic()
+        if max_age and now - self._summary_time < max_age:
+            return self._summary
+        summary = {}
+        for name, histogram in sorted(self.histograms.items()):
+            if not histogram.total:
+                continue
+            p50, p90, p99 = histogram.quantiles(SUMMARY_QUANTILES)
+            summary[name] = {
+                'count': histogram.total,
+                'mean_ms': histogram.mean_ns() / 1e6,
+                'p50_ms': p50 / 1e6,
+                'p90_ms': p90 / 1e6,
+                'p99_ms': p99 / 1e6,
+                'max_ms': histogram.max_ns() / 1e6,
+            }
+        self._summary = summary
+        self._summary_time = now
+        return summary
+
+
+def timed(func, histogram):
+    """func 호출 시간을 histogram에 기록하는 래퍼를 반환합니다."""
+    perf_counter_ns = time.perf_counter_ns
+
+    def wrapper(*args, **kwargs):
+        started = perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            histogram.record(perf_counter_ns() - started)
+    wrapper.__wrapped__ = func
+    wrapper.__name__ = getattr(func, '__name__', 'wrapper')
+    return wrapper
+
+
+def instrument_functions(namespace, names, stats):
+    """namespace(모듈 globals)의 함수들을 시간 측정 래퍼로 바꿉니다. 이미 바뀐 함수는 건너뜁니다."""
+    for name in names:
+        func = namespace.get(name)
+        if func is not None and not hasattr(func, '__wrapped__'):
+            namespace[name] = timed(func, stats.histogram(f"draw:{name}"))
+
+
+def instrument_collectors(collectors, stats):
+    """Collector 함수의 호출 시간을 'collector:이름'으로 기록합니다. Collector 스레드마다 히스토그램이 따로입니다."""
+    for collector in collectors:
+        if not hasattr(collector.func, '__wrapped__'):
+            collector.func = timed(collector.func, stats.histogram(f"collector:{collector.name}"))
+
+
+class StatsDumper:
+    """interval초마다 요약 한 줄을 출력하고, path가 있으면 JSON으로 저장합니다."""
+
+    def __init__(self, stats, interval=10.0, path=None, stream=None):
+        self.stats = stats
+        self.interval = interval
+        self.path = path
+        self.stream = stream  # None: sys.stdout at print time (offscreen output may redirect it)
+        self._next = time.monotonic() + interval
+
+    def maybe_dump(self, now=None):
+        now = time.monotonic() if now is None else now
+        if now < self._next:
+            return
+        self._next = now + self.interval
+        self.dump()
+
+    def dump(self):
+        summary = self.stats.summary()
+        if not summary:
+            return
+        frame = summary.get('frame')
+        slowest = sorted((item for item in summary.items() if item[0] != 'frame'),
+                         key=lambda item: item[1]['p99_ms'], reverse=True)[:5]
+        parts = [f"frame p50 {frame['p50_ms']:.2f} p99 {frame['p99_ms']:.2f} ms"] if frame else []
+        parts.extend(f"{name} p99 {values['p99_ms']:.2f}" for name, values in slowest)
+        print("stats: " + " | ".join(parts), file=self.stream or sys.stdout)
+        if self.path:
+            import json
+            payload = {'time': time.time(), 'window': self.stats.window, 'sections': summary}
+            temp_path = self.path + '.tmp'
+            try:
+                with open(temp_path, 'w') as f:
+                    json.dump(payload, f, indent=1)
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                print(f"통계 파일을 쓸 수 없습니다 ({self.path}): {e}", file=sys.stderr)
+
+
+class SamplingProfiler:
+    """대상 스레드의 호출 스택을 interval초마다 모아 collapsed stack 형식으로 저장합니다.
+
+    출력은 flamegraph.pl이나 speedscope에서 바로 열 수 있습니다.
+    """
+
+    def __init__(self, thread_id=None, interval=0.001):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def enable(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def disable(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def write(self, path):
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class FrameProfileHook:
+    """다음 frames개 프레임 동안 cProfile 또는 샘플링 프로파일러를 켜고 결과를 파일로 씁니다.
+
+    cProfile은 메인 스레드만 측정합니다. Collector 스레드 비용은 계측 히스토그램을 보세요.
+    """
+
+    def __init__(self, mode='cprofile', frames=300, path=None):
+        if mode not in ('cprofile', 'sample'):
+            raise ValueError(f"알 수 없는 프로파일러: {mode}")
+        self.mode = mode
+        self.frames = frames
+        self.path = path or time.strftime(f"hwmon-%Y%m%d-%H%M%S.{'prof' if mode == 'cprofile' else 'folded'}")
+        self.remaining = frames
+        self.done = False
+        self._profiler = None
+
+    def begin_frame(self):
+        if self.done:
+            return
+        if self._profiler is None:
+            if self.mode == 'cprofile':
+                import cProfile
+                self._profiler = cProfile.Profile()
+            else:
+                self._profiler = SamplingProfiler()
+            self._profiler.enable()
+            print(f"프로파일링 시작: {self.mode}, {self.frames} 프레임")
+
+    def end_frame(self):
+        if self.done or self._profiler is None:
+            return
+        self.remaining -= 1
+        if self.remaining <= 0:
+            self.finish()
+
+    def finish(self):
+        """프로파일러를 끄고 결과를 저장합니다. cProfile이면 누적 시간 상위 15개를 출력합니다."""
+        if self.done or self._profiler is None:
+            return
+        self.done = True
+        self._profiler.disable()
+        try:
+            if self.mode == 'cprofile':
+                import pstats
+                self._profiler.dump_stats(self.path)
+                pstats.Stats(self._profiler).sort_stats('cumulative').print_stats(15)
+            else:
+                self._profiler.write(self.path)
+            print(f"프로파일 저장: {self.path} ({self.frames - self.remaining} 프레임)")
+        except OSError as e:
+            print(f"프로파일을 저장할 수 없습니다 ({self.path}): {e}", file=sys.stderr)
@@ -0,0 +1,322 @@
+"""설정 파일(TOML/JSON)로 선언하는 대시보드 레이아웃 엔진.
+
+레이아웃은 가로로 나란히 놓이는 그룹의 목록입니다. 그룹마다 게이지 줄에 왼쪽부터
+놓일 위젯과 그 위에 그룹 폭만큼 펼쳐지는 히스토리 그래프를 선언하고, 위젯이 표시할
+값은 'collector.field' 형식의 바인딩으로 연결합니다.
+
+LayoutEngine은 창 크기, 설정, 위젯 모양(예: GPU 수에 따라 스트립을 보일지)이 바뀔
+때만 위치를 계산하고, 그 결과를 위치가 고정된 그리기 호출의 평평한 목록으로 캐시해
+프레임마다 그대로 실행합니다. 설정 파일은 바뀌면 다시 읽습니다.
+"""
+import os
+import string
+import sys
+import time
+from collections import namedtuple
+from numbers import Real
+from operator import attrgetter
+
+from collectors import CpuSample, DiskIoSample, DiskSample, GpuSample, NetSample, RamSample
+from processes import TopProcesses
+
+Rect = namedtuple('Rect', ['x', 'y', 'width', 'height'])
+Layout = namedtuple('Layout', ['gauge_radius', 'graph_top', 'graph_gap', 'groups'])
+Group = namedtuple('Group', ['name', 'widgets', 'graph'])
+
+# gauge_radius: min(창 너비, 높이)에 대한 비율, graph_top/graph_gap: 그래프 위쪽 여백과 게이지와의 간격 (px)
+LAYOUT_OPTIONS = {'gauge_radius': 0.25, 'graph_top': 10, 'graph_gap': 30}
+RELOAD_INTERVAL = 1.0  # 설정 파일 변경을 확인하는 최소 간격 (초)
+
+# Collector name -> value type; bindings are checked against these fields when the layout is loaded.
+SAMPLE_TYPES = {
+    'cpu': CpuSample,
+    'ram': RamSample,
+    'gpu': GpuSample,
+    'net': NetSample,
+    'disk_io': DiskIoSample,
+    'disk': DiskSample,
+    'processes': TopProcesses,
+}
+
+
+def _split_binding(path):
+    if not isinstance(path, str):
+        raise ValueError(f"바인딩은 'collector.field' 문자열이어야 합니다: {path!r}")
+    name, _, field = path.partition('.')
+    sample_type = SAMPLE_TYPES.get(name)
+    if sample_type is None:
+        raise ValueError(f"알 수 없는 Collector: {name!r} (가능: {', '.join(SAMPLE_TYPES)})")
+    if field and field not in sample_type._fields:
+        raise ValueError(f"{name}에 없는 필드: {field!r} (가능: {', '.join(sample_type._fields)})")
+    return name, field
+
+
+def binding(path, default=0):
+    """'collector.field' 또는 'collector' 경로를 snapshot -> 값 함수로 바꿉니다. 값이 없으면 default."""
+    name, field = _split_binding(path)
+    if not field:
+        def get(snapshot):
+            value = snapshot.get(name)
+            return default if value is None else value
+        return get
+
+    getter = attrgetter(field)
+
+    def get(snapshot):
+        value = snapshot.get(name)
+        return default if value is None else getter(value)
+    return get
+
+
+def text_template(template, missing=""):
+    """'{ram.used_gb:.1f} GB' 같은 str.format 템플릿을 snapshot -> 문자열 함수로 바꿉니다.
+
+    참조한 Collector 값 중 하나라도 없으면 missing을 반환합니다.
+    """
+    if not isinstance(template, str):
+        raise ValueError(f"텍스트 템플릿은 문자열이어야 합니다: {template!r}")
+    names = set()
+    for _, field, _, _ in string.Formatter().parse(template):
+        if field is not None:
+            names.add(_split_binding(field)[0])
+    if not names:
+        return lambda snapshot: template
+    # Format once with zeroed values so a bad format spec fails at load time, not mid-frame.
+    try:
+        template.format_map({name: SAMPLE_TYPES[name]._make([0] * len(SAMPLE_TYPES[name]._fields))
+                             for name in names})
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        raise ValueError(f"잘못된 텍스트 템플릿 {template!r}: {e}") from None
+
+    names = tuple(names)
+
+    def render(snapshot):
+        values = {}
+        for name in names:
+            value = snapshot.get(name)
+            if value is None:
+                return missing
+            values[name] = value
+        return template.format_map(values)
+    return render
+
+
+class Widget:
+    """레이아웃 위젯의 기반 클래스. 하위 클래스는 OPTIONS와 build()를 정의합니다.
+
+    width/height 옵션은 게이지 반지름 단위의 크기이고, gap은 그룹 안에서 앞 위젯과의
+    간격(px)입니다. dynamic이 True인 위젯은 프레임마다 shape(data)를 부르고, 그 값이
+    바뀌면 레이아웃을 다시 계산합니다. shape가 바뀌지 않는 위젯은 프레임 비용이 없습니다.
+    """
+    BASE_OPTIONS = {'gap': 20}
+    OPTIONS = {}
+    dynamic = False
+
+    def __init__(self, options):
+        self.options = options
+        self.gap = options['gap']
+
+    def shape(self, data):
+        return None
+
+    def size(self, radius, shape):
+        """(너비, 높이) px를 반환합니다. None이면 이번 레이아웃에서 숨깁니다."""
+        return self.options['width'] * radius, self.options['height'] * radius
+
+    def build(self, rect, radius, shape):
+        """rect에 고정된 그리기 함수 f(draw_list, data)를 반환합니다. shape는 size()에 넘긴 값입니다."""
+        raise NotImplementedError
+
+
+def _options(where, given, defaults):
+    if not isinstance(given, dict):
+        raise ValueError(f"{where}: 테이블(객체)이어야 합니다")
+    unknown = set(given) - set(defaults)
+    if unknown:
+        raise ValueError(f"{where}: 알 수 없는 옵션 {', '.join(sorted(unknown))} (가능: {', '.join(defaults)})")
+    options = dict(defaults)
+    for key, value in given.items():
+        default = defaults[key]
+        if isinstance(default, Real) and not (isinstance(value, Real) and not isinstance(value, bool)):
+            raise ValueError(f"{where}: {key}는 숫자여야 합니다: {value!r}")
+        options[key] = value
+    return options
+
+
+def _widget(where, spec, widget_types):
+    if not isinstance(spec, dict):
+        raise ValueError(f"{where}: 위젯은 테이블(객체)이어야 합니다")
+    spec = dict(spec)
+    kind = spec.pop('type', None)
+    cls = widget_types.get(kind)
+    if cls is None:
+        raise ValueError(f"{where}: 알 수 없는 위젯 종류 {kind!r} (가능: {', '.join(widget_types)})")
+    where = f"{where}/{kind}"
+    options = _options(where, spec, {**Widget.BASE_OPTIONS, **cls.OPTIONS})
+    try:
+        return cls(options)
+    except ValueError as e:
+        raise ValueError(f"{where}: {e}") from None
+
+
+def compile_layout(config, widget_types):
+    """설정 dict를 검사하고 위젯 객체를 만들어 Layout을 반환합니다. 잘못된 설정은 ValueError."""
+    if not isinstance(config, dict):
+        raise ValueError("레이아웃 설정은 테이블(객체)이어야 합니다")
+    config = dict(config)
+    options = _options("layout", config.pop('layout', {}), LAYOUT_OPTIONS)
+    groups_config = config.pop('groups', None)
+    if config:
+        raise ValueError(f"알 수 없는 최상위 키: {', '.join(sorted(config))} (가능: layout, groups)")
+    if not isinstance(groups_config, list) or not groups_config:
+        raise ValueError("groups에 그룹이 하나 이상 있어야 합니다")
+
+    groups = []
+    for index, group in enumerate(groups_config):
+        if not isinstance(group, dict):
+            raise ValueError(f"groups[{index}]: 테이블(객체)이어야 합니다")
+        group = dict(group)
+        name = str(group.pop('name', f"groups[{index}]"))
+        widgets = group.pop('widgets', [])
+        graph = group.pop('graph', None)
+        if group:
+            raise ValueError(f"{name}: 알 수 없는 키 {', '.join(sorted(group))} (가능: name, widgets, graph)")
+        if not isinstance(widgets, list):
+            raise ValueError(f"{name}: widgets는 목록이어야 합니다")
+        widgets = tuple(_widget(name, spec, widget_types) for spec in widgets)
+        if graph is not None:
+            if not isinstance(graph, dict):
+                raise ValueError(f"{name}: graph는 테이블(객체)이어야 합니다")
+            graph = _widget(name, {**graph, 'type': 'graph'}, widget_types)
+        groups.append(Group(name, widgets, graph))
+    return Layout(options['gauge_radius'], options['graph_top'], options['graph_gap'], tuple(groups))
+
+
+def read_layout_file(path):
+    """TOML(.toml) 또는 JSON 레이아웃 파일을 dict로 읽습니다."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if path.lower().endswith('.toml'):
+        try:
+            import tomllib
+        except ImportError:  # Python < 3.11
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise ValueError("TOML 레이아웃에는 Python 3.11 이상 또는 tomli 패키지가 필요합니다. JSON을 쓰세요.") from None
+        return tomllib.loads(data.decode('utf-8'))
+    import json
+    return json.loads(data)
+
+
+def _file_stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class LayoutEngine:
+    """Layout의 위치를 풀어 캐시하고 프레임마다 그리기 호출 목록을 실행합니다.
+
+    widget_types는 위젯 종류 이름 -> Widget 하위 클래스 표입니다. path를 주면
+    maybe_reload()가 파일 변경을 확인해 새 설정을 적용합니다. group_overlay(그룹 이름,
+    게이지 줄 위젯 Rect 목록)가 그리기 함수를 반환하면 그 그룹의 위젯 다음에 그립니다.
+    """
+
+    def __init__(self, widget_types, config, path=None, group_overlay=None):
+        self.widget_types = widget_types
+        self.path = path
+        self.group_overlay = group_overlay
+        self.solves = 0
+        self._stamp = _file_stamp(path) if path else None
+        self._next_check = 0.0
+        self._ops = ()
+        self.load(config)
+
+    @classmethod
+    def from_file(cls, widget_types, path, group_overlay=None):
+        return cls(widget_types, read_layout_file(path), path, group_overlay)
+
+    def load(self, config):
+        """새 설정을 적용합니다. 잘못된 설정이면 ValueError를 내고 이전 설정을 유지합니다."""
+        layout = compile_layout(config, self.widget_types)
+        self.layout = layout
+        self._dynamic = tuple(widget for group in layout.groups for widget in group.widgets if widget.dynamic)
+        self._key = None
+
+    def maybe_reload(self, now=None):
+        """설정 파일이 바뀌었으면 다시 읽습니다. 새 설정을 적용했으면 True를 반환합니다.
+
+        파일은 RELOAD_INTERVAL마다 한 번만 확인합니다. 파일이 잘못되었으면 오류를 출력하고
+        이전 설정을 유지합니다.
+        """
+        if self.path is None:
+            return False
+        now = time.monotonic() if now is None else now
+        if now < self._next_check:
+            return False
+        self._next_check = now + RELOAD_INTERVAL
+        stamp = _file_stamp(self.path)
+        if stamp is None or stamp == self._stamp:
+            return False  # unchanged, or briefly missing while an editor saves it
+        self._stamp = stamp
+        try:
+            self.load(read_layout_file(self.path))
+        except (OSError, ValueError, TypeError) as e:  # TOML/JSON decode errors are ValueErrors
+            print(f"레이아웃을 다시 읽을 수 없습니다 ({self.path}): {e}", file=sys.stderr)
+            return False
+        print(f"레이아웃 다시 읽음: {self.path}")
+        return True
+
+    def draw(self, draw_list, width, height, data):
+        """data(위젯이 읽는 프레임 값)로 대시보드를 그립니다."""
+        shapes = tuple([widget.shape(data) for widget in self._dynamic])
+        key = (width, height, shapes)
+        if key != self._key:
+            self._ops = self.solve(width, height, shapes)
+            self._key = key
+        for op in self._ops:
+            op(draw_list, data)
+
+    def solve(self, width, height, shapes):
+        """그룹을 가로로 균등한 간격으로 배치하고 그리기 함수 목록을 반환합니다."""
+        self.solves += 1
+        layout = self.layout
+        radius = min(width, height) * layout.gauge_radius
+        center_y = height / 2
+        shapes = iter(shapes)
+
+        placed = []
+        for group in layout.groups:
+            items = []
+            group_width = 0.0
+            for widget in group.widgets:
+                shape = next(shapes) if widget.dynamic else None
+                size = widget.size(radius, shape)
+                if size is None:
+                    continue
+                gap = widget.gap if items else 0.0
+                items.append((widget, shape, group_width + gap, size))
+                group_width += gap + size[0]
+            if items:
+                placed.append((group, items, group_width))
+
+        spacing = (width - sum(group_width for _, _, group_width in placed)) / (len(placed) + 1)
+        graph_height = center_y - radius - layout.graph_gap - layout.graph_top
+        ops = []
+        left = spacing
+        for group, items, group_width in placed:
+            rects = []
+            for widget, shape, offset, (item_width, item_height) in items:
+                rect = Rect(left + offset, center_y - item_height / 2, item_width, item_height)
+                ops.append(widget.build(rect, radius, shape))
+                rects.append(rect)
+            overlay = self.group_overlay(group.name, rects) if self.group_overlay else None
+            if overlay is not None:
+                ops.append(overlay)
+            if group.graph is not None:
+                ops.append(group.graph.build(Rect(left, layout.graph_top, group_width, graph_height), radius, None))
+            left += group_width + spacing
+        return tuple(ops)
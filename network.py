@@ -0,0 +1,170 @@
+"""인터페이스별 네트워크 속도 추적과 게이지 자동 범위.
+
+링크 속도(net_if_stats)는 인터페이스 구성이 바뀌었거나 링크 상태가 바뀌었을 때만
+다시 읽습니다. Linux에서는 /sys/class/net/<nic>/carrier_changes와 operstate를
+check_interval마다 확인하고, 그 밖의 플랫폼에서는 refresh_interval마다 다시 읽습니다.
+"""
+import math
+import os
+import sys
+import time
+from collections import namedtuple
+
+import psutil
+
+NicRate = namedtuple('NicRate', ['name', 'upload_mbps', 'download_mbps', 'link_mbps', 'active'])
+
+COUNTER_WRAP = 2**32
+WRAP_MAX_RATE = 10_000 * 1e6 / 8  # 링크 속도를 모를 때 가정하는 최대 속도 (바이트/초, 10 Gbit/s)
+SMOOTHING_TAU = 0.3          # EWMA 시간 상수 (초)
+ACTIVE_THRESHOLD_MBPS = 0.01
+ACTIVE_HOLD = 5.0            # 마지막 트래픽 이후 이 시간 동안 활성으로 표시 (초)
+SCALE_FLOOR_MBPS = 1.0
+SCALE_HOLD = 3.0             # 최대값을 유지하는 시간 (초)
+SCALE_HALF_LIFE = 5.0        # 유지 시간 뒤 최대값이 절반으로 줄어드는 시간 (초)
+
+
+def is_loopback(name):
+    return name == 'lo' or name.startswith('lo0') or 'Loopback' in name
+
+
+def counter_delta(current, last, elapsed, max_rate=WRAP_MAX_RATE):
+    """누적 카운터의 증가량. 32비트 카운터가 한 바퀴 돈 경우를 보정하고, 리셋되었으면 0을 반환합니다.
+
+    한 바퀴 돈 것으로 보는 것은 last가 elapsed초 동안 max_rate(바이트/초)로 닿을 수 있을 만큼
+    COUNTER_WRAP에 가까울 때뿐입니다.
+    """
+    if current >= last:
+        return current - last
+    budget = max_rate * elapsed
+    if COUNTER_WRAP - budget < last < COUNTER_WRAP:
+        wrapped = current + COUNTER_WRAP - last
+        if wrapped <= budget:
+            return wrapped
+    return 0  # interface re-created or counters reset
+
+
+def nice_ceiling(value):
+    """value 이상인 1, 2, 5 x 10^n 중 가장 작은 값을 반환합니다."""
+    if value <= 0:
+        return 0.0
+    exponent = math.floor(math.log10(value))
+    base = 10.0 ** exponent
+    for step in (1, 2, 5, 10):
+        if value <= step * base * (1 + 1e-9):
+            return step * base
+    return 10 * base
+
+
+class LinkMonitor:
+    """인터페이스별 (isup, 링크 속도 Mbps)를 캐시합니다."""
+
+    def __init__(self, check_interval=2.0, refresh_interval=30.0, sys_root='/sys'):
+        self.check_interval = check_interval
+        self.refresh_interval = refresh_interval
+        self.sys_root = sys_root
+        self._linux = sys.platform.startswith('linux')
+        self._names = None
+        self._links = {}
+        self._fingerprint = None
+        self._checked_at = 0.0
+        self._refreshed_at = 0.0
+
+    def _read_fingerprint(self):
+        """링크 상태가 바뀌면 달라지는 값 (carrier_changes, operstate)을 모읍니다."""
+        parts = []
+        for name in sorted(self._names):
+            base = os.path.join(self.sys_root, 'class', 'net', name)
+            for attribute in ('carrier_changes', 'operstate'):
+                try:
+                    with open(os.path.join(base, attribute), 'rb') as f:
+                        parts.append(f.read())
+                except OSError:
+                    parts.append(None)
+        return tuple(parts)
+
+    def _changed(self, now):
+        if not self._linux:
+            return now - self._refreshed_at >= self.refresh_interval
+        if now - self._checked_at < self.check_interval:
+            return False
+        self._checked_at = now
+        fingerprint = self._read_fingerprint()
+        if fingerprint != self._fingerprint:
+            self._fingerprint = fingerprint
+            return True
+        return False
+
+    def links(self, names, now=None):
+        """names(인터페이스 이름 집합)에 대한 {이름: (isup, link_mbps)} 딕셔너리를 반환합니다."""
+        now = time.monotonic() if now is None else now
+        names_changed = names != self._names
+        if names_changed:
+            self._names = frozenset(names)
+            if self._linux:
+                self._fingerprint = self._read_fingerprint()
+                self._checked_at = now
+        if names_changed or self._changed(now):
+            try:
+                stats = psutil.net_if_stats()
+            except OSError:
+                stats = {}
+            self._links = {name: (stats[name].isup, stats[name].speed) for name in self._names if name in stats}
+            self._refreshed_at = now
+        return self._links
+
+
+class PeakHold:
+    """최근 최대값을 SCALE_HOLD 동안 유지한 뒤 지수적으로 줄이는 게이지 범위."""
+
+    def __init__(self, floor=SCALE_FLOOR_MBPS, hold=SCALE_HOLD, half_life=SCALE_HALF_LIFE):
+        self.floor = floor
+        self.hold = hold
+        self.half_life = half_life
+        self.peak = 0.0
+        self._peak_time = None
+        self._last_time = None
+
+    def update(self, value, now, cap=None):
+        """새 값을 반영하고 눈금 범위(Mbps)를 반환합니다. cap(링크 속도)보다 커지지 않습니다."""
+        if self._last_time is not None and now < self._last_time:
+            self.peak = 0.0  # replay seeked backwards
+        elif self._last_time is not None and now - self._peak_time > self.hold:
+            self.peak *= 0.5 ** ((now - self._last_time) / self.half_life)
+        self._last_time = now
+        if value >= self.peak:
+            self.peak = value
+            self._peak_time = now
+        scale = nice_ceiling(max(self.peak, self.floor))
+        if cap and self.peak <= cap < scale:
+            scale = cap
+        return scale
+
+
+class NetScale:
+    """송수신 게이지 범위를 샘플마다 갱신하는 Sampler 리스너. 재생 중에도 같은 방식으로 동작합니다."""
+
+    def __init__(self, default_mbps=100.0):
+        self.upload_mbps = default_mbps
+        self.download_mbps = default_mbps
+        self._upload = PeakHold()
+        self._download = PeakHold()
+
+    def on_sample(self, name, sample, snapshot):
+        if name != 'net' or sample.value is None:
+            return
+        value = sample.value
+        cap = sum(nic.link_mbps for nic in value.nics if nic.active and nic.link_mbps) or None
+        self.upload_mbps = self._upload.update(value.upload_mbps, sample.timestamp, cap)
+        self.download_mbps = self._download.update(value.download_mbps, sample.timestamp, cap)
+
+
+def active_nic_text(nics, limit=2):
+    """활성 인터페이스 이름을 'eth0, wlan0 +1' 형식으로 반환합니다. 없으면 None."""
+    names = [nic.name for nic in nics if nic.active]
+    if not names:
+        return None
+    text = ", ".join(names[:limit])
+    if len(names) > limit:
+        text += f" +{len(names) - limit}"
+    return text
@@ -0,0 +1,500 @@
+"""창 없는 렌더링과 프레임 내보내기 (헤드리스 키오스크, USB 보조 디스플레이용).
+
+EGL로 창 없는 GL 컨텍스트를 만들고(Mesa llvmpipe의 surfaceless 플랫폼이면 GPU나
+디스플레이 서버 없이도 동작), ImGui 장면을 프레임버퍼 객체(FBO)에 그립니다.
+픽셀은 PBO 여러 개를 돌려 쓰는 비동기 glReadPixels로 읽으므로 렌더 루프가 GPU 복사를
+기다리지 않습니다. 읽은 프레임은 RGB565 또는 RGB888로 바꾼 뒤, 마지막으로 보낸 프레임과
+타일 단위로 비교해 바뀐 사각형만 파일, 파이프, 공유 메모리로 보냅니다.
+
+OpenGL 모듈을 가져오기 전에 PYOPENGL_PLATFORM=egl이어야 합니다. (use_egl_platform)
+NumPy가 필요합니다.
+"""
+import ctypes
+import os
+import struct
+import sys
+import time
+import zlib
+from collections import deque, namedtuple
+
+import numpy as np
+
+Rect = namedtuple('Rect', ['x', 'y', 'width', 'height'])
+
+PIXEL_FORMATS = {'rgb565': 2, 'rgb888': 3}  # bytes per pixel
+TILE = 32                 # 바뀐 영역을 찾는 타일 크기 (px)
+FULL_FRAME_RATIO = 0.5    # 바뀐 면적이 이 비율을 넘으면 사각형 대신 전체 프레임 하나를 보냅니다.
+READ_BUFFERS = 2
+
+# Stream framing ('rects'): one frame header, then rect count x (rect header + rows of pixels).
+FRAME_MAGIC = b'HWFB'
+FRAME_HEADER = struct.Struct('<4sIHHBH')  # magic, sequence, width, height, bytes per pixel, rect count
+RECT_HEADER = struct.Struct('<HHHH')       # x, y, width, height
+
+# Shared memory: header, MAX_SHM_RECTS rect slots (x, y, w, h as uint16), then the full frame.
+SHM_MAGIC = b'HWSM'
+SHM_HEADER = struct.Struct('<4sIHHBH')    # magic, sequence (odd while writing), width, height, bytes per pixel, rect count
+MAX_SHM_RECTS = 256
+
+EGL_PLATFORM_SURFACELESS_MESA = 0x31DD
+
+
+def use_egl_platform():
+    """PyOpenGL이 EGL로 GL 함수를 찾도록 설정합니다. OpenGL을 가져오기 전에 불러야 합니다."""
+    if 'OpenGL' in sys.modules and os.environ.get('PYOPENGL_PLATFORM') != 'egl':
+        raise RuntimeError("OpenGL 모듈을 가져오기 전에 use_egl_platform()을 불러야 합니다.")
+    os.environ['PYOPENGL_PLATFORM'] = 'egl'
+
+
+def parse_size(text):
+    """'1920x480' 형식을 (너비, 높이)로 바꿉니다."""
+    try:
+        width, height = (int(part) for part in text.lower().split('x'))
+    except ValueError:
+        raise ValueError(f"크기는 WIDTHxHEIGHT 형식이어야 합니다: {text!r}") from None
+    if not (0 < width <= 0xFFFF and 0 < height <= 0xFFFF):
+        raise ValueError(f"잘못된 크기: {text!r}")
+    return width, height
+
+
+class EglContext:
+    """창이나 디스플레이 서버 없이 만드는 OpenGL 컨텍스트.
+
+    Mesa의 surfaceless 플랫폼을 먼저 시도하고, 없으면 기본 디스플레이와 1x1 pbuffer를 씁니다.
+    """
+
+    def __init__(self):
+        from OpenGL import EGL
+        from OpenGL import GL as gl
+
+        self._egl = EGL
+        display = None
+        try:
+            display = EGL.eglGetPlatformDisplayEXT(EGL_PLATFORM_SURFACELESS_MESA, EGL.EGL_DEFAULT_DISPLAY, None)
+        except Exception:  # extension missing: NullFunctionError or an EGL error depending on the driver
+            display = None
+        if not display:
+            display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+        major, minor = EGL.EGLint(), EGL.EGLint()
+        if not display or not EGL.eglInitialize(display, ctypes.pointer(major), ctypes.pointer(minor)):
+            raise RuntimeError("EGL 디스플레이를 초기화할 수 없습니다.")
+        self.display = display
+
+        attributes = (EGL.EGLint * 13)(EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+                                       EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+                                       EGL.EGL_RED_SIZE, 8, EGL.EGL_GREEN_SIZE, 8, EGL.EGL_BLUE_SIZE, 8,
+                                       EGL.EGL_ALPHA_SIZE, 8, EGL.EGL_NONE)
+        config, count = EGL.EGLConfig(), EGL.EGLint()
+        if not EGL.eglChooseConfig(display, attributes, ctypes.pointer(config), 1, ctypes.pointer(count)) or not count.value:
+            raise RuntimeError("EGL에서 RGBA8 OpenGL 설정을 찾을 수 없습니다.")
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        self.context = EGL.eglCreateContext(display, config, EGL.EGL_NO_CONTEXT, (EGL.EGLint * 1)(EGL.EGL_NONE))
+        if not self.context:
+            raise RuntimeError("EGL OpenGL 컨텍스트를 만들 수 없습니다.")
+
+        # All drawing goes to our own FBO, so a surface is only needed if the driver lacks
+        # EGL_KHR_surfaceless_context.
+        self.surface = EGL.EGL_NO_SURFACE
+        if not self._make_current():
+            self.surface = EGL.eglCreatePbufferSurface(display, config, (EGL.EGLint * 5)(
+                EGL.EGL_WIDTH, 1, EGL.EGL_HEIGHT, 1, EGL.EGL_NONE))
+            if not self._make_current():
+                raise RuntimeError("EGL 컨텍스트를 활성화할 수 없습니다.")
+        self.renderer = gl.glGetString(gl.GL_RENDERER).decode(errors='replace')
+
+    def _make_current(self):
+        try:
+            return bool(self._egl.eglMakeCurrent(self.display, self.surface, self.surface, self.context))
+        except self._egl.EGLError:
+            return False
+
+    def close(self):
+        EGL = self._egl
+        EGL.eglMakeCurrent(self.display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT)
+        EGL.eglDestroyContext(self.display, self.context)
+        if self.surface:
+            EGL.eglDestroySurface(self.display, self.surface)
+        EGL.eglTerminate(self.display)
+
+
+class FrameReader:
+    """RGBA8 FBO와 그 내용을 비동기로 읽는 PBO 링.
+
+    bind() 뒤에 장면을 그리고 start()로 읽기를 시작하면, glReadPixels는 PBO로 복사만
+    예약하고 바로 돌아옵니다. poll()은 펜스가 끝난 프레임만 매핑해 돌려주므로 기다리지
+    않습니다. PBO가 모두 차 있을 때 start()를 부르면 가장 오래된 읽기를 먼저 마칩니다.
+    asynchronous=False이면 start()가 바로 glReadPixels로 읽습니다. (벤치마크 비교용)
+    """
+
+    def __init__(self, width, height, buffers=READ_BUFFERS, asynchronous=True):
+        from OpenGL import GL as gl
+
+        self.gl = gl
+        self.width = width
+        self.height = height
+        self.asynchronous = asynchronous
+        self.size = width * height * 4
+        self.fbo = gl.glGenFramebuffers(1)
+        self.color = gl.glGenRenderbuffers(1)
+        gl.glBindRenderbuffer(gl.GL_RENDERBUFFER, self.color)
+        gl.glRenderbufferStorage(gl.GL_RENDERBUFFER, gl.GL_RGBA8, width, height)
+        gl.glBindFramebuffer(gl.GL_FRAMEBUFFER, self.fbo)
+        gl.glFramebufferRenderbuffer(gl.GL_FRAMEBUFFER, gl.GL_COLOR_ATTACHMENT0, gl.GL_RENDERBUFFER, self.color)
+        status = gl.glCheckFramebufferStatus(gl.GL_FRAMEBUFFER)
+        if status != gl.GL_FRAMEBUFFER_COMPLETE:
+            raise RuntimeError(f"오프스크린 프레임버퍼를 만들 수 없습니다 (상태 0x{int(status):x}).")
+        gl.glPixelStorei(gl.GL_PACK_ALIGNMENT, 1)
+
+        self._pbos = list(gl.glGenBuffers(buffers)) if buffers > 1 else [gl.glGenBuffers(1)]
+        for pbo in self._pbos:
+            gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, pbo)
+            gl.glBufferData(gl.GL_PIXEL_PACK_BUFFER, self.size, None, gl.GL_STREAM_READ)
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)
+        # One host array per PBO; a returned frame stays valid until its PBO is read again.
+        self._host = [np.empty((height, width, 4), dtype=np.uint8) for _ in self._pbos]
+        self._free = deque(range(len(self._pbos)))
+        self._pending = deque()  # (pbo index, fence)
+        self._ready = []
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    def bind(self):
+        self.gl.glBindFramebuffer(self.gl.GL_FRAMEBUFFER, self.fbo)
+        self.gl.glViewport(0, 0, self.width, self.height)
+
+    def start(self):
+        """지금 FBO 내용의 읽기를 시작합니다."""
+        gl = self.gl
+        gl.glBindFramebuffer(gl.GL_READ_FRAMEBUFFER, self.fbo)
+        if not self.asynchronous:
+            host = self._host[0]
+            gl.glReadPixels(0, 0, self.width, self.height, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, host)
+            self._ready.append(host[::-1])
+            return
+        if not self._free:
+            self._ready.append(self._map(*self._pending.popleft()))
+        index = self._free.popleft()
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, self._pbos[index])
+        gl.glReadPixels(0, 0, self.width, self.height, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)
+        self._pending.append((index, gl.glFenceSync(gl.GL_SYNC_GPU_COMMANDS_COMPLETE, 0)))
+        gl.glFlush()
+
+    def poll(self, block=False):
+        """읽기가 끝난 프레임 목록(오래된 것부터)을 반환합니다.
+
+        각 프레임은 위쪽 행이 0인 (높이, 너비, 4) uint8 배열입니다. block=True이면 남은 읽기를 모두 마칩니다.
+        """
+        gl = self.gl
+        while self._pending:
+            index, fence = self._pending[0]
+            if not block:
+                status = gl.glClientWaitSync(fence, 0, 0)
+                if status not in (gl.GL_ALREADY_SIGNALED, gl.GL_CONDITION_SATISFIED):
+                    break
+            self._pending.popleft()
+            self._ready.append(self._map(index, fence))
+        ready, self._ready = self._ready, []
+        return ready
+
+    def _map(self, index, fence):
+        gl = self.gl
+        gl.glDeleteSync(fence)
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, self._pbos[index])
+        pointer = gl.glMapBufferRange(gl.GL_PIXEL_PACK_BUFFER, 0, self.size, gl.GL_MAP_READ_BIT)
+        host = self._host[index]
+        ctypes.memmove(host.ctypes.data, pointer, self.size)
+        gl.glUnmapBuffer(gl.GL_PIXEL_PACK_BUFFER)
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)
+        self._free.append(index)
+        return host[::-1]  # GL rows start at the bottom
+
+    def close(self):
+        gl = self.gl
+        for _, fence in self._pending:
+            gl.glDeleteSync(fence)
+        gl.glDeleteBuffers(len(self._pbos), self._pbos)
+        gl.glDeleteRenderbuffers(1, [self.color])
+        gl.glDeleteFramebuffers(1, [self.fbo])
+
+
+def convert_pixels(rgba, pixel_format):
+    """RGBA 프레임을 RGB888((높이, 너비, 3) uint8) 또는 RGB565((높이, 너비) little-endian uint16)로 바꿉니다."""
+    if pixel_format == 'rgb888':
+        return np.ascontiguousarray(rgba[:, :, :3])
+    if pixel_format == 'rgb565':
+        r = rgba[:, :, 0].astype(np.uint16)
+        g = rgba[:, :, 1].astype(np.uint16)
+        b = rgba[:, :, 2]
+        r >>= 3
+        r <<= 11
+        g >>= 2
+        g <<= 5
+        r |= g
+        r |= b >> 3
+        return r.astype('<u2', copy=False)
+    raise ValueError(f"알 수 없는 픽셀 형식: {pixel_format}")
+
+
+def dirty_rects(previous, current, tile=TILE, full_frame_ratio=FULL_FRAME_RATIO):
+    """두 프레임에서 바뀐 타일을 가로로 이은 뒤 같은 가로 범위의 줄끼리 세로로 합친 사각형 목록.
+
+    바뀐 곳이 없으면 빈 목록, 바뀐 면적이 full_frame_ratio를 넘으면 전체 프레임 하나입니다.
+    """
+    height, width = current.shape[:2]
+    # Fold RGB888 channels into the columns: a tile is then tile * 3 bytes wide, which is much
+    # cheaper than reducing over the channel axis first.
+    channels = current.shape[2] if current.ndim == 3 else 1
+    changed = (previous != current).reshape(height, width * channels)
+    if not changed.any():
+        return []
+    tiles = np.logical_or.reduceat(changed, np.arange(0, height, tile), axis=0)
+    tiles = np.logical_or.reduceat(tiles, np.arange(0, width * channels, tile * channels), axis=1)
+
+    rects = []
+    open_rects = {}  # (x0, x1) column run -> [top tile row, bottom tile row]
+    for row, mask in enumerate(tiles):
+        runs = []
+        columns = np.flatnonzero(mask)
+        if len(columns):
+            breaks = np.flatnonzero(np.diff(columns) > 1)
+            starts = np.concatenate(([columns[0]], columns[breaks + 1]))
+            ends = np.concatenate((columns[breaks], [columns[-1]]))
+            runs = list(zip(starts.tolist(), ends.tolist()))
+        next_open = {}
+        for run in runs:
+            span = open_rects.pop(run, None)
+            next_open[run] = [span[0] if span else row, row]
+        rects.extend((run, span) for run, span in open_rects.items())
+        open_rects = next_open
+    rects.extend(open_rects.items())
+
+    result = []
+    area = 0
+    for (x0, x1), (y0, y1) in rects:
+        left, top = x0 * tile, y0 * tile
+        rect = Rect(left, top, min((x1 + 1) * tile, width) - left, min((y1 + 1) * tile, height) - top)
+        area += rect.width * rect.height
+        result.append(rect)
+    if area > full_frame_ratio * width * height:
+        return [Rect(0, 0, width, height)]
+    result.sort(key=lambda rect: (rect.y, rect.x))
+    return result
+
+
+class StreamSink:
+    """파일, FIFO 또는 표준 출력('-')에 프레임을 씁니다.
+
+    framing='rects'이면 프레임마다 FRAME_HEADER와 바뀐 사각형(RECT_HEADER + 행 단위 픽셀)을 쓰고,
+    framing='full'이면 헤더 없이 전체 프레임을 씁니다. (ffmpeg -f rawvideo, 프레임버퍼 장치 등)
+    읽는 쪽이 닫히면 오류를 출력하고 쓰기를 멈춥니다.
+    """
+
+    def __init__(self, path, framing='rects'):
+        if framing not in ('rects', 'full'):
+            raise ValueError(f"알 수 없는 프레이밍: {framing}")
+        self.path = path
+        self.framing = framing
+        self.closed = False
+        self._owned = path != '-'
+        # A FIFO blocks until a reader opens it. '-' is the process's stdout even after status text
+        # was redirected away from sys.stdout.
+        self._stream = open(path, 'wb') if self._owned else sys.__stdout__.buffer
+        self._sequence = 0
+
+    def write(self, frame, rects):
+        if self.closed:
+            return
+        try:
+            if self.framing == 'full':
+                self._stream.write(frame.data if frame.flags.c_contiguous else frame.tobytes())
+            else:
+                height, width = frame.shape[:2]
+                parts = [FRAME_HEADER.pack(FRAME_MAGIC, self._sequence, width, height, frame.itemsize * (frame.shape[2] if frame.ndim == 3 else 1), len(rects))]
+                for rect in rects:
+                    parts.append(RECT_HEADER.pack(*rect))
+                    parts.append(frame[rect.y:rect.y + rect.height, rect.x:rect.x + rect.width].tobytes())
+                self._stream.write(b''.join(parts))
+            self._stream.flush()
+        except (BrokenPipeError, OSError) as e:
+            print(f"프레임 출력을 멈춥니다 ({self.path}): {e}", file=sys.stderr)
+            self.close()
+        self._sequence = (self._sequence + 1) & 0xFFFFFFFF
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        if self._owned:
+            try:
+                self._stream.close()
+            except OSError:
+                pass
+
+
+class SharedMemorySink:
+    """공유 메모리 블록에 최신 프레임 전체를 유지하고, 바뀐 사각형만 덮어씁니다.
+
+    블록 구성은 SHM_HEADER, MAX_SHM_RECTS개의 사각형 칸(uint16 x, y, w, h), 프레임 순서입니다.
+    sequence가 홀수인 동안은 쓰는 중이므로, 읽는 쪽은 복사 전후의 sequence가 같은 짝수인지
+    확인합니다. 사각형 칸에는 직전 sequence 이후 바뀐 영역이 들어 있습니다.
+    """
+
+    def __init__(self, name, width, height, pixel_format):
+        from multiprocessing import shared_memory
+
+        self.bytes_per_pixel = PIXEL_FORMATS[pixel_format]
+        self.width = width
+        self.height = height
+        self._rects_offset = SHM_HEADER.size
+        self._frame_offset = self._rects_offset + MAX_SHM_RECTS * RECT_HEADER.size
+        size = self._frame_offset + width * height * self.bytes_per_pixel
+        self.memory = shared_memory.SharedMemory(name=name, create=True, size=size)
+        dtype = np.uint8 if pixel_format == 'rgb888' else np.dtype('<u2')
+        shape = (height, width, 3) if pixel_format == 'rgb888' else (height, width)
+        self.frame = np.ndarray(shape, dtype=dtype, buffer=self.memory.buf, offset=self._frame_offset)
+        self.rect_table = np.ndarray((MAX_SHM_RECTS, 4), dtype='<u2', buffer=self.memory.buf, offset=self._rects_offset)
+        self._sequence = 0
+        self._write_header(0)
+
+    def _write_header(self, rect_count):
+        SHM_HEADER.pack_into(self.memory.buf, 0, SHM_MAGIC, self._sequence, self.width, self.height,
+                             self.bytes_per_pixel, rect_count)
+
+    def write(self, frame, rects):
+        if len(rects) > MAX_SHM_RECTS:
+            rects = [Rect(0, 0, self.width, self.height)]
+        self._sequence += 1  # odd: readers retry
+        self._write_header(0)
+        for i, rect in enumerate(rects):
+            region = (slice(rect.y, rect.y + rect.height), slice(rect.x, rect.x + rect.width))
+            self.frame[region] = frame[region]
+            self.rect_table[i] = rect
+        self._sequence += 1
+        self._write_header(len(rects))
+
+    def close(self):
+        del self.frame, self.rect_table  # release the buffer exports before closing
+        self.memory.close()
+        self.memory.unlink()
+
+
+class FrameExporter:
+    """RGBA 프레임을 출력 형식으로 바꾸고, 마지막으로 보낸 프레임과 달라진 사각형만 싱크에 보냅니다."""
+
+    def __init__(self, pixel_format='rgb565', sinks=(), tile=TILE, full_frame_ratio=FULL_FRAME_RATIO):
+        if pixel_format not in PIXEL_FORMATS:
+            raise ValueError(f"알 수 없는 픽셀 형식: {pixel_format}")
+        self.pixel_format = pixel_format
+        self.sinks = list(sinks)
+        self.tile = tile
+        self.full_frame_ratio = full_frame_ratio
+        self.previous = None
+        self.frames = 0
+        self.pushed_frames = 0
+        self.pushed_bytes = 0
+        self.full_bytes = 0
+
+    def push(self, rgba):
+        """프레임을 보내고 보낸 사각형 목록을 반환합니다. 바뀐 것이 없으면 아무것도 쓰지 않습니다."""
+        frame = convert_pixels(rgba, self.pixel_format)
+        height, width = frame.shape[:2]
+        if self.previous is None or self.previous.shape != frame.shape:
+            rects = [Rect(0, 0, width, height)]
+        else:
+            rects = dirty_rects(self.previous, frame, self.tile, self.full_frame_ratio)
+        self.frames += 1
+        frame_bytes = width * height * PIXEL_FORMATS[self.pixel_format]
+        self.full_bytes += frame_bytes
+        if rects:
+            self.pushed_frames += 1
+            self.pushed_bytes += sum(rect.width * rect.height for rect in rects) * PIXEL_FORMATS[self.pixel_format]
+            for sink in self.sinks:
+                sink.write(frame, rects)
+        self.previous = frame
+        return rects
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+def _png_chunk(kind, data):
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+
+def write_png(path, rgb, level=6):
+    """(높이, 너비, 3) uint8 배열을 PNG로 저장합니다. 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록 교체합니다."""
+    height, width = rgb.shape[:2]
+    raw = np.zeros((height, 1 + width * 3), dtype=np.uint8)  # filter byte 0 (None) per row
+    raw[:, 1:] = np.ascontiguousarray(rgb[:, :, :3]).reshape(height, width * 3)
+    data = (b'\x89PNG\r\n\x1a\n'
+            + _png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+            + _png_chunk(b'IDAT', zlib.compress(raw.tobytes(), level))
+            + _png_chunk(b'IEND', b''))
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def read_png(path):
+    """8비트 RGB/RGBA, 비인터레이스 PNG를 (높이, 너비, 3) uint8 배열로 읽습니다.
+
+    행 필터는 None/Sub/Up만 지원합니다. write_png로 만든 골든 이미지를 읽기 위한 것입니다.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:8] != b'\x89PNG\r\n\x1a\n':
+        raise ValueError(f"PNG 파일이 아닙니다: {path}")
+    offset, idat, header = 8, [], None
+    while offset < len(data):
+        length, kind = struct.unpack_from('>I4s', data, offset)
+        body = data[offset + 8:offset + 8 + length]
+        if kind == b'IHDR':
+            header = struct.unpack('>IIBBBBB', body)
+        elif kind == b'IDAT':
+            idat.append(body)
+        offset += 12 + length
+    width, height, depth, color_type, _, _, interlace = header
+    if depth != 8 or color_type not in (2, 6) or interlace:
+        raise ValueError(f"지원하지 않는 PNG 형식입니다 (8비트 RGB/RGBA만): {path}")
+    channels = 3 if color_type == 2 else 4
+    raw = np.frombuffer(zlib.decompress(b''.join(idat)), dtype=np.uint8).reshape(height, 1 + width * channels)
+    pixels = raw[:, 1:].copy()
+    for row in range(height):
+        kind = raw[row, 0]
+        if kind == 1:    # Sub
+            line = pixels[row].reshape(width, channels)
+            np.cumsum(line, axis=0, dtype=np.uint8, out=line)
+        elif kind == 2:  # Up
+            if row:
+                pixels[row] += pixels[row - 1]
+        elif kind != 0:
+            raise ValueError(f"지원하지 않는 PNG 행 필터 {kind}: {path}")
+    return pixels.reshape(height, width, channels)[:, :, :3]
+
+
+class PngSnapshots:
+    """interval초마다 최신 프레임을 PNG로 저장합니다. 경로에 '%'가 있으면 time.strftime으로 이름을 만듭니다."""
+
+    def __init__(self, path, interval=10.0):
+        self.path = path
+        self.interval = interval
+        self._next = 0.0
+
+    def maybe_write(self, rgba, now=None):
+        now = time.monotonic() if now is None else now
+        if now < self._next:
+            return
+        self._next = now + self.interval
+        self.write(rgba)
+
+    def write(self, rgba):
+        path = time.strftime(self.path) if '%' in self.path else self.path
+        try:
+            write_png(path, rgba[:, :, :3])
+        except OSError as e:
+            print(f"PNG를 저장할 수 없습니다 ({path}): {e}", file=sys.stderr)
@@ -0,0 +1,176 @@
+"""Linux /proc, /sys 직접 읽기 백엔드.
+
+psutil은 호출마다 파일을 열고 모든 필드를 파싱합니다. ProcFs는 필요한 파일을
+한 번만 열어 두고 os.preadv로 재사용 버퍼에 다시 읽어, 필요한 필드만 파싱합니다.
+/proc/stat 한 번 읽기로 전체와 코어별 CPU 시간을 함께 얻습니다.
+
+파일마다 버퍼가 따로 있으므로 서로 다른 파일은 서로 다른 스레드에서 읽어도
+되지만, 같은 메서드를 여러 스레드에서 동시에 부르면 안 됩니다.
+"""
+import os
+import sys
+
+SECTOR_SIZE = 512  # /proc/diskstats always counts 512-byte sectors
+INITIAL_BUFFER = 4096
+
+_MEMINFO_KEYS = (b'MemTotal', b'MemFree', b'MemAvailable', b'Buffers', b'Cached', b'SReclaimable')
+
+
+class ProcFile:
+    """열어 둔 파일을 오프셋 0부터 재사용 버퍼로 다시 읽습니다."""
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = os.open(path, os.O_RDONLY)
+        self._buffer = bytearray(INITIAL_BUFFER)
+
+    def read(self):
+        """파일 전체 내용을 bytes로 반환합니다. 버퍼가 모자라면 두 배로 늘려 다시 읽습니다."""
+        while True:
+            count = os.preadv(self._fd, [self._buffer], 0)
+            if count < len(self._buffer):
+                return bytes(memoryview(self._buffer)[:count])
+            self._buffer = bytearray(len(self._buffer) * 2)
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def parse_cpu_times(data):
+    """/proc/stat 내용에서 (cpu id, busy, total jiffies) 목록을 반환합니다. 0번이 전체(b'cpu'), 이후는 b'cpuN'입니다."""
+    end = data.find(b'\nintr')
+    if end >= 0:
+        data = data[:end]
+    times = []
+    for line in data.split(b'\n'):
+        if not line.startswith(b'cpu'):
+            break
+        cpu, *fields = line.split()
+        fields = list(map(int, fields))
+        # Same accounting as psutil: guest time is already part of user/nice.
+        total = sum(fields) - sum(fields[8:10])
+        idle = fields[3] + (fields[4] if len(fields) > 4 else 0)
+        times.append((cpu, total - idle, total))
+    return times
+
+
+def parse_meminfo(data):
+    """/proc/meminfo 내용에서 (총량, 사용 가능량, 사용량) 바이트를 반환합니다. psutil과 같은 계산입니다."""
+    values = {}
+    for line in data.split(b'\n'):
+        key, _, rest = line.partition(b':')
+        if key in _MEMINFO_KEYS:
+            values[key] = int(rest.split()[0]) * 1024
+            if len(values) == len(_MEMINFO_KEYS):
+                break
+    total = values[b'MemTotal']
+    free = values.get(b'MemFree', 0)
+    available = values.get(b'MemAvailable', free)
+    used = total - free - values.get(b'Buffers', 0) - values.get(b'Cached', 0) - values.get(b'SReclaimable', 0)
+    if used < 0:
+        used = total - free
+    return total, available, used
+
+
+def parse_net_dev(data):
+    """/proc/net/dev 내용에서 모든 인터페이스의 (송신, 수신) 바이트 합계를 반환합니다."""
+    sent = recv = 0
+    for line in data.split(b'\n')[2:]:
+        _, sep, rest = line.partition(b':')
+        if not sep:
+            continue
+        fields = rest.split()
+        recv += int(fields[0])
+        sent += int(fields[8])
+    return sent, recv
+
+
+def parse_net_dev_pernic(data):
+    """/proc/net/dev 내용에서 인터페이스 이름별 (송신, 수신) 바이트를 반환합니다."""
+    counters = {}
+    for line in data.split(b'\n')[2:]:
+        name, sep, rest = line.partition(b':')
+        if not sep:
+            continue
+        fields = rest.split()
+        counters[name.strip().decode()] = (int(fields[8]), int(fields[0]))
+    return counters
+
+
+class ProcFs:
+    """/proc 파일을 열어 두고 수집 값을 읽는 Linux 백엔드."""
+
+    def __init__(self, proc_root='/proc', sys_root='/sys'):
+        self.proc_root = proc_root
+        self.sys_root = sys_root
+        self._files = {}
+        self._whole_disks = {}  # device name -> is a whole disk (not a partition)
+
+    def _file(self, name):
+        proc_file = self._files.get(name)
+        if proc_file is None:
+            proc_file = self._files[name] = ProcFile(os.path.join(self.proc_root, name))
+        return proc_file
+
+    def close(self):
+        for proc_file in self._files.values():
+            proc_file.close()
+        self._files.clear()
+
+    def cpu_times(self):
+        return parse_cpu_times(self._file('stat').read())
+
+    def memory(self):
+        return parse_meminfo(self._file('meminfo').read())
+
+    def net_bytes(self):
+        return parse_net_dev(self._file('net/dev').read())
+
+    def net_bytes_pernic(self):
+        return parse_net_dev_pernic(self._file('net/dev').read())
+
+    def is_whole_disk(self, name):
+        """name이 파티션이 아닌 디스크 장치인지 반환합니다. (/sys/block 기준, 결과는 캐시)"""
+        whole = self._whole_disks.get(name)
+        if whole is None:
+            whole = self._whole_disks[name] = os.path.exists(
+                os.path.join(self.sys_root, 'block', name.replace('/', '!')))
+        return whole
+
+    def disk_bytes_perdisk(self):
+        """파티션을 포함한 장치 이름별 누적 (읽기, 쓰기) 바이트 딕셔너리를 반환합니다."""
+        counters = {}
+        for line in self._file('diskstats').read().split(b'\n'):
+            fields = line.split()
+            if len(fields) < 10:
+                continue
+            counters[fields[2].decode()] = (int(fields[5]) * SECTOR_SIZE, int(fields[9]) * SECTOR_SIZE)
+        return counters
+
+    def disk_bytes(self):
+        """파티션을 제외한 디스크 장치의 (읽기, 쓰기) 바이트 합계를 반환합니다."""
+        read = written = 0
+        for name, (bytes_read, bytes_written) in self.disk_bytes_perdisk().items():
+            if self.is_whole_disk(name):
+                read += bytes_read
+                written += bytes_written
+        return read, written
+
+
+def open_procfs(proc_root='/proc', sys_root='/sys'):
+    """Linux에서 필요한 /proc 파일을 모두 읽을 수 있으면 ProcFs를, 아니면 None을 반환합니다."""
+    if not sys.platform.startswith('linux'):
+        return None
+    procfs = ProcFs(proc_root, sys_root)
+    try:
+        procfs.cpu_times()
+        procfs.memory()
+        procfs.net_bytes()
+        procfs.disk_bytes()
+    except (OSError, ValueError, KeyError, IndexError) as error:
+        print(f"/proc 직접 읽기를 사용할 수 없어 psutil을 사용합니다: {error}", file=sys.stderr)
+        procfs.close()
+        return None
+    return procfs
@@ -0,0 +1,404 @@
+"""스냅샷을 고정 길이 바이너리 로그로 기록하고 mmap으로 재생합니다.
+
+파일 형식 (리틀 엔디언):
+    헤더  : MAGIC(8) + struct '<HHId' (버전, 필드 이름 길이, 필드 수, 기록 주기)
+            + 필드 수 x 필드 이름(FIELD_NAME_SIZE 바이트, NUL 패딩)
+    레코드: struct '<d' + 'f' x 필드 수 (time.time() 타임스탬프 + 메트릭 값, 없는 값은 NaN)
+"""
+import functools
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import time
+from types import MappingProxyType
+
+from collectors import CpuSample, RamSample, GpuSample, NetSample, DiskIoSample, DiskSample
+from gpu import GpuDeviceSample
+from sampler import Sample, Snapshot, EMPTY_SNAPSHOT
+
+MAGIC = b'WHWMREC\x00'
+VERSION = 1
+FIELD_NAME_SIZE = 32
+HEADER_STRUCT = struct.Struct('<HHId')
+
+# (필드 이름, Collector 이름, 값 속성) - 코어별, GPU별 필드는 record_fields()에서 추가됩니다.
+BASE_FIELDS = [
+    ('cpu', 'cpu', 'total'),
+    ('ram', 'ram', 'percent'),
+    ('ram_used_gb', 'ram', 'used_gb'),
+    ('ram_total_gb', 'ram', 'total_gb'),
+    ('gpu', 'gpu', 'percent'),
+    ('vram', 'gpu', 'vram_percent'),
+    ('vram_used_mb', 'gpu', 'vram_used_mb'),
+    ('vram_total_mb', 'gpu', 'vram_total_mb'),
+    ('net_up', 'net', 'upload_mbps'),
+    ('net_down', 'net', 'download_mbps'),
+    ('disk_read', 'disk_io', 'read_mbps'),
+    ('disk_write', 'disk_io', 'write_mbps'),
+    ('disk_usage', 'disk', 'percent'),
+    ('disk_used_gb', 'disk', 'used_gb'),
+    ('disk_total_gb', 'disk', 'total_gb'),
+]
+
+# gpu{N}_{suffix} 필드 -> GpuDeviceSample 속성
+GPU_DEVICE_FIELDS = {
+    'util': 'percent',
+    'vram': 'vram_percent',
+    'vram_used_mb': 'vram_used_mb',
+    'vram_total_mb': 'vram_total_mb',
+    'temp': 'temperature_c',
+    'power': 'power_w',
+    'clock': 'clock_mhz',
+}
+GPU_DEVICE_FIELD_RE = re.compile(r'gpu(\d+)_(\w+)$')
+
+SAMPLE_TYPES = {
+    'ram': RamSample,
+    'gpu': GpuSample,
+    'net': NetSample,
+    'disk_io': DiskIoSample,
+    'disk': DiskSample,
+}
+
+
+def record_fields(num_cores, num_gpus=0):
+    """기록할 필드 이름 목록을 반환합니다."""
+    fields = [name for name, _, _ in BASE_FIELDS] + [f'cpu_core_{i}' for i in range(num_cores)]
+    for index in range(num_gpus):
+        fields.extend(f'gpu{index}_{suffix}' for suffix in GPU_DEVICE_FIELDS)
+    return fields
+
+
+def record_layout(fields):
+    """필드마다 스냅샷에서 값을 꺼낼 위치를 한 번만 계산합니다. snapshot_to_row에 넘겨 레코드마다 씁니다.
+
+    (Collector 값 속성 목록, 코어 목록, GPU 장치 속성 목록) 각각 (행 위치, ...) 튜플입니다.
+    """
+    getters = {name: (source, attr) for name, source, attr in BASE_FIELDS}
+    base, cores, devices = [], [], []
+    for position, field in enumerate(fields):
+        gpu_match = GPU_DEVICE_FIELD_RE.match(field)
+        if field.startswith('cpu_core_'):
+            cores.append((position, int(field[len('cpu_core_'):])))
+        elif gpu_match:
+            devices.append((position, int(gpu_match.group(1)), GPU_DEVICE_FIELDS[gpu_match.group(2)]))
+        else:
+            base.append((position, *getters[field]))
+    return len(fields), tuple(base), tuple(cores), tuple(devices)
+
+
+def snapshot_to_row(snapshot, fields, layout=None):
+    """스냅샷을 필드 순서의 float 목록으로 변환합니다. 없는 값은 NaN입니다.
+
+    layout은 같은 fields의 record_layout() 결과입니다. 레코드마다 부르는 쪽은 미리 만들어 넘깁니다.
+    """
+    count, base, cores, devices = layout or record_layout(fields)
+    row = [math.nan] * count
+    for position, source, attr in base:
+        sample_value = snapshot.get(source)
+        if sample_value is not None:
+            value = getattr(sample_value, attr)
+            if value is not None:
+                row[position] = float(value)
+    cpu = snapshot.get('cpu')
+    if cpu is not None:
+        usages = cpu.cores
+        available = len(usages)
+        for position, index in cores:
+            if index < available:
+                row[position] = float(usages[index])
+    gpu = snapshot.get('gpu')
+    if gpu is not None and devices:
+        by_index = {d.index: d for d in gpu.devices}
+        for position, index, attr in devices:
+            device = by_index.get(index)
+            if device is not None:
+                value = getattr(device, attr)
+                if value is not None:
+                    row[position] = float(value)
+    return row
+
+
+@functools.lru_cache(maxsize=16)
+def _row_layout(fields):
+    """필드 튜플에서 각 값의 위치를 한 번만 계산합니다. (재생과 집계에서 레코드마다 쓰입니다)"""
+    position = {name: i for i, name in enumerate(fields)}
+    cores = []
+    while f'cpu_core_{len(cores)}' in position:
+        cores.append(position[f'cpu_core_{len(cores)}'])
+
+    sources = []
+    for source, sample_type in SAMPLE_TYPES.items():
+        names = [name for name, src, _ in BASE_FIELDS if src == source]
+        if names and all(name in position for name in names):
+            sources.append((source, sample_type, tuple(position[name] for name in names)))
+
+    devices = []
+    while f'gpu{len(devices)}_util' in position:
+        index = len(devices)
+        devices.append(tuple((attr, position[f'gpu{index}_{suffix}']) for suffix, attr in GPU_DEVICE_FIELDS.items()))
+    return position.get('cpu'), tuple(cores), tuple(sources), tuple(devices)
+
+
+def row_to_samples(fields, row):
+    """레코드 값을 Collector 이름별 값(namedtuple)으로 복원합니다."""
+    cpu_index, cores, sources, devices = _row_layout(tuple(fields))
+    result = {}
+    isnan = math.isnan
+
+    if cpu_index is not None and not isnan(row[cpu_index]):
+        result['cpu'] = CpuSample(row[cpu_index], tuple(row[i] for i in cores if not isnan(row[i])))
+
+    for source, sample_type, indices in sources:
+        values = [row[i] for i in indices]
+        if not any(isnan(v) for v in values):
+            result[source] = sample_type(*values)
+
+    if 'gpu' in result:
+        gpu_devices = []
+        for index, positions in enumerate(devices):
+            fields_of_device = {attr: None if isnan(row[i]) else row[i] for attr, i in positions}
+            error = 'not recorded' if fields_of_device['percent'] is None else None
+            gpu_devices.append(GpuDeviceSample(index, f'GPU {index}', error=error, **fields_of_device))
+        result['gpu'] = result['gpu']._replace(devices=tuple(gpu_devices))
+    return result
+
+
+class Recorder:
+    """Sampler 리스너로 동작하며 트리거 Collector가 게시될 때마다 한 레코드를 씁니다.
+
+    레코드는 메모리에 모았다가 flush_interval마다 별도 스레드에서 한 번에 씁니다. interval은
+    트리거 Collector의 실제 수집 주기로 헤더에 기록됩니다. 이미 있는 파일은 덮어쓰지 않고
+    FileExistsError를 냅니다.
+    """
+
+    def __init__(self, path, fields, interval, trigger='cpu', flush_interval=2.0):
+        self.path = path
+        self.fields = list(fields)
+        self.trigger = trigger
+        self.record_struct = struct.Struct(f'<d{len(self.fields)}f')
+        self._layout = record_layout(self.fields)
+        self.flush_interval = flush_interval
+        self._pending = bytearray()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+        self._file = open(path, 'xb')  # never truncate an earlier recording
+        self._file.write(MAGIC)
+        self._file.write(HEADER_STRUCT.pack(VERSION, FIELD_NAME_SIZE, len(self.fields), interval))
+        for field in self.fields:
+            self._file.write(field.encode('ascii').ljust(FIELD_NAME_SIZE, b'\x00'))
+        self._file.flush()
+
+        self._thread = threading.Thread(target=self._run, name="recorder", daemon=True)
+        self._thread.start()
+
+    def on_sample(self, name, sample, snapshot):
+        """Sampler.add_listener에 등록할 콜백입니다."""
+        if name != self.trigger:
+            return
+        record = self.record_struct.pack(sample.timestamp, *snapshot_to_row(snapshot, self.fields, self._layout))
+        with self._lock:
+            self._pending += record
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, bytearray()
+        if pending:
+            self._file.write(pending)
+            self._file.flush()
+
+    def _run(self):
+        while not self._stop_event.wait(self.flush_interval):
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"기록 파일 쓰기 오류: {e}", file=sys.stderr)
+
+    def close(self):
+        self._stop_event.set()
+        self._thread.join()
+        self.flush()
+        self._file.close()
+
+
+class RecordingFile:
+    """mmap으로 연 기록 파일. 레코드를 복사 없이 인덱스로 읽습니다."""
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self._mmap = None
+        try:
+            self._open(path)
+        except BaseException:
+            self.close()
+            raise
+
+    def _open(self, path):
+        if os.fstat(self._file.fileno()).st_size < len(MAGIC) + HEADER_STRUCT.size:
+            raise ValueError(f"기록 파일 형식이 아닙니다 (헤더보다 짧음): {path}")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"기록 파일 형식이 아닙니다: {path}")
+
+        version, name_size, field_count, self.interval = HEADER_STRUCT.unpack_from(self._mmap, len(MAGIC))
+        if version != VERSION:
+            raise ValueError(f"지원하지 않는 기록 파일 버전입니다: {version}")
+
+        offset = len(MAGIC) + HEADER_STRUCT.size
+        self.fields = []
+        for _ in range(field_count):
+            raw = self._mmap[offset:offset + name_size]
+            self.fields.append(raw.rstrip(b'\x00').decode('ascii'))
+            offset += name_size
+
+        self.header_size = offset
+        self.record_struct = struct.Struct(f'<d{field_count}f')
+        # A trailing partial record (e.g. from a crash mid-write) is ignored.
+        self.count = (len(self._mmap) - self.header_size) // self.record_struct.size
+
+    def __len__(self):
+        return self.count
+
+    def record(self, index):
+        """(타임스탬프, 값 튜플)을 반환합니다."""
+        values = self.record_struct.unpack_from(self._mmap, self.header_size + index * self.record_struct.size)
+        return values[0], values[1:]
+
+    def timestamp(self, index):
+        return struct.unpack_from('<d', self._mmap, self.header_size + index * self.record_struct.size)[0]
+
+    def index_at(self, timestamp):
+        """timestamp 이하인 마지막 레코드의 인덱스를 이진 탐색으로 찾습니다."""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.timestamp(mid) <= timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return max(lo - 1, 0)
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+
+class Replayer:
+    """기록 파일을 재생하며 Sampler와 같은 인터페이스(snapshot, add_listener)를 제공합니다.
+
+    speed 배율로 실시간보다 빠르게 재생할 수 있고 seek()로 임의 위치로 이동합니다.
+    """
+
+    def __init__(self, path, speed=1.0, loop=False):
+        self.recording = RecordingFile(path)
+        self.speed = speed
+        self.loop = loop
+        self.paused = False
+        self.snapshot = EMPTY_SNAPSHOT
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._index = 0
+        self._base_record_time = self.recording.timestamp(0) if len(self.recording) else 0.0
+        self._base_wall_time = time.monotonic()
+
+    @property
+    def start_time(self):
+        return self.recording.timestamp(0) if len(self.recording) else 0.0
+
+    @property
+    def end_time(self):
+        return self.recording.timestamp(len(self.recording) - 1) if len(self.recording) else 0.0
+
+    @property
+    def position(self):
+        """현재 재생 위치 (기록 시작 기준 초)."""
+        with self._lock:
+            return self._current_record_time() - self.start_time
+
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def start(self):
+        self._base_wall_time = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="replayer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.recording.close()
+
+    def seek(self, offset):
+        """기록 시작 기준 offset초 위치로 이동합니다."""
+        with self._lock:
+            target = min(max(self.start_time + offset, self.start_time), self.end_time)
+            self._index = self.recording.index_at(target)
+            self._base_record_time = self.recording.timestamp(self._index)
+            self._base_wall_time = time.monotonic()
+
+    def set_speed(self, speed):
+        with self._lock:
+            self._base_record_time = self._current_record_time()
+            self._base_wall_time = time.monotonic()
+            self.speed = speed
+
+    def toggle_pause(self):
+        with self._lock:
+            self._base_record_time = self._current_record_time()
+            self._base_wall_time = time.monotonic()
+            self.paused = not self.paused
+
+    def _current_record_time(self):
+        if self.paused:
+            return self._base_record_time
+        elapsed = (time.monotonic() - self._base_wall_time) * self.speed
+        return min(self._base_record_time + elapsed, self.end_time)
+
+    def _publish(self, index):
+        timestamp, row = self.recording.record(index)
+        samples = dict(self.snapshot.samples)
+        published = []
+        for name, value in row_to_samples(self.recording.fields, row).items():
+            sample = Sample(value, timestamp, None)
+            samples[name] = sample
+            published.append((name, sample))
+        snapshot = Snapshot(self.snapshot.generation + 1, MappingProxyType(samples))
+        self.snapshot = snapshot
+        for name, sample in published:
+            for listener in self._listeners:
+                try:
+                    listener(name, sample, snapshot)
+                except Exception as e:
+                    print(f"스냅샷 리스너 오류: {e}", file=sys.stderr)
+
+    def _next_index(self):
+        """지금 게시할 레코드 인덱스를 하나 꺼냅니다. 없으면 None."""
+        with self._lock:
+            if self._index < len(self.recording) and self.recording.timestamp(self._index) <= self._current_record_time():
+                index = self._index
+                self._index += 1
+                return index
+            if self._index >= len(self.recording) and self.loop and len(self.recording):
+                self._index = 0
+                self._base_record_time = self.start_time
+                self._base_wall_time = time.monotonic()
+            return None
+
+    def _run(self):
+        tick = 0.05
+        while not self._stop_event.wait(tick):
+            # Publish outside the lock: catching up after a seek can take a while, and position,
+            # seek and the speed controls are called from the UI thread every frame.
+            index = self._next_index()
+            while index is not None and not self._stop_event.is_set():
+                self._publish(index)
+                index = self._next_index()
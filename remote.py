@@ -0,0 +1,360 @@
+"""여러 호스트를 한 화면에서 보기 위한 에이전트/집계기.
+
+에이전트(--agent)는 창 없이 Sampler만 실행하고 스냅샷을 UDP 데이터그램으로 보냅니다.
+집계기(--aggregate)는 하나의 non-blocking selectors 루프로 여러 에이전트의
+데이터그램을 받아 호스트별 Snapshot을 만듭니다.
+
+값은 기록 파일과 같은 필드 목록(record_fields)을 쓰며 QUANT_SCALE 단위 정수로
+양자화합니다. 패킷 형식 (리틀 엔디언):
+    헤더  : MAGIC(2) + struct '<BBII' (버전, 종류, 세션 ID, 순번)
+    HELLO : 호스트 이름, 필드 수, 필드 이름 (각각 varint 길이 + UTF-8)
+    KEY   : '<d' 타임스탬프 + 필드마다 varint(zigzag(q) << 1 | NaN 여부)
+    DELTA : '<d' 타임스탬프 + '<I' 기준 KEY 순번 + 필드마다 varint(zigzag(q - 기준 q) << 1 | NaN 여부)
+DELTA는 직전 패킷이 아니라 마지막 KEY 기준이라 중간 패킷을 잃어도 다음 패킷은 복원됩니다.
+HELLO와 KEY는 KEYFRAME_INTERVAL 패킷마다 다시 보냅니다.
+"""
+import math
+import os
+import selectors
+import socket
+import struct
+import sys
+import threading
+import time
+from types import MappingProxyType
+
+from network import NetScale
+from recording import record_layout, row_to_samples, snapshot_to_row
+from sampler import Sample, Snapshot, EMPTY_SNAPSHOT
+
+MAGIC = b'WH'
+VERSION = 1
+HEADER_STRUCT = struct.Struct('<BBII')
+TIMESTAMP_STRUCT = struct.Struct('<d')
+KEY_SEQ_STRUCT = struct.Struct('<I')
+PACKET_HELLO, PACKET_KEY, PACKET_DELTA = 1, 2, 3
+
+DEFAULT_PORT = 47820
+QUANT_SCALE = 10           # 0.1 단위 (화면 표시 해상도)
+KEYFRAME_INTERVAL = 20
+MAX_DATAGRAM = 65507
+OFFLINE_AFTER = 3.0        # 이 시간(초) 동안 패킷이 없으면 오프라인으로 표시
+
+
+def parse_address(text, default_host='0.0.0.0'):
+    """'host:port' 또는 'port'를 (host, port) 튜플로 변환합니다."""
+    host, sep, port = text.rpartition(':')
+    if not sep:
+        host, port = default_host, text
+    return host or default_host, int(port)
+
+
+def encode_varints(values, out):
+    for value in values:
+        while value >= 0x80:
+            out.append((value & 0x7f) | 0x80)
+            value >>= 7
+        out.append(value)
+
+
+def decode_varints(data, offset, count):
+    """offset부터 count개의 varint를 읽어 (값 목록, 다음 offset)을 반환합니다."""
+    # Fast path: small deltas are all single-byte varints.
+    chunk = data[offset:offset + count]
+    if len(chunk) == count and (not count or max(chunk) < 0x80):
+        return list(chunk), offset + count
+    values = []
+    append = values.append
+    value = shift = 0
+    end = len(data)
+    while len(values) < count:
+        if offset >= end:
+            raise ValueError("잘린 패킷입니다.")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            append(value)
+            value = shift = 0
+    return values, offset
+
+
+def _encode_string(text, out):
+    raw = text.encode('utf-8')
+    encode_varints((len(raw),), out)
+    out += raw
+
+
+def _decode_string(data, offset):
+    (length,), offset = decode_varints(data, offset, 1)
+    return bytes(data[offset:offset + length]).decode('utf-8'), offset + length
+
+
+def quantize(row):
+    """float 목록을 정수 목록으로 양자화합니다. NaN은 None입니다."""
+    return [None if math.isnan(v) else round(v * QUANT_SCALE) for v in row]
+
+
+def _zigzag_flagged(q, base):
+    if q is None:
+        return 1
+    delta = q - base
+    return ((delta << 1) ^ (delta >> 63)) << 1
+
+
+class SnapshotEncoder:
+    """한 에이전트의 행(row)을 HELLO/KEY/DELTA 데이터그램으로 인코딩합니다."""
+
+    def __init__(self, host, fields, keyframe_interval=KEYFRAME_INTERVAL, session=None):
+        self.host = host
+        self.fields = list(fields)
+        self.keyframe_interval = keyframe_interval
+        self.session = session if session is not None else int.from_bytes(os.urandom(4), 'little')
+        self.seq = 0
+        self._key = None
+        self._key_seq = 0
+        hello = bytearray(MAGIC)
+        hello += HEADER_STRUCT.pack(VERSION, PACKET_HELLO, self.session, 0)
+        _encode_string(host, hello)
+        encode_varints((len(self.fields),), hello)
+        for field in self.fields:
+            _encode_string(field, hello)
+        self.hello = bytes(hello)
+
+    def encode(self, timestamp, row):
+        """보낼 데이터그램 목록을 반환합니다. 키프레임 주기에는 HELLO와 KEY를 함께 보냅니다."""
+        q = quantize(row)
+        self.seq += 1
+        packets = []
+        out = bytearray(MAGIC)
+        if self._key is None or self.seq - self._key_seq >= self.keyframe_interval:
+            self._key, self._key_seq = q, self.seq
+            packets.append(self.hello)
+            out += HEADER_STRUCT.pack(VERSION, PACKET_KEY, self.session, self.seq)
+            out += TIMESTAMP_STRUCT.pack(timestamp)
+            encode_varints([_zigzag_flagged(v, 0) for v in q], out)
+        else:
+            out += HEADER_STRUCT.pack(VERSION, PACKET_DELTA, self.session, self.seq)
+            out += TIMESTAMP_STRUCT.pack(timestamp)
+            out += KEY_SEQ_STRUCT.pack(self._key_seq)
+            encode_varints([_zigzag_flagged(v, k if k is not None else 0) for v, k in zip(q, self._key)], out)
+        packets.append(bytes(out))
+        return packets
+
+
+def _unflag(values, base):
+    """(zigzag(delta) << 1 | NaN) 목록을 양자화된 정수 목록으로 복원합니다. NaN은 None입니다."""
+    quantized = []
+    for value, key in zip(values, base):
+        if value & 1:
+            quantized.append(None)
+            continue
+        value >>= 1
+        quantized.append((key or 0) + ((value >> 1) ^ -(value & 1)))
+    return quantized
+
+
+class HostState:
+    """집계기가 보관하는 한 호스트의 상태."""
+
+    def __init__(self, name, session, fields):
+        self.name = name
+        self.session = session
+        self.fields = fields
+        self.snapshot = EMPTY_SNAPSHOT
+        self.last_seen = 0.0   # time.monotonic()
+        self.last_seq = 0
+        self.packets = 0
+        self.lost = 0
+        self.net_scale = NetScale()
+        self._key = None       # quantized values of the last KEY
+        self._key_seq = None
+
+    def is_offline(self, now=None):
+        now = time.monotonic() if now is None else now
+        return now - self.last_seen > OFFLINE_AFTER
+
+    def apply(self, packet_type, seq, data, offset):
+        """KEY/DELTA 패킷을 적용합니다. 기준 KEY가 없으면 False를 반환합니다."""
+        if seq <= self.last_seq:
+            # Reordered or duplicate datagram: keep the newer state, and above all do not let a late
+            # KEY replace the key that later DELTAs refer to.
+            return True
+        (timestamp,) = TIMESTAMP_STRUCT.unpack_from(data, offset)
+        offset += TIMESTAMP_STRUCT.size
+        if packet_type == PACKET_DELTA:
+            (key_seq,) = KEY_SEQ_STRUCT.unpack_from(data, offset)
+            offset += KEY_SEQ_STRUCT.size
+            if key_seq != self._key_seq:
+                return False
+        values, _ = decode_varints(data, offset, len(self.fields))
+        if packet_type == PACKET_KEY:
+            quantized = self._key = _unflag(values, [0] * len(values))
+            self._key_seq = seq
+        else:
+            quantized = _unflag(values, self._key)
+        row = [math.nan if q is None else q / QUANT_SCALE for q in quantized]
+
+        if self.last_seq:
+            self.lost += seq - self.last_seq - 1
+        self.last_seq = seq
+        samples = {name: Sample(value, timestamp, None)
+                   for name, value in row_to_samples(self.fields, row).items()}
+        self.snapshot = Snapshot(seq, MappingProxyType(samples))
+        if 'net' in samples:
+            self.net_scale.on_sample('net', samples['net'], self.snapshot)
+        return True
+
+
+class Aggregator:
+    """여러 에이전트의 데이터그램을 한 스레드의 selectors 루프로 받습니다.
+
+    Sampler와 같은 snapshot/add_listener/start/stop 인터페이스를 제공합니다. snapshot의
+    샘플 이름은 '호스트:Collector' 형식이고, 호스트별 상태는 hosts에 도착 순서대로 있습니다.
+    리스너는 패킷 묶음을 처리할 때마다 listener(호스트 이름, None, snapshot)로 호출됩니다.
+    """
+
+    def __init__(self, address=('0.0.0.0', DEFAULT_PORT)):
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        self._socket.bind(address)
+        self._socket.setblocking(False)
+        self.address = self._socket.getsockname()
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._socket, selectors.EVENT_READ)
+        self._hosts = {}
+        self.hosts = ()
+        self.snapshot = EMPTY_SNAPSHOT
+        self.packets = 0
+        self.bytes = 0
+        self.errors = 0
+        self.busy_ns = 0
+        self._listeners = []
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="aggregator", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self._selector.close()
+        self._socket.close()
+
+    def handle_datagram(self, data):
+        """데이터그램 하나를 처리하고 갱신된 호스트 이름을 반환합니다. 처리할 수 없으면 None."""
+        if len(data) < len(MAGIC) + HEADER_STRUCT.size or data[:len(MAGIC)] != MAGIC:
+            return None
+        version, packet_type, session, seq = HEADER_STRUCT.unpack_from(data, len(MAGIC))
+        if version != VERSION:
+            return None
+        offset = len(MAGIC) + HEADER_STRUCT.size
+
+        if packet_type == PACKET_HELLO:
+            name, offset = _decode_string(data, offset)
+            (count,), offset = decode_varints(data, offset, 1)
+            fields = []
+            for _ in range(count):
+                field, offset = _decode_string(data, offset)
+                fields.append(field)
+            state = self._hosts.get(session)
+            if state is None or state.fields != fields:
+                self._hosts[session] = HostState(name, session, fields)
+                # An agent restart shows up as a new session with the same host name.
+                for other in [s for s, h in self._hosts.items() if h.name == name and s != session]:
+                    del self._hosts[other]
+                self.hosts = tuple(self._hosts.values())
+            return None
+
+        state = self._hosts.get(session)
+        if state is None or packet_type not in (PACKET_KEY, PACKET_DELTA):
+            return None
+        if not state.apply(packet_type, seq, data, offset):
+            return None
+        state.last_seen = time.monotonic()
+        state.packets += 1
+        return state.name
+
+    def _publish(self):
+        samples = {}
+        for state in self.hosts:
+            for name, sample in state.snapshot.samples.items():
+                samples[f"{state.name}:{name}"] = sample
+        self.snapshot = Snapshot(self.snapshot.generation + 1, MappingProxyType(samples))
+
+    def poll(self, timeout):
+        """timeout(초)까지 기다린 뒤 받을 수 있는 데이터그램을 모두 처리합니다. 갱신된 호스트 집합을 반환합니다."""
+        updated = set()
+        if not self._selector.select(timeout):
+            return updated
+        started = time.perf_counter_ns()
+        while True:
+            try:
+                data = self._socket.recv(MAX_DATAGRAM)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as e:
+                print(f"집계기 수신 오류: {e}", file=sys.stderr)
+                break
+            self.packets += 1
+            self.bytes += len(data)
+            try:
+                host = self.handle_datagram(data)
+            except (ValueError, struct.error, UnicodeDecodeError):
+                self.errors += 1
+                continue
+            if host is not None:
+                updated.add(host)
+        if updated:
+            self._publish()
+            for listener in self._listeners:
+                for host in updated:
+                    try:
+                        listener(host, None, self.snapshot)
+                    except Exception as e:
+                        print(f"스냅샷 리스너 오류: {e}", file=sys.stderr)
+        self.busy_ns += time.perf_counter_ns() - started
+        return updated
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self.poll(0.5)
+
+
+class AgentSender:
+    """Sampler 리스너로 동작하며 트리거 Collector가 게시될 때 interval마다 스냅샷을 보냅니다."""
+
+    def __init__(self, address, fields, host=None, trigger='cpu', interval=0.5):
+        self.address = address
+        self.trigger = trigger
+        self.interval = interval
+        self.encoder = SnapshotEncoder(host or socket.gethostname(), fields)
+        self._layout = record_layout(self.encoder.fields)
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._next_send = 0.0
+
+    def on_sample(self, name, sample, snapshot):
+        """Sampler.add_listener에 등록할 콜백입니다."""
+        if name != self.trigger:
+            return
+        now = time.monotonic()
+        if now < self._next_send:
+            return
+        self._next_send = now + self.interval
+        for packet in self.encoder.encode(sample.timestamp, snapshot_to_row(snapshot, self.encoder.fields, self._layout)):
+            try:
+                self._socket.sendto(packet, self.address)
+            except OSError as e:
+                print(f"에이전트 전송 오류: {e}", file=sys.stderr)
+                break
+
+    def close(self):
+        self._socket.close()
@@ -0,0 +1,115 @@
+"""변화가 있을 때만 프레임을 그리는 렌더 스케줄러."""
+import threading
+import time
+
+from collectors import sample_metrics
+
+# Metrics shown as "x.y" text (including per-device disk_read_<dev>); everything else is a 0-100 percentage.
+RATE_METRICS = ('net_up', 'net_down', 'disk_read', 'disk_write')
+PERCENT_STEP = 1.0
+RATE_STEP = 0.1
+
+
+def _quantized(name, sample):
+    """샘플 값을 화면에 보이는 해상도로 양자화한 튜플."""
+    if sample.value is None:
+        return ()
+    # Aggregated snapshots prefix collector names with 'host:'.
+    values = tuple(int(v // (RATE_STEP if metric.startswith(RATE_METRICS) else PERCENT_STEP))
+                   for metric, v in sample_metrics(name.rpartition(':')[2], sample.value))
+    return values or (sample.value,)  # no numeric metrics (process table): compare the value itself
+
+
+class RenderScheduler:
+    """스냅샷이 화면에 보일 만큼 바뀌었거나 창이 다시 그려져야 할 때만 렌더링을 허용합니다.
+
+    변화가 몰릴 때는 max_fps로 제한하고, 화면이 정적이면 idle_fps로 떨어집니다.
+    메인 루프는 wait_timeout()만큼 glfw.wait_events_timeout으로 대기합니다.
+    """
+
+    def __init__(self, max_fps=30.0, idle_fps=1.0):
+        self.min_interval = 1.0 / max_fps
+        self.idle_interval = 1.0 / idle_fps
+        self._last_render = 0.0
+        self._dirty = True
+        self._pending = False
+        self._seen_generation = None
+        self._key_parts = {}  # collector name -> (sample, quantized values)
+        self._shown_key = None
+        self._latest_key = None
+        self._wake_lock = threading.Lock()
+        self._wake_posted = False  # a wake() is in flight; the loop has not come back to wait_timeout()
+        self._wake_missed = False  # a visible change arrived while a wake() was in flight
+
+    def wake_listener(self, wake):
+        """Sampler 리스너를 반환합니다. 화면에 보이는 값이 바뀐 샘플에서만 wake()를 부릅니다.
+
+        메인 루프가 깨어나 wait_timeout()을 다시 부를 때까지는 한 번만 부르고, 그 사이에 온
+        변화는 기억해 두었다가 wait_timeout()이 기다리지 않고 바로 돌아가게 합니다. 리스너는
+        샘플러 스레드에서 돌므로 메인 루프의 캐시와는 따로 값을 기억합니다.
+        """
+        last = {}
+
+        def listener(name, sample, snapshot):
+            if sample is not None:  # the aggregator passes None for a batch of host updates
+                values = _quantized(name, sample)
+                if last.get(name) == values:
+                    return
+                last[name] = values
+            with self._wake_lock:
+                if self._wake_posted:
+                    # The loop may already have checked this frame's snapshot; make it look again.
+                    self._wake_missed = True
+                    return
+                self._wake_posted = True
+            wake()
+        return listener
+
+    def mark_dirty(self):
+        """창 크기 변경, 노출, 입력 등으로 다시 그려야 할 때 호출합니다."""
+        self._dirty = True
+
+    def _visual_key(self, snapshot):
+        """화면에 보이는 해상도로 양자화한 값들의 튜플. 바뀐 Collector만 다시 계산합니다."""
+        parts = []
+        for name in sorted(snapshot.samples):
+            sample = snapshot.samples[name]
+            cached = self._key_parts.get(name)
+            if cached is None or cached[0] is not sample:
+                cached = self._key_parts[name] = (sample, _quantized(name, sample))
+            parts.append(cached[1])
+        return tuple(parts)
+
+    def should_render(self, snapshot, now=None):
+        now = time.monotonic() if now is None else now
+        if snapshot.generation != self._seen_generation:
+            self._seen_generation = snapshot.generation
+            self._latest_key = self._visual_key(snapshot)
+            if self._latest_key != self._shown_key:
+                self._pending = True
+
+        elapsed = now - self._last_render
+        if elapsed >= self.idle_interval:
+            return True
+        return (self._dirty or self._pending) and elapsed >= self.min_interval
+
+    def rendered(self, now=None):
+        """프레임을 그린 직후 호출합니다."""
+        self._last_render = time.monotonic() if now is None else now
+        self._dirty = False
+        self._pending = False
+        self._shown_key = self._latest_key
+
+    def wait_timeout(self, now=None):
+        """다음 렌더링 기회까지 이벤트를 기다릴 시간(초)을 반환합니다."""
+        with self._wake_lock:
+            self._wake_posted = False  # the loop is about to wait: the next visible change must wake it
+            missed, self._wake_missed = self._wake_missed, False
+        if missed:
+            return 0.0  # a change arrived after should_render() looked at the snapshot
+        now = time.monotonic() if now is None else now
+        if self._dirty or self._pending:
+            deadline = self._last_render + self.min_interval
+        else:
+            deadline = self._last_render + self.idle_interval
+        return max(deadline - now, 0.0)
@@ -0,0 +1,396 @@
+"""여러 해상도의 메트릭 롤업과 화면 폭에 맞춘 장기 구간 조회.
+
+샘플마다 가장 고운 단계(1초)의 현재 버킷에 min/max/합/개수만 더하고, 버킷이 닫힐 때
+그 요약을 다음 단계(10초, 1분, 10분)로 넘깁니다. 그래서 샘플 하나의 비용은 단계마다
+O(1)이고, 각 단계는 고정 크기 링이라 메모리는 메트릭 수에만 비례합니다. 샘플이 없던
+구간의 버킷은 NaN으로 남습니다.
+
+조회(query)는 구간과 픽셀 폭을 받아, 그 구간을 덮는 가장 고운 단계를 고른 뒤 LTTB나
+픽셀별 min/max로 줄인 시계열을 돌려줍니다. 조회에는 NumPy가 필요합니다.
+"""
+import math
+from array import array
+from collections import namedtuple
+
+from collectors import MetricBudget, metric_family, sample_metrics
+
+# (bucket seconds, bucket count): 15 min at 1 s, 6 h at 10 s, 24 h at 1 min, 7 days at 10 min
+TIERS = ((1, 900), (10, 2160), (60, 1440), (600, 1008))
+MAX_BUCKETS_PER_POINT = 4   # 조회할 때 한 점(픽셀)에 이보다 많은 버킷이 들어가면 더 거친 단계를 씁니다.
+RESET_BACKSTEP = 60.0       # 시각이 이만큼(초) 넘게 뒤로 가면 (재생 되감기 등) 그 메트릭을 비우고 다시 시작합니다.
+QUERY_METHODS = ('lttb', 'minmax')
+MAX_DETAIL_METRICS = 64     # 코어/GPU/NIC/디스크/마운트별 메트릭은 종류마다 이 개수까지만 롤업합니다. (집계 메트릭은 항상)
+IDLE_SECONDS = 600.0        # 이만큼 샘플이 없던 코어/NIC/장치/마운트별 메트릭은 버립니다.
+SWEEP_INTERVAL = 60.0
+
+# times: bucket start (lttb) or pixel column start (minmax), in the samples' clock.
+# values: bucket averages; low/high: bucket min/max. Empty minmax columns are NaN.
+RollupSeries = namedtuple('RollupSeries', ['times', 'values', 'low', 'high', 'resolution'])
+
+NAN = float('nan')
+
+
+class _Tier:
+    """한 해상도의 링. 닫힌 버킷은 mins/maxs/avgs의 (버킷 번호 % capacity) 칸에 있습니다."""
+    __slots__ = ('resolution', 'capacity', 'mins', 'maxs', 'avgs', 'first', 'current', 'low', 'high', 'total', 'count')
+
+    def __init__(self, resolution, capacity):
+        self.resolution = resolution
+        self.capacity = capacity
+        self.mins = array('f', [NAN]) * capacity
+        self.maxs = array('f', [NAN]) * capacity
+        self.avgs = array('f', [NAN]) * capacity
+        self.first = None    # first bucket ever seen
+        self.current = None  # bucket being accumulated (not in the ring yet)
+        self.low = self.high = self.total = 0.0
+        self.count = 0
+
+    @property
+    def oldest(self):
+        """링에 남아 있는 가장 오래된 버킷 번호."""
+        return max(self.first, self.current - self.capacity + 1)
+
+    def clear(self, start, stop):
+        """샘플이 없던 버킷 start..stop-1을 NaN으로 채웁니다."""
+        capacity = self.capacity
+        for gap in range(start, min(stop, start + capacity)):
+            slot = gap % capacity
+            self.mins[slot] = self.maxs[slot] = self.avgs[slot] = NAN
+
+
+class MetricRollup:
+    """메트릭 하나의 단계별 링 모음."""
+
+    def __init__(self, tiers=TIERS):
+        self.tier_spec = tuple(tiers)
+        self.tiers = [_Tier(resolution, capacity) for resolution, capacity in self.tier_spec]
+        self.latest = None
+
+    def __len__(self):
+        """받은 샘플 수가 아니라 가장 고운 단계에 있는 버킷 수."""
+        tier = self.tiers[0]
+        return 0 if tier.current is None else tier.current - tier.oldest + 1
+
+    def add(self, timestamp, value):
+        tier = self.tiers[0]
+        bucket = int(timestamp // tier.resolution)
+        if bucket == tier.current:  # common case: same second as the last sample
+            if value < tier.low:
+                tier.low = value
+            elif value > tier.high:
+                tier.high = value
+            tier.total += value
+            tier.count += 1
+            if timestamp > self.latest:
+                self.latest = timestamp
+            return
+        if self.latest is not None and timestamp < self.latest - RESET_BACKSTEP:
+            self.tiers = [_Tier(resolution, capacity) for resolution, capacity in self.tier_spec]
+            self.latest = None
+        if self.latest is None or timestamp > self.latest:
+            self.latest = timestamp
+        self._merge(timestamp, value, value, value, 1)
+
+    def _merge(self, timestamp, low, high, total, count):
+        """값을 가장 고운 단계에 더하고, 닫힌 버킷을 다음 단계로 넘깁니다."""
+        for tier in self.tiers:
+            resolution = tier.resolution
+            bucket = int(timestamp // resolution)
+            current = tier.current
+            if current is None:
+                tier.first = tier.current = bucket
+                tier.low, tier.high, tier.total, tier.count = low, high, total, count
+                return
+            if bucket <= current:  # same bucket, or a small clock step back: fold into the current one
+                if low < tier.low:
+                    tier.low = low
+                if high > tier.high:
+                    tier.high = high
+                tier.total += total
+                tier.count += count
+                return
+            # Close the current bucket into the ring and hand its summary to the next tier.
+            closed_low, closed_high, closed_total, closed_count = tier.low, tier.high, tier.total, tier.count
+            slot = current % tier.capacity
+            tier.mins[slot] = closed_low
+            tier.maxs[slot] = closed_high
+            tier.avgs[slot] = closed_total / closed_count
+            if bucket > current + 1:
+                tier.clear(current + 1, bucket)
+            tier.current = bucket
+            tier.low, tier.high, tier.total, tier.count = low, high, total, count
+            timestamp, low, high, total, count = current * resolution, closed_low, closed_high, closed_total, closed_count
+
+    def window(self, index, start, end, tiers=None):
+        """index번째 단계에서 [start, end)에 걸친 버킷들의 (첫 버킷 번호, mins, maxs, avgs) NumPy 배열.
+
+        아직 다음 단계로 넘어가지 않은 더 고운 단계의 진행 중인 버킷도 해당 버킷에 합칩니다.
+        tiers는 select()에 넘긴 것과 같은 목록이어야 합니다. (기본: 지금의 self.tiers)
+        """
+        import numpy as np
+
+        tiers = self.tiers if tiers is None else tiers
+        tier = tiers[index]
+        resolution = tier.resolution
+        # Open accumulators: this tier's own, plus finer tiers' that have not cascaded up yet.
+        pending = {}
+        for source in tiers[:index + 1]:
+            if source.current is None or not source.count:
+                continue
+            bucket = int(source.current * source.resolution // resolution)
+            merged = pending.get(bucket)
+            if merged is None:
+                pending[bucket] = [source.low, source.high, source.total, source.count]
+            else:
+                merged[0] = min(merged[0], source.low)
+                merged[1] = max(merged[1], source.high)
+                merged[2] += source.total
+                merged[3] += source.count
+        first = max(math.floor(start / resolution), tier.oldest)
+        last = min(math.ceil(end / resolution) - 1, max(pending, default=first - 1))
+        if last < first:
+            empty = np.empty(0, dtype=np.float32)
+            return first, empty, empty, empty
+        closed = np.arange(first, min(last + 1, tier.current)) % tier.capacity
+        columns = []
+        for ring in (tier.mins, tier.maxs, tier.avgs):
+            values = np.full(last + 1 - first, np.nan, dtype=np.float32)
+            values[:len(closed)] = np.frombuffer(ring, dtype=np.float32)[closed]
+            columns.append(values)
+        mins, maxs, avgs = columns
+        for bucket, (low, high, total, count) in pending.items():
+            if first <= bucket <= last:
+                mins[bucket - first] = low
+                maxs[bucket - first] = high
+                avgs[bucket - first] = total / count
+        return first, mins, maxs, avgs
+
+    def select(self, start, end, width, tiers=None):
+        """[start, end)를 width개 점으로 그릴 때 쓸 단계의 인덱스. 구간을 덮는 가장 고운 단계를 고릅니다.
+
+        데이터가 없으면 (예: 되감기로 막 비워진 직후) None을 반환합니다.
+        """
+        tiers = self.tiers if tiers is None else tiers
+        chosen = None
+        slack = (end - start) / width  # missing less than one point's worth at the far end is invisible
+        for index, tier in enumerate(tiers):
+            if tier.current is None:
+                break  # coarser tiers have no closed bucket yet
+            chosen = index
+            covered = start + slack >= tier.oldest * tier.resolution or tier.oldest == tier.first
+            buckets = (min(end, (tier.current + 1) * tier.resolution) - max(start, tier.oldest * tier.resolution)) / tier.resolution
+            if covered and buckets <= width * MAX_BUCKETS_PER_POINT:
+                return index
+        return chosen
+
+
+class RollupStore:
+    """메트릭 이름별 MetricRollup 모음. Sampler 리스너로 등록해 사용합니다.
+
+    메모리는 메트릭마다 단계별 버킷 수 x 12바이트로 고정입니다. (기본 TIERS로 약 66KB)
+    집계 메트릭(cpu, net_up 등) 외의 메트릭은 종류(코어, NIC 등)마다 max_detail개까지만 두고, idle_seconds 동안
+    샘플이 없던 것은 버리므로 인터페이스가 생겼다 사라져도 메모리는 늘지 않습니다.
+    """
+
+    def __init__(self, tiers=TIERS, max_detail=MAX_DETAIL_METRICS, idle_seconds=IDLE_SECONDS):
+        self.tiers = tuple(tiers)
+        self.max_detail = max_detail
+        self.idle_seconds = idle_seconds
+        self._metrics = {}
+        self._budget = MetricBudget(max_detail, "롤업")
+        self._views = {}
+        self._swept = -math.inf
+        self.latest_time = None  # 가장 최근 샘플의 시각 (재생 중이면 기록된 시각)
+
+    def __contains__(self, name):
+        return name in self._metrics
+
+    def names(self):
+        return list(self._metrics)
+
+    def memory_bytes(self):
+        return len(self._metrics) * sum(capacity for _, capacity in self.tiers) * 3 * 4
+
+    def add(self, metric, timestamp, value):
+        rollup = self._metrics.get(metric)
+        if rollup is None:
+            if not self._budget.admit(metric):
+                return  # this family is full until sweep() drops an idle one
+            rollup = self._metrics[metric] = MetricRollup(self.tiers)
+        rollup.add(timestamp, value)
+        self.latest_time = timestamp
+
+    def sweep(self, now):
+        """now 기준 idle_seconds 동안 샘플이 없던 코어/NIC/장치/마운트별 메트릭을 버립니다."""
+        self._swept = now
+        cutoff = now - self.idle_seconds
+        for metric in [metric for metric, rollup in self._metrics.items()
+                       if rollup.latest < cutoff and metric_family(metric) is not None]:
+            self._budget.release(metric)
+            del self._metrics[metric]
+
+    def on_sample(self, name, sample, snapshot):
+        """Sampler.add_listener에 등록할 콜백입니다."""
+        if sample.error is not None or sample.value is None:
+            return
+        timestamp = sample.timestamp
+        for metric, value in sample_metrics(name, sample.value):
+            self.add(metric, timestamp, value)
+        if not self._swept <= timestamp < self._swept + SWEEP_INTERVAL:
+            self.sweep(timestamp)
+
+    def query(self, metric, start, end, width, method='lttb'):
+        """metric의 [start, end) 구간을 최대 width개 점으로 줄인 RollupSeries. 데이터가 없으면 None.
+
+        method='lttb'는 버킷 평균에 Largest-Triangle-Three-Buckets를 적용해 모양을 살린 점들을,
+        'minmax'는 픽셀 열마다 평균과 min/max를 돌려줍니다. (열 수 = width, 빈 열은 NaN)
+        """
+        if method not in QUERY_METHODS:
+            raise ValueError(f"알 수 없는 조회 방식: {method} (가능: {', '.join(QUERY_METHODS)})")
+        rollup = self._metrics.get(metric)
+        if rollup is None or rollup.latest is None or width < 1 or end <= start:
+            return None
+        # The sampler thread replaces rollup.tiers when the clock jumps back (replay seek or loop);
+        # use one list for the whole query.
+        tiers = rollup.tiers
+        index = rollup.select(start, end, width, tiers)
+        if index is None:
+            return None
+        tier = tiers[index]
+        first, mins, maxs, avgs = rollup.window(index, start, end, tiers)
+        if method == 'minmax':
+            return _minmax(first, mins, maxs, avgs, tier.resolution, start, end, width)
+        return _lttb(first, mins, maxs, avgs, tier.resolution, width)
+
+    def view(self, metric, span):
+        """최근 span초를 보여 주는 RollupView (같은 인자면 같은 객체)."""
+        key = (metric, span)
+        view = self._views.get(key)
+        if view is None:
+            view = self._views[key] = RollupView(self, metric, span)
+        return view
+
+
+def _minmax(first, mins, maxs, avgs, resolution, start, end, width):
+    """픽셀 열마다 버킷을 모읍니다. 버킷이 열보다 넓으면 그 버킷이 여러 열에 그대로 들어갑니다."""
+    import numpy as np
+
+    column = (end - start) / width
+    edges = start + np.arange(width) * column
+    result = np.full((3, width), np.nan, dtype=np.float32)
+    count = len(avgs)
+    if count:
+        # Column c takes the buckets from its own start to the next column's; reduceat returns
+        # a single element where consecutive indices are equal.
+        index = np.floor(edges / resolution).astype(np.int64) - first
+        valid = (edges + column > first * resolution) & (index < count)
+        index = np.clip(index, 0, count - 1)
+        present = ~np.isnan(avgs)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            low = np.fmin.reduceat(mins, index)
+            high = np.fmax.reduceat(maxs, index)
+            mean = np.add.reduceat(np.where(present, avgs, 0), index) / np.add.reduceat(present, index)
+        for row, values in enumerate((mean, low, high)):
+            result[row, valid] = values[valid]
+    return RollupSeries(edges, result[0], result[1], result[2], resolution)
+
+
+def _lttb(first, mins, maxs, avgs, resolution, width):
+    """빈 버킷을 뺀 버킷 평균에 LTTB를 적용합니다. 점이 width개 이하면 그대로 돌려줍니다."""
+    import numpy as np
+
+    present = np.flatnonzero(~np.isnan(avgs))
+    times = (first + present) * float(resolution)
+    values = avgs[present]
+    if len(present) > width > 2:
+        selected = lttb_indices(times.tolist(), values.tolist(), width)
+        present, times, values = present[selected], times[selected], values[selected]
+    elif width <= 2 < len(present):
+        keep = [0, len(present) - 1][:width]
+        present, times, values = present[keep], times[keep], values[keep]
+    return RollupSeries(times, values, mins[present], maxs[present], resolution)
+
+
+def lttb_indices(xs, ys, threshold):
+    """Largest-Triangle-Three-Buckets: 모양을 가장 잘 살리는 threshold개 점의 인덱스 목록.
+
+    처음과 끝 점은 항상 남기고, 나머지를 threshold - 2개 구간으로 나눠 구간마다 직전에 고른
+    점과 다음 구간 평균이 이루는 삼각형의 넓이가 가장 큰 점을 고릅니다.
+    """
+    count = len(xs)
+    if threshold >= count or threshold < 3:
+        return list(range(count))
+    every = (count - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, count)
+        # Average of the next bucket (the last point for the final bucket).
+        span = next_end - end
+        if span > 0:
+            avg_x = sum(xs[end:next_end]) / span
+            avg_y = sum(ys[end:next_end]) / span
+        else:
+            avg_x, avg_y = xs[-1], ys[-1]
+        ax, ay = xs[a], ys[a]
+        dx, dy = ax - avg_x, avg_y - ay
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs(dx * (ys[j] - ay) + (xs[j] - ax) * dy)
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(count - 1)
+    return selected
+
+
+class RollupView:
+    """draw_history_graph가 RingBuffer 대신 쓸 수 있는 최근 span초 보기.
+
+    values(count)는 count // 2개 픽셀 열의 min, max를 번갈아 담은 목록이라, 2px 간격으로 그리면
+    각 열의 봉우리와 골이 그대로 남습니다. 데이터가 시작되기 전의 열은 빼고, 중간에 빈 열은 앞 값으로 채웁니다.
+    결과는 오른쪽 끝이 한 열 이상 움직일 때만 다시 계산합니다.
+    """
+
+    def __init__(self, store, metric, span):
+        self.store = store
+        self.metric = metric
+        self.span = span
+        self._key = None
+        self._values = []
+
+    def __len__(self):
+        return len(self._values)
+
+    def values(self, count=None):
+        end = self.store.latest_time
+        if end is None or not count:
+            return []
+        columns = max(count // 2, 1)
+        column = self.span / columns
+        key = (columns, int(end // column))
+        if key != self._key:
+            self._key = key
+            end = (key[1] + 1) * column  # snap to the column grid so cached frames line up
+            series = self.store.query(self.metric, end - self.span, end, columns, method='minmax')
+            self._values = _envelope(series) if series is not None else []
+        return self._values
+
+
+def _envelope(series):
+    import numpy as np
+
+    points = np.empty(2 * len(series.low), dtype=np.float32)
+    points[0::2] = series.low
+    points[1::2] = series.high
+    present = np.flatnonzero(~np.isnan(points))
+    if not len(present):
+        return []
+    # Forward-fill interior gaps: sources sampled slower than the finest tier leave empty buckets.
+    filled = np.zeros(len(points), dtype=np.int64)
+    filled[present] = present
+    np.maximum.accumulate(filled, out=filled)
+    return points[filled[present[0]:]].tolist()
@@ -0,0 +1,133 @@
+"""백그라운드 메트릭 수집 스케줄러.
+
+각 Collector는 자신의 스레드에서 고유한 주기로 실행되며, 결과는 불변 Snapshot으로
+게시됩니다. 렌더러는 `Sampler.snapshot` 속성을 읽기만 하므로 락이 필요 없습니다.
+"""
+import sys
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+# value: 수집된 값 (오류 시 None), timestamp: time.time() 기준 수집 시각,
+# error: 오류 문자열 또는 None ('timeout'이면 value는 마지막 정상 값)
+Sample = namedtuple('Sample', ['value', 'timestamp', 'error'])
+
+
+class Snapshot(namedtuple('Snapshot', ['generation', 'samples'])):
+    """특정 시점의 모든 Collector 결과. 게시 후에는 절대 변경되지 않습니다."""
+    __slots__ = ()
+
+    def get(self, name, default=None):
+        """이름에 해당하는 값을 반환합니다. 값이 없으면 default를 반환합니다."""
+        sample = self.samples.get(name)
+        if sample is None or sample.value is None:
+            return default
+        return sample.value
+
+    def is_stale(self, name):
+        """마지막 수집이 실패했거나 시간 초과된 경우 True를 반환합니다."""
+        sample = self.samples.get(name)
+        return sample is None or sample.error is not None
+
+
+EMPTY_SNAPSHOT = Snapshot(0, MappingProxyType({}))
+
+
+class Collector:
+    """이름, 수집 함수, 주기(초), 시간 제한(초)을 묶은 수집 작업."""
+
+    def __init__(self, name, func, interval, timeout=None):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.timeout = timeout if timeout is not None else max(interval * 5, 1.0)
+
+
+class Sampler:
+    """Collector마다 전용 데몬 스레드를 두고 결과를 Snapshot으로 게시합니다.
+
+    하나의 Collector가 멈춰도 다른 Collector와 UI는 영향을 받지 않습니다.
+    감시 스레드가 시간 제한을 넘긴 호출을 찾아 'timeout' 오류로 표시합니다.
+    """
+
+    def __init__(self, collectors):
+        self._collectors = list(collectors)
+        self._listeners = []
+        self._publish_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._threads = []
+        self._inflight = {}  # name -> 호출 시작 시각 (monotonic)
+        self.snapshot = EMPTY_SNAPSHOT
+
+    def add_listener(self, listener):
+        """게시될 때마다 listener(name, sample, snapshot)를 호출합니다.
+
+        리스너는 게시 락 안에서 순서대로 호출되므로 빠르게 반환해야 합니다.
+        """
+        self._listeners.append(listener)
+
+    def start(self):
+        for collector in self._collectors:
+            thread = threading.Thread(target=self._run_collector, args=(collector,),
+                                      name=f"collector-{collector.name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        watchdog = threading.Thread(target=self._run_watchdog, name="sampler-watchdog", daemon=True)
+        watchdog.start()
+        self._threads.append(watchdog)
+
+    def stop(self, timeout=1.0):
+        """모든 스레드에 정지를 요청합니다. 멈춘 Collector는 기다리지 않습니다."""
+        self._stop_event.set()
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(deadline - time.monotonic(), 0))
+        self._threads = []
+
+    def _publish(self, name, sample):
+        with self._publish_lock:
+            samples = dict(self.snapshot.samples)
+            samples[name] = sample
+            snapshot = Snapshot(self.snapshot.generation + 1, MappingProxyType(samples))
+            self.snapshot = snapshot
+            for listener in self._listeners:
+                try:
+                    listener(name, sample, snapshot)
+                except Exception as e:
+                    print(f"스냅샷 리스너 오류: {e}", file=sys.stderr)
+
+    def _run_collector(self, collector):
+        next_due = time.monotonic()
+        while not self._stop_event.is_set():
+            started = time.monotonic()
+            self._inflight[collector.name] = started
+            try:
+                sample = Sample(collector.func(), time.time(), None)
+            except Exception as e:
+                sample = Sample(None, time.time(), f"{type(e).__name__}: {e}")
+            del self._inflight[collector.name]
+            self._publish(collector.name, sample)
+
+            # Keep a fixed cadence; skip missed slots instead of bursting.
+            next_due += collector.interval
+            now = time.monotonic()
+            if next_due < now:
+                next_due = now + collector.interval
+            self._stop_event.wait(next_due - now)
+
+    def _run_watchdog(self):
+        timeouts = {c.name: c.timeout for c in self._collectors}
+        check_interval = min(timeouts.values(), default=1.0) / 2
+        flagged = {}
+        while not self._stop_event.wait(check_interval):
+            now = time.monotonic()
+            for name, started in list(self._inflight.items()):
+                if now - started <= timeouts[name] or flagged.get(name) == started:
+                    continue
+                flagged[name] = started
+                previous = self.snapshot.samples.get(name)
+                last_value = previous.value if previous is not None else None
+                last_time = previous.timestamp if previous is not None else time.time()
+                print(f"수집 시간 초과: {name} ({now - started:.1f}s)", file=sys.stderr)
+                self._publish(name, Sample(last_value, last_time, 'timeout'))
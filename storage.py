@@ -0,0 +1,118 @@
+"""디스크와 마운트 목록 캐시.
+
+마운트 목록(psutil.disk_partitions)은 매번 읽지 않고, 마운트 테이블이 바뀌었거나
+(Linux: /proc/self/mounts의 POLLPRI), I/O 카운터의 장치 구성이 바뀌었거나,
+refresh_interval이 지났을 때만 다시 읽습니다.
+"""
+import os
+import select
+import sys
+import threading
+import time
+from collections import namedtuple
+
+import psutil
+
+# mountpoint가 None이면 속도만, io_name이 None이면 용량만 표시하는 항목입니다.
+DiskEntry = namedtuple('DiskEntry', ['label', 'mountpoint', 'io_name'])
+DiskRate = namedtuple('DiskRate', ['name', 'read_mbps', 'write_mbps'])
+VolumeUsage = namedtuple('VolumeUsage', ['mountpoint', 'io_name', 'percent', 'used_gb', 'total_gb'])
+
+SKIPPED_FSTYPES = {'squashfs', 'iso9660', 'udf', ''}
+LABEL_LIMIT = 14
+
+
+def is_whole_disk(name):
+    """I/O 카운터 이름이 파티션이 아닌 디스크 장치인지 반환합니다. Linux 외에는 항상 True입니다."""
+    if sys.platform.startswith('linux'):
+        return os.path.exists(f"/sys/block/{name.replace('/', '!')}")
+    return True
+
+
+def _io_name(device):
+    """/dev/sda1, /dev/mapper/root 같은 장치 경로를 I/O 카운터 이름(sda1, dm-0)으로 바꿉니다."""
+    if not sys.platform.startswith('linux') or not device.startswith('/dev/'):
+        return None
+    return os.path.basename(os.path.realpath(device))
+
+
+def disk_label(name):
+    """마운트 지점이나 장치 이름으로 게이지 라벨을 만듭니다. 긴 경로는 뒷부분만 남깁니다."""
+    name = name.rstrip('\\') or name
+    if len(name) > LABEL_LIMIT:
+        name = '...' + name[-(LABEL_LIMIT - 3):]
+    return f"Disk ({name})"
+
+
+def enumerate_disks(io_names=()):
+    """표시할 디스크 항목 튜플을 만듭니다.
+
+    Linux에서는 마운트된 파티션마다 용량과 속도를 함께 보여 줍니다. Windows처럼
+    볼륨과 물리 디스크를 연결할 수 없는 플랫폼에서는 볼륨(용량)과 물리 디스크(속도)를
+    따로 보여 줍니다.
+    """
+    entries = []
+    seen_devices = set()
+    matched = set()
+    for part in psutil.disk_partitions(all=False):
+        if part.fstype in SKIPPED_FSTYPES or 'cdrom' in part.opts or part.device.startswith('/dev/loop'):
+            continue
+        if part.device in seen_devices:  # bind mounts, btrfs subvolumes
+            continue
+        seen_devices.add(part.device)
+        io_name = _io_name(part.device)
+        if io_name not in io_names:
+            io_name = None
+        else:
+            matched.add(io_name)
+        entries.append(DiskEntry(disk_label(part.mountpoint), part.mountpoint, io_name))
+
+    if not sys.platform.startswith('linux'):
+        entries.extend(DiskEntry(disk_label(name), None, name) for name in sorted(io_names) if name not in matched)
+    return tuple(entries)
+
+
+class StorageInventory:
+    """디스크 항목을 캐시하고 변경이 있을 때만 다시 열거합니다. 여러 Collector 스레드에서 함께 씁니다."""
+
+    def __init__(self, refresh_interval=60.0):
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._entries = None
+        self._io_names = frozenset()
+        self._refreshed_at = 0.0
+        self._mounts_poll = None
+        self._mounts_file = None
+        if sys.platform.startswith('linux') and hasattr(select, 'poll'):
+            try:
+                self._mounts_file = open('/proc/self/mounts', 'rb')
+                self._mounts_poll = select.poll()
+                self._mounts_poll.register(self._mounts_file, select.POLLPRI)
+            except OSError:
+                self._mounts_poll = None
+
+    def _mounts_changed(self):
+        # The kernel raises POLLPRI once per mount table change.
+        return bool(self._mounts_poll and self._mounts_poll.poll(0))
+
+    def entries(self, counters=None):
+        """캐시된 DiskEntry 튜플을 반환합니다.
+
+        counters(장치 이름별 I/O 카운터 딕셔너리)를 주면 장치 구성 변경도 감지합니다.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if counters is not None and counters.keys() != self._io_names:
+                self._io_names = frozenset(counters)
+                self._entries = None
+            if (self._entries is None or self._mounts_changed()
+                    or now - self._refreshed_at >= self.refresh_interval):
+                self._entries = enumerate_disks(self._io_names)
+                self._refreshed_at = now
+            return self._entries
+
+    def close(self):
+        if self._mounts_file is not None:
+            self._mounts_file.close()
+            self._mounts_file = None
+            self._mounts_poll = None